@@ -0,0 +1,179 @@
+"""Benchmark of complete conversions of synthetic workbooks.
+
+Measures the wall time of the full `cli` path and of each conversion stage for both CSV formats. Each conversion
+runs in a fresh interpreter, the total wall time includes startup and the peak RSS is not affected by previous
+conversions. Results are written
+to a JSON file per package version, e.g. to be committed into `benchmarks/results/`. Passing a previous results file
+as baseline reports the relative change of each measurement and fails on regressions.
+
+Usage: python -m benchmarks.bench_conversion [--rows 1000 10000 100000 500000] [--repeat 3] [--baseline FILE]
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import argparse
+import importlib.metadata
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from benchmarks.workbook_generator import generate_workbook
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+DEFAULT_ROWS = [1000, 10000, 100000, 500000]
+FORMATS = ["1/1", "3/3"]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+CLI_COMMAND = [sys.executable, "-c", "import sys; from knx_ga_exporter.__main__ import cli; sys.exit(cli())"]
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def bench_conversion(path: str, output_format: str, extra_args: list[str], repeat: int) -> dict:
+    """Measure the conversion of a workbook through the command line interface in a separate process.
+
+    Arguments:
+        path: Path of the workbook
+        output_format: CSV output format
+        extra_args: Additional command line arguments
+        repeat: Number of repetitions
+
+    Returns:
+        Best total wall time and the per-stage wall times of the best run in seconds, and the peak RSS in bytes.
+
+    Raises:
+        RuntimeError: If the conversion failed.
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for _ in range(repeat):
+            args = ["-i", path, "-o", os.path.join(tmp_dir, "out.csv"), "--output.format", output_format]
+            start = time.perf_counter()
+            process = subprocess.run(
+                [*CLI_COMMAND, *args, *extra_args, "--timings", "json"], capture_output=True, text=True, check=False
+            )
+            total = time.perf_counter() - start
+            if process.returncode != os.EX_OK:
+                raise RuntimeError(f"Conversion of {path} failed: {process.stderr}")
+            if best is None or total < best["total"]:
+                report = json.loads(process.stdout)
+                best = {
+                    "total": total,
+                    "stages": {stats["name"]: stats["duration"] for stats in report["stages"]},
+                    "peak_rss": max(stats["peak_rss"] or 0 for stats in report["stages"]),
+                }
+    return best
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    """Compare the results with a baseline.
+
+    Arguments:
+        results: Measurements of this run
+        baseline: Measurements of a previous run
+        threshold: Relative slowdown of the total wall time regarded as regression, e.g. 0.1 for 10 %
+
+    Returns:
+        Descriptions of all regressions.
+    """
+    baseline_index = {(entry["rows"], entry["format"]): entry for entry in baseline}
+    regressions = []
+    print(
+        f"{'rows':>8s} | {'format':6s} | {'stage':16s} | {'baseline [s]':>12s} | {'current [s]':>12s} | {'change':>7s}"
+    )
+    for entry in results:
+        base_entry = baseline_index.get((entry["rows"], entry["format"]))
+        if base_entry is None:
+            continue
+        timings = [("total", entry["total"], base_entry["total"])]
+        timings.extend(
+            (stage, duration, base_entry["stages"][stage])
+            for stage, duration in entry["stages"].items()
+            if stage in base_entry["stages"]
+        )
+        for stage, current, previous in timings:
+            change = current / previous - 1.0
+            print(
+                f"{entry['rows']:8d} | {entry['format']:6s} | {stage:16s} | {previous:12.3f} | {current:12.3f} | "
+                + f"{change:+6.0%}"
+            )
+        if entry["total"] > base_entry["total"] * (1.0 + threshold):
+            regressions.append(
+                f"{entry['rows']} rows, format {entry['format']}: "
+                + f"{base_entry['total']:.3f} s -> {entry['total']:.3f} s"
+            )
+    return regressions
+
+
+def main(arg_list: Optional[list[str]] = None) -> int:
+    """Run the benchmark.
+
+    Arguments:
+        arg_list: Optional command line arguments
+
+    Returns:
+        Exit code. Failure if a regression against the baseline was detected.
+    """
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument(
+        "--args", default="", help="Additional conversion arguments, e.g. '--input.engine xml --stream'"
+    )
+    arg_parser.add_argument("--output", default=None, help="Results file. Default: results/<version>.json")
+    arg_parser.add_argument("--baseline", default=None, help="Results file of a previous run to compare with.")
+    arg_parser.add_argument("--threshold", type=float, default=0.1, help="Relative slowdown regarded as regression.")
+    args = arg_parser.parse_args(arg_list)
+
+    version = importlib.metadata.version("knx_ga_exporter")
+    extra_args = args.args.split()
+    results = []
+    print(f"{'rows':>8s} | {'format':6s} | {'total [s]':>10s} | {'peak RSS':>10s} | stages [s]")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.rows:
+            path = os.path.join(tmp_dir, f"bench-{rows}.xlsx")
+            generate_workbook(path, rows)
+            for output_format in FORMATS:
+                entry = {"rows": rows, "format": output_format}
+                entry.update(bench_conversion(path, output_format, extra_args, args.repeat))
+                results.append(entry)
+                stages = ", ".join(f"{stage}: {duration:.3f}" for stage, duration in entry["stages"].items())
+                print(
+                    f"{rows:8d} | {output_format:6s} | {entry['total']:10.3f} | "
+                    + f"{entry['peak_rss'] / 1024 / 1024:6.1f} MiB | {stages}"
+                )
+
+    output_path = args.output or os.path.join(RESULTS_DIR, f"{version}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        json.dump(
+            {
+                "version": version,
+                "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "args": args.args,
+                "results": results,
+            },
+            output_file,
+            indent=2,
+        )
+        output_file.write("\n")
+    print(f"Results written to {output_path}")
+
+    if args.baseline is None:
+        return os.EX_OK
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        regressions = compare(results, json.load(baseline_file)["results"], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else os.EX_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
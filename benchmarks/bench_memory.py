@@ -0,0 +1,100 @@
+"""Memory benchmark of the group address representation.
+
+Compares the compact GroupAddress against the previous representation with a per-instance __dict__ and
+non-interned strings.
+
+Usage: python -m benchmarks.bench_memory [--count 100000]
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import argparse
+import tracemalloc
+from typing import Callable, Iterator
+
+from knx_ga_exporter.group_address import GroupAddress
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class DictGroupAddress:
+    """Previous group address representation: Attributes stored in a per-instance __dict__."""
+
+    def __init__(self, *fields: object) -> None:
+        """Constructor.
+
+        Arguments:
+            fields: Group address attributes
+        """
+        (
+            self.main,
+            self.middle,
+            self.sub,
+            self.main_name,
+            self.middle_name,
+            self.sub_name,
+            self.target_id,
+            self.dpt,
+            self.comment,
+        ) = fields
+
+
+def iter_rows(count: int) -> Iterator[tuple]:
+    """Build sheet rows like read from a workbook: Every row has its own string objects.
+
+    Arguments:
+        count: Number of rows
+
+    Yields:
+        Rows of group address attributes.
+    """
+    for index in range(count):
+        main, remainder = divmod(index % (32 * 8 * 256), 8 * 256)
+        middle, sub = divmod(remainder, 256)
+        yield (
+            main,
+            middle,
+            sub,
+            f"Main group {main}",
+            f"Middle group {middle}",
+            f"Device {index} - Function {sub}",
+            f"D{main}-{middle}",
+            "".join(["DPST-1-", str(index % 2)]),
+            None,
+        )
+
+
+def measure(factory: Callable[..., object], count: int) -> int:
+    """Measure the memory allocated by group addresses parsed from sheet rows.
+
+    Arguments:
+        factory: Group address class
+        count: Number of group addresses
+
+    Returns:
+        Allocated bytes still referenced by the group addresses.
+    """
+    tracemalloc.start()
+    gas = [factory(*row) for row in iter_rows(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del gas
+    return current
+
+
+def main() -> None:
+    """Run the benchmark."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--count", type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    dict_bytes = measure(DictGroupAddress, args.count)
+    slots_bytes = measure(GroupAddress, args.count)
+
+    print(f"{'representation':>16s} | {'total [MiB]':>11s} | {'per GA [B]':>10s}")
+    for name, allocated in [("__dict__", dict_bytes), ("__slots__", slots_bytes)]:
+        print(f"{name:>16s} | {allocated / 2**20:11.1f} | {allocated / args.count:10.0f}")
+    print(f"Saving: {100 * (1 - slots_bytes / dict_bytes):.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark of the workbook reader engines.
+
+Usage: python -m benchmarks.bench_reader_engines [--rows 1000 10000 100000] [--repeat 3]
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import argparse
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.workbook_generator import FIRST_ROW, SHEET_NAME, generate_workbook
+from knx_ga_exporter.parser import load_workbook, parse_group_addresses
+from knx_ga_exporter.reader import InputEngine
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+DEFAULT_LAYOUT = SimpleNamespace(
+    sheet_name=SHEET_NAME,
+    first_row=FIRST_ROW,
+    last_column=10,
+    max_empty_rows=100,
+    main_ID_column=0,
+    middle_ID_column=2,
+    sub_ID_column=4,
+    main_name_column=1,
+    middle_name_column=3,
+    sub_name_column=8,
+    dpt_column=5,
+    target_ID_column=6,
+    comment_column=9,
+)
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def bench_engine(path: str, engine: InputEngine, repeat: int) -> tuple[float, list[str]]:
+    """Measure load and parse of a workbook with one reader engine.
+
+    Arguments:
+        path: Path of the workbook
+        engine: Reader engine
+        repeat: Number of repetitions
+
+    Returns:
+        Best wall time in seconds and the parsed group addresses formatted as strings.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gas = parse_group_addresses(load_workbook(path, engine), DEFAULT_LAYOUT)
+        best = min(best, time.perf_counter() - start)
+    return best, [f"{ga} | {ga.comment}" for ga in gas]
+
+
+def main() -> None:
+    """Run the benchmark.
+
+    Raises:
+        AssertionError: If the engines produce different group addresses.
+    """
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    print(f"{'rows':>8s} | {'openpyxl [s]':>12s} | {'xml [s]':>12s} | {'speedup':>7s}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.rows:
+            path = os.path.join(tmp_dir, f"bench-{rows}.xlsx")
+            generate_workbook(path, rows)
+            openpyxl_time, openpyxl_gas = bench_engine(path, InputEngine.openpyxl, args.repeat)
+            xml_time, xml_gas = bench_engine(path, InputEngine.xml, args.repeat)
+            if openpyxl_gas != xml_gas:
+                raise AssertionError(f"Reader engines produced different group addresses for {rows} rows")
+            print(f"{rows:8d} | {openpyxl_time:12.3f} | {xml_time:12.3f} | {openpyxl_time / xml_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
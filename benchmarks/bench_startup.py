@@ -0,0 +1,68 @@
+"""Benchmark of the CLI startup time.
+
+Compares the wall-clock time of 'knx-ga-exporter --version' with a bare interpreter importing the argument parser,
+which every CLI call requires. Exits with an error if the startup exceeds the budget.
+
+Usage: python -m benchmarks.bench_startup [--runs 11] [--budget 2.3]
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import argparse
+import subprocess
+import sys
+import time
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Reference startup: A bare interpreter importing the argument parser
+BASE_STARTUP_CODE = "import jsonargparse"
+
+CLI_STARTUP_CODE = "import sys; from knx_ga_exporter.__main__ import cli; sys.exit(cli(['--version']))"
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def startup_duration(code: str) -> float:
+    """Measure the wall-clock time of running code in a fresh interpreter.
+
+    Arguments:
+        code: Python code
+
+    Returns:
+        Duration in seconds
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    """Run the benchmark.
+
+    Returns:
+        Exit code: 1 if the startup exceeds the budget.
+    """
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument(
+        "--runs", type=int, default=11, help="Number of measured startups. The fastest is compared."
+    )
+    # Measured about 1.9. Importing openpyxl eagerly exceeds the budget with about 2.6.
+    arg_parser.add_argument("--budget", type=float, default=2.3, help="Max. startup time relative to the reference.")
+    args = arg_parser.parse_args()
+
+    base_durations = []
+    cli_durations = []
+    # Alternated, so changes of the system load affect both measurements
+    for _ in range(args.runs):
+        base_durations.append(startup_duration(BASE_STARTUP_CODE))
+        cli_durations.append(startup_duration(CLI_STARTUP_CODE))
+    base_duration = min(base_durations)
+    cli_duration = min(cli_durations)
+    factor = cli_duration / base_duration
+    print(f"{'reference [s]':>13s} | {'--version [s]':>13s} | {'factor':>6s} | {'budget':>6s}")
+    print(f"{base_duration:13.3f} | {cli_duration:13.3f} | {factor:6.2f} | {args.budget:6.2f}")
+    return 0 if factor <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
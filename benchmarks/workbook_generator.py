@@ -0,0 +1,58 @@
+"""Generator of synthetic KNX planning workbooks matching the default sheet layout."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import openpyxl
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+SHEET_NAME = "KNX Group Addresses"
+FIRST_ROW = 8
+
+# Number of distinct 3-level group addresses: 32 main groups * 8 middle groups * 256 sub groups
+GA_CAPACITY = 32 * 8 * 256
+
+_DPTS = ["DPST-1-1", "DPST-1-8", "DPST-5-1", "DPST-9-1"]
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def generate_workbook(path: str, rows: int) -> None:
+    """Generate a workbook with the default layout containing the requested number of group address rows.
+
+    Group addresses are sorted by address. If more rows than distinct group addresses are requested, the group
+    addresses are spread evenly and the remaining rows are left without DPT. Such rows are skipped by the parser.
+
+    Arguments:
+        path: Path of the generated XLSX file
+        rows: Number of group address rows
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_NAME)
+    ws.append([SHEET_NAME])
+    for _ in range(FIRST_ROW - 3):
+        ws.append([])
+    ws.append(["Nr", "Main Group", "Nr", "Middle Group", "Nr", "DPT", "Device-ID", "GA", "GA Description", "Comment"])
+
+    rows_per_ga = -(-rows // GA_CAPACITY)
+    for row in range(rows):
+        ga_index, skipped = divmod(row, rows_per_ga)
+        main, remainder = divmod(ga_index, 8 * 256)
+        middle, sub = divmod(remainder, 256)
+        if skipped:
+            ws.append([main, f"Main {main}", middle, f"Middle {middle}", sub, None, None, None, None, "No DPT"])
+            continue
+        ws.append(
+            [
+                main,
+                f"Main {main}",
+                middle,
+                f"Middle {middle}",
+                sub,
+                _DPTS[row % len(_DPTS)],
+                f"D{main}-{middle}",
+                f"{main}/{middle}/{sub}",
+                f"Device {main}-{middle}-{sub} - Function {sub}",
+                f"Comment {row}" if row % 3 == 0 else None,
+            ]
+        )
+    wb.save(path)
@@ -4,13 +4,12 @@
 import importlib.metadata
 import logging
 import os
+import sys
 from typing import Optional
 
-from knx_ga_exporter.logging import configure_logging
+from knx_ga_exporter.logging import configure_logging, stop_logging, trace_logging
 
 from .argparse import parse_config
-from .exporter import export_csv
-from .parser import load_workbook, parse_group_addresses
 
 # ---- Module Meta-Data ------------------------------------------------------------------------------------------------
 __prog__ = "knx-ga-exporter"
@@ -31,7 +30,33 @@ def cli(arg_list: Optional[list[str]] = None) -> int:
     Returns:
         int: Numeric exit code
     """
+    args = sys.argv[1:] if arg_list is None else arg_list
+
+    # Modules not needed for --help and --version are imported on the code paths using them to keep the startup fast.
+
     try:
+        if args[:1] == ["batch"]:
+            from .batch import run_batch  # pylint: disable=import-outside-toplevel
+
+            return run_batch(
+                prog=__prog__,
+                version=importlib.metadata.version(__dist_name__),
+                copy_right=__copyright__,
+                author=__author__,
+                arg_list=args[1:],
+            )
+
+        if args[:1] == ["serve"]:
+            from .serve import run_serve  # pylint: disable=import-outside-toplevel
+
+            return run_serve(
+                prog=__prog__,
+                version=importlib.metadata.version(__dist_name__),
+                copy_right=__copyright__,
+                author=__author__,
+                arg_list=args[1:],
+            )
+
         config = parse_config(
             prog=__prog__,
             version=importlib.metadata.version(__dist_name__),
@@ -48,6 +73,9 @@ def cli(arg_list: Optional[list[str]] = None) -> int:
         logging.error(e)
         return 1
 
+    finally:
+        stop_logging()
+
 
 def _main_logic(config: dict) -> int:
     """Main program logic.
@@ -58,12 +86,46 @@ def _main_logic(config: dict) -> int:
     Returns:
         int: exit code
     """
-    configure_logging(config.verbose)
-    wb = load_workbook(config.input.file)
-    gas = parse_group_addresses(wb, config.layout)
-    export_csv(config.output, gas)
+    configure_logging(config.verbose, config.log.format, config.log.file)
 
-    logging.debug("Statistics: #GA: %s", len(gas))
+    with trace_logging(config.log.trace_file):
+        if config.watch:
+            from .watch import watch  # pylint: disable=import-outside-toplevel
+
+            return watch(config, _convert)
+
+        ga_count = _convert(config)
+    if ga_count is None:
+        return os.EX_OK
+
+    logging.debug("Statistics: #GA: %s", ga_count)
     logging.info("Conversion successfully finished.")
 
     return os.EX_OK
+
+
+def _convert(config: dict) -> Optional[int]:
+    """Run a single conversion including the configured profiling.
+
+    Args:
+        config (dict): Config hierarchy
+
+    Returns:
+        Number of exported group addresses or None if the output file was already up-to-date.
+    """
+    from .conversion import convert  # pylint: disable=import-outside-toplevel
+    from .profiling import Timings  # pylint: disable=import-outside-toplevel
+
+    timings = Timings()
+    if config.profile is not None:
+        import cProfile  # pylint: disable=import-outside-toplevel
+
+        profiler = cProfile.Profile()
+        ga_count = profiler.runcall(convert, config, timings=timings)
+        profiler.dump_stats(config.profile)
+        logging.info("Profile written to '%s'", config.profile)
+    else:
+        ga_count = convert(config, timings=timings)
+    if config.timings is not None:
+        print(timings.format(config.timings))
+    return ga_count
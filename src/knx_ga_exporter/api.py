@@ -0,0 +1,131 @@
+"""In-memory conversion API.
+
+Converts workbooks given as bytes or binary streams without touching the filesystem and without parsing a command
+line. The options have the structure of the JSON configuration file, see build_config().
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import io
+import logging
+from itertools import chain
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence, Union
+
+from .argparse import build_config
+from .exporter import export_group_addresses, iter_csv_rows
+from .filtering import GroupAddressFilter
+from .group_address import GroupAddress
+from .parser import iter_group_addresses, merge_sheet_group_addresses, parse_group_addresses, resolve_sheet_names
+from .reader import open_workbook
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Input file name reported in the configuration of in-memory conversions
+MEMORY_INPUT_FILE = "<memory>"
+
+Workbook = Union[bytes, BinaryIO]
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def build_memory_config(options: Optional[dict] = None) -> dict:
+    """Build the configuration of an in-memory conversion.
+
+    Arguments:
+        options: Configuration options. Default: Default options.
+
+    Returns:
+        Config hierarchy. The input file is not required.
+    """
+    options = dict(options or {})
+    options["input"] = {"file": MEMORY_INPUT_FILE, **options.get("input", {})}
+    return build_config(options)
+
+
+def read_group_addresses(workbook: Workbook, options: Optional[dict] = None) -> list[GroupAddress]:
+    """Parse the group addresses of an in-memory workbook.
+
+    Arguments:
+        workbook: XLSX workbook contents or a seekable binary stream, e.g. an uploaded file.
+        options: Configuration options like the layout, input engine and filter. Default: Default options.
+
+    Returns:
+        KNX group addresses sorted by address.
+    """
+    gas = _parse_workbook(workbook, build_memory_config(options), stream=False)
+    return sorted(gas, key=lambda ga: (ga.main, ga.middle, ga.sub))
+
+
+def export_workbook(workbook: Workbook, output: BinaryIO, options: Optional[dict] = None) -> int:
+    """Convert an in-memory workbook and write the export into a binary stream.
+
+    The output file and targets of the options are ignored, the export is written in the configured output format,
+    separator and encoding. With option 'stream', group addresses are written while the workbook is read.
+
+    Arguments:
+        workbook: XLSX workbook contents or a seekable binary stream, e.g. an uploaded file.
+        output: Writable binary stream receiving the export. Not closed.
+        options: Configuration options. Default: Default options.
+
+    Returns:
+        Number of exported group addresses.
+    """
+    config = build_memory_config(options)
+    output_config = config.output.clone()
+    output_config.file = output
+    output_config.targets = None
+    gas = _parse_workbook(workbook, config, config.stream)
+    return export_group_addresses(output_config, gas, stream=config.stream)
+
+
+def convert_workbook(workbook: Workbook, options: Optional[dict] = None) -> bytes:
+    """Convert an in-memory workbook into the contents of the export file.
+
+    Arguments:
+        workbook: XLSX workbook contents or a seekable binary stream, e.g. an uploaded file.
+        options: Configuration options. Default: Default options.
+
+    Returns:
+        Export file contents, e.g. the CSV file.
+    """
+    output = io.BytesIO()
+    export_workbook(workbook, output, options)
+    return output.getvalue()
+
+
+def iter_rows(workbook: Workbook, options: Optional[dict] = None) -> Iterator[Sequence]:
+    """Convert an in-memory workbook into CSV rows without encoding them.
+
+    Arguments:
+        workbook: XLSX workbook contents or a seekable binary stream, e.g. an uploaded file.
+        options: Configuration options. The output format must be a CSV format. Default: Default options.
+
+    Returns:
+        Iterator of the CSV rows including the headline.
+    """
+    config = build_memory_config(options)
+    return iter_csv_rows(config.output.format, _parse_workbook(workbook, config, stream=False))
+
+
+def _parse_workbook(workbook: Workbook, config: dict, stream: bool) -> Iterable[GroupAddress]:
+    """Parse the group addresses of all configured sheets of an in-memory workbook.
+
+    Arguments:
+        workbook: XLSX workbook contents or a seekable binary stream.
+        config: Config hierarchy
+        stream: Parse the group addresses lazily while they are iterated.
+
+    Returns:
+        KNX group addresses. Collected and merged, unless streaming.
+    """
+    input_stream = io.BytesIO(workbook) if isinstance(workbook, (bytes, bytearray)) else workbook
+    logging.info("Loading XLSX workbook from memory")
+    wb = open_workbook(input_stream, config.input.engine)
+    sheet_names = resolve_sheet_names(wb, config.layout.sheet_name)
+    ga_filter = GroupAddressFilter.from_config(config.filter)
+    if stream:
+        return chain.from_iterable(
+            iter_group_addresses(wb, config.layout, sheet, None, ga_filter) for sheet in sheet_names
+        )
+    return merge_sheet_group_addresses(
+        (sheet, parse_group_addresses(wb, config.layout, sheet, None, ga_filter)) for sheet in sheet_names
+    )
@@ -1,12 +1,21 @@
 """Argument parsing."""
 
 # ---- Imports ----
-from typing import Optional
+import dataclasses
+import functools
+import os
+from enum import Enum
+from typing import Any, List, Optional, Union
 
-from jsonargparse import ArgumentParser, DefaultHelpFormatter
+from jsonargparse import ArgumentParser, DefaultHelpFormatter, Namespace
+from jsonargparse.typing import PositiveInt
 from rich_argparse import RawTextRichHelpFormatter
 
-from .exporter import CsvFormat, CsvSeparator
+from .encoding import EncodingErrors
+from .exporter import CsvSeparator, OutputFormat, OutputTarget, output_formats
+from .logging import LogFormat
+from .profiling import TimingsFormat
+from .reader import InputEngine
 
 # ---- Globals ---------------------------------------------------------------------------------------------------------
 
@@ -28,19 +37,258 @@ def parse_config(prog: str, version: str, copy_right: str, author: str, arg_list
         author: Author info.
         arg_list: Optional command line arguments list.
 
+    Returns:
+        Dict: Parsed configuration options.
+    """
+    arg_parser = build_arg_parser(prog=prog, version=version, copy_right=copy_right, author=author)
+    config = arg_parser.parse_args(args=arg_list)
+
+    return config
+
+
+def build_config(options: dict) -> dict:
+    """Build the configuration of a conversion called from Python, without parsing a command line.
+
+    The options have the structure of the JSON configuration file and are applied on top of the default options.
+    Unlike parse_config() the options are not validated by jsonargparse and no configuration file is read.
+
+    Arguments:
+        options: Configuration options, e.g. {"input": {"file": "ga.xlsx"}, "output": {"format": "json"}}
+
+    Returns:
+        Dict: Configuration options.
+
+    Raises:
+        ValueError: If an option is unknown or the input file is missing.
+    """
+    config = _default_config().clone()
+    for key, value in _flatten_options(options):
+        if key not in config:
+            raise ValueError(f"Unknown configuration option '{key}'")
+        if key == "output.targets" and value is not None:
+            value = [
+                Namespace(
+                    **{
+                        field.name: _option_value(config.output[field.name], target_options.get(field.name))
+                        for field in dataclasses.fields(OutputTarget)
+                    }
+                )
+                for target_options in (
+                    {name.replace("-", "_"): option for name, option in target.items()} for target in value
+                )
+            ]
+        config[key] = _option_value(config[key], value)
+    if config.input.file is None:
+        raise ValueError("Configuration option 'input.file' is required")
+    return config
+
+
+@functools.cache
+def _default_config() -> dict:
+    """Determine the default options of a conversion once.
+
+    Returns:
+        Dict: Default configuration options. Must not be modified.
+    """
+    arg_parser = build_arg_parser(prog="", version="", copy_right="", author="", default_config_files=())
+    return arg_parser.get_defaults()
+
+
+def _option_value(default: Any, value: Any) -> Any:  # noqa: ANN401
+    """Convert an option value into the type of its default, e.g. enum values into enum members.
+
+    Arguments:
+        default: Default value of the option
+        value: Option value
+
+    Returns:
+        Converted option value
+    """
+    if isinstance(default, Enum) and value is not None and not isinstance(value, Enum):
+        return type(default)(value)
+    return value
+
+
+def _flatten_options(options: dict, prefix: str = "") -> list[tuple[str, Any]]:
+    """Flatten nested configuration options into dotted keys.
+
+    Arguments:
+        options: Nested configuration options
+        prefix: Key prefix of the options
+
+    Returns:
+        Dotted keys and values, e.g. ("output.format", "json").
+    """
+    flattened = []
+    for name, value in options.items():
+        key = f"{prefix}{name.replace('-', '_')}"
+        if isinstance(value, dict):
+            flattened.extend(_flatten_options(value, f"{key}."))
+        else:
+            flattened.append((key, value))
+    return flattened
+
+
+def parse_batch_config(prog: str, version: str, copy_right: str, author: str, arg_list: list[str]) -> dict:
+    """Parse the configuration of the batch mode from CLI.
+
+    Arguments:
+        prog: Program name.
+        version: Program version.
+        copy_right: Copyright info.
+        author: Author info.
+        arg_list: Command line arguments list following the 'batch' command.
+
     Returns:
         Dict: Parsed configuration options.
     """
+    arg_parser = ArgumentParser(
+        prog=f"{prog} batch",
+        description="Convert all jobs of a batch manifest using a pool of worker processes."
+        + f" | Version {version} | {copy_right}",
+        version=f"| Version {version}\n{copy_right} {author}",
+        default_env=False,
+        formatter_class=HelpFormatter,
+    )
+    arg_parser.add_argument(
+        "manifest",
+        help="""Path to JSON batch manifest. Format:
+{"jobs": [{"input": {...}, "layout": {...}, "output": {...}}, ...]}
+Each job accepts the same options as the JSON configuration file.""",
+    )
+    arg_parser.add_argument(
+        "-w",
+        "--workers",
+        type=PositiveInt,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes. 1: Convert all jobs sequentially within the main process. Default: #CPUs.",
+    )
+    arg_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase log-level. -v: INFO, -vv DEBUG. Default: WARN/ERROR",
+    )
+    _add_log_arguments(arg_parser)
+
+    return arg_parser.parse_args(args=arg_list)
+
+
+def parse_serve_config(prog: str, version: str, copy_right: str, author: str, arg_list: list[str]) -> dict:
+    """Parse the configuration of the server mode from CLI.
+
+    Arguments:
+        prog: Program name.
+        version: Program version.
+        copy_right: Copyright info.
+        author: Author info.
+        arg_list: Command line arguments list following the 'serve' command.
+
+    Returns:
+        Dict: Parsed configuration options.
+    """
+    arg_parser = ArgumentParser(
+        prog=f"{prog} serve",
+        description="Serve conversions of uploaded workbooks via HTTP using a pool of warm worker processes."
+        + f" | Version {version} | {copy_right}",
+        version=f"| Version {version}\n{copy_right} {author}",
+        default_env=False,
+        formatter_class=HelpFormatter,
+    )
+    arg_parser.add_argument("--host", default="127.0.0.1", help="Address the server listens on.")
+    arg_parser.add_argument(
+        "-p", "--port", type=int, default=8080, help="Port the server listens on. 0: Any free port."
+    )
+    arg_parser.add_argument(
+        "-w",
+        "--workers",
+        type=PositiveInt,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes converting the uploaded workbooks. Default: #CPUs.",
+    )
+    arg_parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=16,
+        help="Number of conversions waiting for a free worker. Further requests are rejected with 503.",
+    )
+    arg_parser.add_argument(
+        "--max-upload",
+        type=int,
+        default=64 * 1024 * 1024,
+        help="Maximum size of an uploaded workbook in bytes. Larger uploads are rejected with 413.",
+    )
+    arg_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase log-level. -v: INFO, -vv DEBUG. Default: WARN/ERROR",
+    )
+    _add_log_arguments(arg_parser)
+
+    return arg_parser.parse_args(args=arg_list)
+
+
+def _add_log_arguments(arg_parser: ArgumentParser) -> None:
+    """Add the arguments of the log output.
+
+    Arguments:
+        arg_parser: Argument parser
+    """
+    arg_parser.add_argument(
+        "--log.format",
+        type=LogFormat,
+        default=LogFormat.text,
+        help="""Format of the log messages.
+text: Human readable lines
+json: JSON lines incl. structured fields like the group address, the sheet row and the conversion stage""",
+    )
+    arg_parser.add_argument(
+        "--log.file",
+        type=Optional[str],
+        default=None,
+        help="Path of the log file. Default: Log to stderr.",
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def build_arg_parser(
+    prog: str,
+    version: str,
+    copy_right: str,
+    author: str,
+    exit_on_error: bool = True,
+    default_config_files: tuple[str, ...] = ("./config.json",),
+) -> ArgumentParser:
+    """Build the parser of the conversion configuration.
+
+    The parser is built once per process and argument combination and reused by all later calls, e.g. of the
+    batch and watch modes.
+
+    Arguments:
+        prog: Program name.
+        version: Program version.
+        copy_right: Copyright info.
+        author: Author info.
+        exit_on_error: Exit the program on invalid configurations. Otherwise an ArgumentError is raised.
+        default_config_files: Configuration files read on every parse if existing.
+
+    Returns:
+        Configuration parser. Shared, must not be modified.
+    """
     arg_parser = ArgumentParser(
         prog=prog,
         description="Converter for spreadsheets to KNX ETS group address configurations in CSV format."
         + f" | Version {version} | {copy_right}",
         version=f"| Version {version}\n{copy_right} {author}",
-        default_config_files=["./config.json"],
+        default_config_files=list(default_config_files),
         print_config=None,
         env_prefix="KNX_GA_EXPORTER",
         default_env=False,
         formatter_class=HelpFormatter,
+        exit_on_error=exit_on_error,
     )
 
     arg_parser.add_argument("-c", "--config", action="config", help="""Path to JSON configuration file.""")
@@ -51,9 +299,39 @@ def parse_config(prog: str, version: str, copy_right: str, author: str, arg_list
         default=0,
         help="Increase log-level. -v: INFO, -vv DEBUG. Default: WARN/ERROR",
     )
+    _add_log_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--log.trace-file",
+        type=Optional[str],
+        default=None,
+        help="""Path of a trace file receiving all DEBUG messages as JSON lines incl. structured fields like the
+group address and the sheet row. Written in the background independent of the console log-level (--verbose).""",
+    )
 
     # ---- Input / Output ----
-    arg_parser.add_argument("-i", "--input.file", required=True, help="Path to XSLX file to be parsed.")
+    arg_parser.add_argument(
+        "-i",
+        "--input.file",
+        required=True,
+        help="Path to XSLX file to be parsed. A snapshot file (--snapshot.file) is read instead without parsing.",
+    )
+    arg_parser.add_argument(
+        "--input.engine",
+        default=InputEngine.openpyxl,
+        type=InputEngine,
+        help="""XLSX reader backend.
+
+Possible engines:
+openpyxl: Read the workbook with openpyxl.
+xml:      Stream the sheet XML directly. Faster for large sheets. Date formatted cells are read as numbers.
+""",
+    )
+    arg_parser.add_argument(
+        "--input.workers",
+        type=Optional[int],
+        default=None,
+        help="Number of worker processes parsing multiple sheets concurrently. Default: One per sheet, max. #CPUs.",
+    )
     arg_parser.add_argument(
         "-o",
         "--output.file",
@@ -67,16 +345,31 @@ def parse_config(prog: str, version: str, copy_right: str, author: str, arg_list
         default=OUTPUT_ENCODING_DEFAULT,
         help="Output file encoding",
     )
+    arg_parser.add_argument(
+        "--output.encoding-errors",
+        default=EncodingErrors.strict,
+        type=EncodingErrors,
+        help="""Handling of characters not representable in the output encoding.
+
+Possible handlings:
+strict:        Fail and report all affected texts before writing the output file.
+transliterate: Replace by similar characters, e.g. '–' by '-' or 'č' by 'c'. '?' if there is none.
+replace:       Replace by '?'.
+""",
+    )
 
     arg_parser.add_argument(
         "--output.format",
-        default=str(CsvFormat.format_1_1),
-        choices=[str(CsvFormat.format_1_1), str(CsvFormat.format_3_3)],
-        help="""CSV output format.
+        default=str(OutputFormat.format_1_1),
+        choices=output_formats(),
+        help="""Output format.
 
 Possible formats:
-1/1: Name / Address
-3/3: Main- Middle- Sub- Name/Main- Middle- Sub-Address
+1/1:    CSV: Name / Address
+3/3:    CSV: Main- Middle- Sub- Name/Main- Middle- Sub-Address
+json:   JSON document with the main / middle group hierarchy
+ndjson: Newline delimited JSON, one group address per line
+xml:    ETS group address XML
 """,
     )
     arg_parser.add_argument(
@@ -91,15 +384,152 @@ comma:     ,
 semicolon: ;
 """,
     )
+    arg_parser.add_argument(
+        "--output.targets",
+        type=Optional[List[OutputTarget]],
+        default=None,
+        help="""List of output targets written from a single parse of the workbook, e.g.
+'[{"file": "ga.csv"}, {"file": "ga.xml", "format": "xml", "encoding": "utf-8"}]'.
+Each target requires a file. Unset format, separator, encoding and encoding_errors are taken from the --output
+options. If set, the targets are written instead of --output.file.""",
+    )
+    arg_parser.add_argument(
+        "--output.workers",
+        type=int,
+        default=1,
+        help="Number of threads writing the output targets concurrently.",
+    )
+
+    arg_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="""Stream group addresses from the sheet directly into the output file without collecting them first.
+Keeps memory usage flat for very large sheets. Requires the sheet to be sorted by group address.""",
+    )
+
+    arg_parser.add_argument(
+        "--cache.dir",
+        required=False,
+        default=None,
+        help="""Directory of the incremental export cache. Disabled if not set.
+The conversion is skipped if input file, configuration and output file are unchanged since the last run.
+Parsed group addresses are reused if only the output options changed.""",
+    )
+
+    # ---- Filter ----
+    arg_parser.add_argument(
+        "--filter.address",
+        type=Optional[str],
+        default=None,
+        help="""Export only the group addresses of comma separated address ranges 'MAIN' or 'MAIN/MIDDLE'.
+Each part is an ID or a range 'FIRST-LAST', e.g. '1,2/0-3': Main group 1 and the middle groups 0-3 of main group 2.""",
+    )
+    arg_parser.add_argument(
+        "--filter.name",
+        type=Optional[str],
+        default=None,
+        help="Export only group addresses with a name (incl. target ID) matching a glob pattern, e.g. '*Kitchen*'.",
+    )
+    arg_parser.add_argument(
+        "--filter.dpt",
+        type=Optional[str],
+        default=None,
+        help="Export only group addresses with a DPT matching one of comma separated glob patterns, e.g. 'DPST-1-*'.",
+    )
+
+    # ---- Diff-aware Export ----
+    arg_parser.add_argument(
+        "--diff.previous",
+        type=Optional[str],
+        default=None,
+        help="""Previous export to compare the group addresses with. Disabled if not set.
+Either a CSV file exported in format 1/1 or 3/3 using the same separator and encoding, or a snapshot file.
+Might be the output file itself. It is read before the new output is written.""",
+    )
+    arg_parser.add_argument(
+        "--diff.delta-file",
+        type=Optional[str],
+        default=None,
+        help="""Path of a CSV file containing only the added and changed group addresses, e.g. for an ETS import.
+Written in format 1/1 if the output format is not a CSV format.""",
+    )
+    arg_parser.add_argument(
+        "--diff.report-file",
+        type=Optional[str],
+        default=None,
+        help="Path of a JSON report listing added, removed, renamed and changed group addresses.",
+    )
+    arg_parser.add_argument(
+        "--snapshot.file",
+        type=Optional[str],
+        default=None,
+        help="""Path of a snapshot file of the parsed group addresses, e.g. to be compared with later or to be used
+as input file. Written as JSON for *.json files, otherwise in a compact binary format.""",
+    )
+
+    # ---- Watch Mode ----
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="""Stay resident and re-export whenever the input file changes. Stop with Ctrl+C.
+The configuration is parsed and libraries are imported only once for all conversions.""",
+    )
+    arg_parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="Interval in seconds of polling the input file for changes in watch mode.",
+    )
+    arg_parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=0.5,
+        help="Time in seconds the input file must be unchanged before it is re-exported in watch mode.",
+    )
+
+    # ---- Profiling ----
+    arg_parser.add_argument(
+        "--timings",
+        type=Optional[TimingsFormat],
+        default=None,
+        help="""Report wall time, scanned / skipped rows, #GA and peak RSS of each conversion stage.
+Disabled if not set.
+
+Possible formats:
+text: Human readable table
+json: JSON document for further processing
+""",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        type=Optional[str],
+        default=None,
+        help="Path of a cProfile statistics dump of the conversion, e.g. for analysis with pstats or snakeviz.",
+    )
 
     # ---- Sheet Config ----
     arg_parser.add_argument(
         "--layout.sheet-name",
+        type=Union[str, list[str]],
         default="KNX Group Addresses",
-        help="Name of XLSX sheet containing the KNX group addresses",
+        help="""Name of XLSX sheet containing the KNX group addresses.
+Glob patterns and lists select multiple sheets, e.g. 'Wing *' or '[Wing A, Wing B]'.
+Group addresses of multiple sheets are merged into a single export.""",
     )
     arg_parser.add_argument("--layout.first-row", default=8, help="First row containing GAs")
-    arg_parser.add_argument("--layout.last-column", default=10, help="Last column")
+    arg_parser.add_argument(
+        "--layout.last-column",
+        default=None,
+        help="Deprecated and ignored, only the configured columns are read.",
+    )
+    arg_parser.add_argument(
+        "--layout.max-empty-rows",
+        type=int,
+        default=0,
+        help="""Number of consecutive empty rows marking the end of the group addresses of a sheet.
+Trailing formatted but empty rows are not read. Group addresses after such a gap are ignored.
+0: Read all rows up to the end of the sheet.""",
+    )
 
     arg_parser.add_argument("--layout.main-ID-column", default=0, help="Column containing main ID of KNX GA")
     arg_parser.add_argument("--layout.middle-ID-column", default=2, help="Column containing middle ID of KNX GA")
@@ -113,7 +543,4 @@ semicolon: ;
     arg_parser.add_argument("--layout.target-ID-column", default=6, help="Column containing target ID KNX GA")
     arg_parser.add_argument("--layout.comment-column", default=9, help="Column containing GA comment")
 
-    # ---- Finally parse the inputs  ----
-    config = arg_parser.parse_args(args=arg_list)
-
-    return config
+    return arg_parser
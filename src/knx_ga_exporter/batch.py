@@ -0,0 +1,167 @@
+"""Batch conversion of multiple jobs using a pool of worker processes."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from argparse import ArgumentError
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+from .argparse import build_arg_parser, parse_batch_config
+from .conversion import convert
+from .logging import configure_logging, configure_worker_logging, forward_worker_logging
+from .parser import load_workbook
+from .reader import InputEngine, WorkbookReader
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=4)
+def _load_workbook_cached(input_file: str, engine: Optional[InputEngine] = None) -> WorkbookReader:
+    """Load a workbook. Workbooks loaded within a worker process are reused by subsequent jobs of the same workbook.
+
+    Defined as module function to be picklable, e.g. for the worker processes parsing multiple sheets of a job.
+
+    Arguments:
+        input_file: Path of input file.
+        engine: Workbook reader backend.
+
+    Returns:
+        Loaded workbook
+    """
+    return load_workbook(input_file, engine)
+
+
+@dataclass
+class JobResult:
+    """Result of a single batch job."""
+
+    index: int
+    name: str
+    duration: float
+    ga_count: Optional[int] = None
+    error: Optional[str] = None
+
+    def __str__(self) -> str:
+        """Build string representation.
+
+        Returns:
+            Formatted string.
+        """
+        if self.error is not None:
+            status = f"FAILED: {self.error}"
+        elif self.ga_count is None:
+            status = "OK (up-to-date)"
+        else:
+            status = f"OK (#GA: {self.ga_count})"
+        return f"Job {self.index + 1:3d} | {self.duration:8.3f} s | {self.name} | {status}"
+
+
+def run_batch(prog: str, version: str, copy_right: str, author: str, arg_list: list[str]) -> int:
+    """Run all jobs of a batch manifest.
+
+    Arguments:
+        prog: Program name.
+        version: Program version.
+        copy_right: Copyright info.
+        author: Author info.
+        arg_list: Command line arguments list following the 'batch' command.
+
+    Returns:
+        int: Numeric exit code. Failure if any job failed.
+    """
+    batch_config = parse_batch_config(
+        prog=prog, version=version, copy_right=copy_right, author=author, arg_list=arg_list
+    )
+    configure_logging(batch_config.verbose, batch_config.log.format, batch_config.log.file)
+
+    with open(batch_config.manifest, encoding="utf-8") as manifest_file:
+        jobs = json.load(manifest_file)["jobs"]
+    logging.info("Running %s batch jobs with %s workers", len(jobs), batch_config.workers)
+
+    start = time.perf_counter()
+    arg_parser = build_arg_parser(prog=prog, version=version, copy_right=copy_right, author=author, exit_on_error=False)
+    results = []
+    configs = []
+    for index, job in enumerate(jobs):
+        try:
+            configs.append((index, arg_parser.parse_object(job)))
+        except ArgumentError as e:
+            results.append(_report(JobResult(index=index, name=_job_name(job), duration=0.0, error=str(e))))
+
+    if batch_config.workers == 1:
+        results.extend(_report(_run_job(index, config)) for index, config in configs)
+        _load_workbook_cached.cache_clear()
+    else:
+        # Log records of the workers are written by the log pipeline of the main process.
+        log_queue = multiprocessing.Queue()
+        with forward_worker_logging(log_queue):
+            with ProcessPoolExecutor(
+                max_workers=batch_config.workers,
+                initializer=configure_worker_logging,
+                initargs=(log_queue, batch_config.verbose),
+            ) as pool:
+                futures = [pool.submit(_run_job, index, config) for index, config in configs]
+                results.extend(_report(future.result()) for future in as_completed(futures))
+
+    results.sort(key=lambda result: result.index)
+    failed_count = sum(1 for result in results if result.error is not None)
+    for result in results:
+        print(result)
+    print(
+        f"Batch finished in {time.perf_counter() - start:.3f} s: "
+        + f"{len(results) - failed_count} succeeded, {failed_count} failed"
+    )
+
+    return os.EX_OK if failed_count == 0 else 1
+
+
+def _run_job(index: int, config: dict) -> JobResult:
+    """Run a single batch job.
+
+    Arguments:
+        index: Index of the job within the manifest
+        config: Config hierarchy of the job
+
+    Returns:
+        Job result
+    """
+    start = time.perf_counter()
+    try:
+        ga_count = convert(config, workbook_loader=_load_workbook_cached)
+        return JobResult(index=index, name=config.output.file, duration=time.perf_counter() - start, ga_count=ga_count)
+    except Exception as e:  # pylint: disable=broad-exception-caught;reason=Failed jobs must not abort the batch.
+        return JobResult(index=index, name=config.output.file, duration=time.perf_counter() - start, error=str(e))
+
+
+def _report(result: JobResult) -> JobResult:
+    """Log a finished batch job.
+
+    Arguments:
+        result: Job result
+
+    Returns:
+        The unmodified job result
+    """
+    if result.error is not None:
+        logging.error("%s", result)
+    else:
+        logging.info("%s", result)
+    return result
+
+
+def _job_name(job: dict) -> str:
+    """Name of a job which could not be parsed.
+
+    Arguments:
+        job: Job configuration from the manifest
+
+    Returns:
+        Output file if configured, otherwise the input file.
+    """
+    return str(job.get("output", {}).get("file") or job.get("input", {}).get("file"))
@@ -0,0 +1,178 @@
+"""On-disk cache for incremental exports."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+from typing import Optional
+
+from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.snapshot import group_addresses_to_records, records_to_group_addresses
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class ExportCache:
+    """Cache of parsed group addresses and exported output files.
+
+    Parsed group addresses are keyed on the hash of the input file and the layout configuration.
+    Exported output files are keyed additionally on the output configuration and are only considered current
+    if the output file still has the content written by the last export.
+    """
+
+    def __init__(
+        self, cache_dir: str, input_file: str, layout_config: dict, filter_config: Optional[dict] = None
+    ) -> None:
+        """Initialize the cache.
+
+        Arguments:
+            cache_dir: Directory of the cache files. Created if not existing.
+            input_file: Path of the input file.
+            layout_config: Workbook layout configuration
+            filter_config: Optional filter configuration selecting the parsed group addresses.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.parse_key = _hash_text(
+            importlib.metadata.version("knx_ga_exporter")
+            + _hash_file(input_file)
+            + _config_to_json(layout_config)
+            + ("" if filter_config is None else _config_to_json(filter_config))
+        )
+
+    def is_output_current(self, output_config: dict) -> bool:
+        """Check whether the output file is still current.
+
+        Arguments:
+            output_config: Output configuration hierarchy.
+
+        Returns:
+            True if the output was written by an export with identical input and configuration and is unmodified.
+        """
+        record = self._read(self._export_path(output_config))
+        if record is None or not os.path.isfile(output_config.file):
+            return False
+        return record["output_hash"] == _hash_file(output_config.file)
+
+    def store_output(self, output_config: dict) -> None:
+        """Record a finished export of the output file.
+
+        Arguments:
+            output_config: Output configuration hierarchy.
+        """
+        self._write(self._export_path(output_config), {"output_hash": _hash_file(output_config.file)})
+
+    def load_group_addresses(self) -> Optional[list[GroupAddress]]:
+        """Load the cached parsed group addresses.
+
+        Returns:
+            Parsed KNX group addresses or None if not cached.
+        """
+        record = self._read(self._group_addresses_path())
+        if record is None:
+            return None
+        logging.info("Using %s cached group addresses", len(record["group_addresses"]))
+        return records_to_group_addresses(record["group_addresses"])
+
+    def store_group_addresses(self, group_addresses: list[GroupAddress]) -> None:
+        """Cache the parsed group addresses.
+
+        Arguments:
+            group_addresses: KNX group addresses
+        """
+        self._write(self._group_addresses_path(), {"group_addresses": group_addresses_to_records(group_addresses)})
+
+    def _group_addresses_path(self) -> str:
+        """Path of the cached group addresses.
+
+        Returns:
+            File path
+        """
+        return os.path.join(self.cache_dir, f"gas-{self.parse_key}.json")
+
+    def _export_path(self, output_config: dict) -> str:
+        """Path of the export record of an output configuration.
+
+        Arguments:
+            output_config: Output configuration hierarchy.
+
+        Returns:
+            File path
+        """
+        export_key = _hash_text(self.parse_key + _config_to_json(output_config))
+        return os.path.join(self.cache_dir, f"export-{export_key}.json")
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict]:
+        """Read a cache file.
+
+        Arguments:
+            path: File path
+
+        Returns:
+            Cache file contents or None if not existing or unreadable.
+        """
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: str, contents: dict) -> None:
+        """Write a cache file atomically.
+
+        Arguments:
+            path: File path
+            contents: Cache file contents
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(contents, cache_file)
+        os.replace(temp_path, path)
+
+
+def _config_to_json(config: dict) -> str:
+    """Serialize a configuration hierarchy deterministically.
+
+    Arguments:
+        config: Configuration hierarchy
+
+    Returns:
+        JSON string
+    """
+    return json.dumps(config.as_dict(), sort_keys=True, default=str)
+
+
+def _hash_text(text: str) -> str:
+    """Hash a text.
+
+    Arguments:
+        text: Text
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _hash_file(path: str) -> str:
+    """Hash the contents of a file.
+
+    Arguments:
+        path: File path
+
+    Returns:
+        SHA-256 hex digest
+    """
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(_HASH_CHUNK_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
@@ -0,0 +1,123 @@
+"""Conversion of a single workbook sheet into an output file."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import logging
+import os
+from itertools import chain
+from typing import Callable, Optional
+
+from .cache import ExportCache
+from .diff import export_diff
+from .exporter import export_output_targets, resolve_output_targets
+from .filtering import GroupAddressFilter
+from .parser import (
+    iter_group_addresses,
+    load_workbook,
+    merge_sheet_group_addresses,
+    parse_group_addresses,
+    parse_sheets,
+    resolve_sheet_names,
+)
+from .profiling import Timings
+from .reader import WorkbookReader
+from .snapshot import is_snapshot, read_snapshot, write_snapshot
+
+# ---- Functions -------------------------------------------------------------------------------------------------------
+
+
+def convert(
+    config: dict, workbook_loader: Callable[..., WorkbookReader] = load_workbook, timings: Optional[Timings] = None
+) -> Optional[int]:
+    """Convert the configured input workbook or snapshot into the output files.
+
+    Arguments:
+        config: Config hierarchy
+        workbook_loader: Function loading the input workbook. Receives input file path and reader engine.
+            Also used by the worker processes parsing multiple sheets, must be picklable.
+        timings: Optional statistics of the conversion stages, filled in during the conversion.
+
+    Returns:
+        Number of exported group addresses or None if the output files were already up-to-date.
+
+    Raises:
+        ValueError: If options requiring the collected group addresses are combined with streaming.
+    """
+    if config.stream and (config.diff.previous is not None or config.snapshot.file is not None):
+        raise ValueError("Diff-aware exports and snapshots can not be combined with streaming (--stream).")
+
+    timings = timings if timings is not None else Timings()
+    ga_filter = GroupAddressFilter.from_config(config.filter)
+    cache = None
+    if config.cache.dir is not None:
+        with timings.stage("cache check"):
+            cache = ExportCache(config.cache.dir, config.input.file, config.layout, config.filter)
+            target_configs = resolve_output_targets(config.output)
+            is_output_current = all(cache.is_output_current(target_config) for target_config in target_configs)
+        # Diff and snapshot are built from the group addresses, not the output files: Written even if these are current
+        if is_output_current and config.diff.previous is None and config.snapshot.file is None:
+            for target_config in target_configs:
+                logging.info("Output file '%s' is up-to-date.", target_config.file)
+            logging.info("Skipping conversion.")
+            return None
+
+    gas = None
+    ga_count = None
+    if cache is not None:
+        with timings.stage("cache load") as stats:
+            gas = cache.load_group_addresses()
+            stats.ga_count = None if gas is None else len(gas)
+    if gas is None and is_snapshot(config.input.file):
+        with timings.stage("load snapshot") as stats:
+            gas = read_snapshot(config.input.file)
+            if ga_filter is not None:
+                gas = [ga for ga in gas if ga_filter.matches_group_address(ga)]
+            stats.ga_count = len(gas)
+    if gas is None:
+        with timings.stage("load workbook"):
+            wb = workbook_loader(config.input.file, config.input.engine)
+            sheet_names = resolve_sheet_names(wb, config.layout.sheet_name)
+        workers = config.input.workers or min(len(sheet_names), os.cpu_count() or 1)
+        if config.stream:
+            # Group addresses are parsed lazily while exporting, both are measured as a single stage
+            with timings.stage("parse + export") as stats:
+                gas = chain.from_iterable(
+                    iter_group_addresses(wb, config.layout, sheet, stats, ga_filter) for sheet in sheet_names
+                )
+                ga_count = stats.ga_count = export_output_targets(config.output, gas, stream=True)
+        else:
+            with timings.stage("parse") as stats:
+                if workers > 1:
+                    gas = parse_sheets(
+                        config.input.file,
+                        config.input.engine,
+                        config.layout,
+                        sheet_names,
+                        workers,
+                        stats,
+                        ga_filter,
+                        workbook_loader,
+                    )
+                else:
+                    gas = merge_sheet_group_addresses(
+                        (sheet, parse_group_addresses(wb, config.layout, sheet, stats, ga_filter))
+                        for sheet in sheet_names
+                    )
+                stats.ga_count = len(gas)
+            if cache is not None:
+                with timings.stage("cache store"):
+                    cache.store_group_addresses(gas)
+    if config.diff.previous is not None:
+        # Compared before exporting, the previous export might be the output file
+        with timings.stage("diff"):
+            export_diff(config, gas)
+    if ga_count is None:
+        with timings.stage("export") as stats:
+            ga_count = stats.ga_count = export_output_targets(config.output, gas, stream=config.stream)
+    if config.snapshot.file is not None:
+        with timings.stage("snapshot"):
+            write_snapshot(config.snapshot.file, gas)
+    if cache is not None:
+        for target_config in target_configs:
+            cache.store_output(target_config)
+
+    return ga_count
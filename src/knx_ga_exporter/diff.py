@@ -0,0 +1,288 @@
+"""Comparison of the parsed group addresses with a previous export."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import csv
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, Iterator
+
+from knx_ga_exporter.exporter import (
+    CSV_SEPARATORS,
+    HEADER_1_1,
+    HEADER_3_3,
+    OutputFormat,
+    export_group_addresses,
+    format_ga_description,
+    format_ga_name,
+)
+from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.snapshot import is_snapshot, read_snapshot
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ExportedGroupAddress:
+    """Group address as seen by ETS: The attributes contained in the exported CSV files."""
+
+    address: str
+    main_name: str
+    middle_name: str
+    name: str
+    description: str
+    dpt: str
+
+
+@dataclass
+class GroupAddressChange:
+    """Modification of a group address existing in the previous and the current export."""
+
+    previous: ExportedGroupAddress
+    current: ExportedGroupAddress
+
+    @property
+    def changed_fields(self) -> list[str]:
+        """Names of all modified attributes.
+
+        Returns:
+            Attribute names
+        """
+        return [name for name, value in asdict(self.current).items() if getattr(self.previous, name) != value]
+
+
+@dataclass
+class GroupAddressDiff:
+    """Differences between the previous and the current export."""
+
+    added: list[ExportedGroupAddress] = field(default_factory=list)
+    removed: list[ExportedGroupAddress] = field(default_factory=list)
+    changed: list[GroupAddressChange] = field(default_factory=list)
+
+    @property
+    def renamed(self) -> list[GroupAddressChange]:
+        """Changes of the group address names.
+
+        Returns:
+            Changed group addresses with a modified name.
+        """
+        return [change for change in self.changed if change.previous.name != change.current.name]
+
+    def to_report(self) -> dict:
+        """Build the machine-readable report.
+
+        Returns:
+            JSON serializable report.
+        """
+        return {
+            "summary": {
+                "added": len(self.added),
+                "removed": len(self.removed),
+                "changed": len(self.changed),
+                "renamed": len(self.renamed),
+            },
+            "added": [asdict(ga) for ga in self.added],
+            "removed": [asdict(ga) for ga in self.removed],
+            "renamed": [
+                {"address": change.current.address, "previous_name": change.previous.name, "name": change.current.name}
+                for change in self.renamed
+            ],
+            "changed": [
+                {
+                    "address": change.current.address,
+                    "fields": {
+                        name: {"previous": getattr(change.previous, name), "current": getattr(change.current, name)}
+                        for name in change.changed_fields
+                    },
+                }
+                for change in self.changed
+            ],
+        }
+
+
+def export_diff(config: dict, group_addresses: list[GroupAddress]) -> GroupAddressDiff:
+    """Compare the group addresses with the previous export and write the delta CSV and the report.
+
+    The delta CSV is written in the CSV output format, format 1/1 if the output format is not a CSV format.
+
+    Arguments:
+        config: Config hierarchy
+        group_addresses: Parsed KNX group addresses
+
+    Returns:
+        Differences between the previous export and the group addresses.
+    """
+    previous = load_previous_export(config.diff.previous, config.output.encoding, str(config.output.separator))
+    current = {exported.address: (exported, ga) for exported, ga in _exported_pairs(group_addresses)}
+    diff = diff_group_addresses(previous, {address: exported for address, (exported, _) in current.items()})
+    logging.info(
+        "Changes since previous export '%s': %s added, %s removed, %s changed (%s renamed)",
+        config.diff.previous,
+        len(diff.added),
+        len(diff.removed),
+        len(diff.changed),
+        len(diff.renamed),
+    )
+
+    if config.diff.delta_file is not None:
+        delta_config = config.output.clone()
+        delta_config.file = config.diff.delta_file
+        # The delta is imported into ETS as CSV, also if the output file is written in another format
+        if str(delta_config.format) not in (str(OutputFormat.format_1_1), str(OutputFormat.format_3_3)):
+            delta_config.format = str(OutputFormat.format_1_1)
+        delta_addresses = [ga.address for ga in diff.added] + [change.current.address for change in diff.changed]
+        export_group_addresses(
+            delta_config, [current[address][1] for address in sorted(delta_addresses, key=_address_key)]
+        )
+
+    if config.diff.report_file is not None:
+        temp_path = f"{config.diff.report_file}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as report_file:
+            json.dump(diff.to_report(), report_file, indent=2, ensure_ascii=False)
+        os.replace(temp_path, config.diff.report_file)
+
+    return diff
+
+
+def diff_group_addresses(
+    previous: dict[str, ExportedGroupAddress], current: dict[str, ExportedGroupAddress]
+) -> GroupAddressDiff:
+    """Compare two sets of group addresses keyed by their address in linear time.
+
+    Arguments:
+        previous: Group addresses of the previous export
+        current: Group addresses of the current export
+
+    Returns:
+        Differences in order of the addresses.
+    """
+    diff = GroupAddressDiff()
+    for address, exported in current.items():
+        previous_exported = previous.get(address)
+        if previous_exported is None:
+            diff.added.append(exported)
+        elif previous_exported != exported:
+            diff.changed.append(GroupAddressChange(previous=previous_exported, current=exported))
+    diff.removed.extend(exported for address, exported in previous.items() if address not in current)
+
+    diff.added.sort(key=lambda ga: _address_key(ga.address))
+    diff.removed.sort(key=lambda ga: _address_key(ga.address))
+    diff.changed.sort(key=lambda change: _address_key(change.current.address))
+    return diff
+
+
+def load_previous_export(path: str, encoding: str, separator: str) -> dict[str, ExportedGroupAddress]:
+    """Load the group addresses of a previous export.
+
+    Arguments:
+        path: Path of a snapshot file or a CSV file exported in format 1/1 or 3/3.
+        encoding: Encoding of the CSV file
+        separator: Separator of the CSV file
+
+    Returns:
+        Exported group addresses keyed by their address. Empty if the file does not exist.
+
+    Raises:
+        ValueError: If the format of the CSV file is not supported.
+    """
+    if not os.path.exists(path):
+        logging.warning("Previous export '%s' does not exist. All group addresses are reported as added.", path)
+        return {}
+    if is_snapshot(path):
+        return {exported.address: exported for exported, _ in _exported_pairs(read_snapshot(path))}
+
+    with open(path, encoding=encoding, newline="") as csv_file:
+        rows = csv.reader(csv_file, delimiter=CSV_SEPARATORS[separator])
+        header = tuple(next(rows, ()))
+        if header == HEADER_1_1:
+            exported_gas = _read_csv_format_1_1(rows)
+        elif header == HEADER_3_3:
+            exported_gas = _read_csv_format_3_3(rows)
+        else:
+            raise ValueError(f"Unsupported format of previous export '{path}'. Header: {header}")
+        return {exported.address: exported for exported in exported_gas}
+
+
+def _exported_pairs(group_addresses: Iterable[GroupAddress]) -> Iterator[tuple[ExportedGroupAddress, GroupAddress]]:
+    """Determine the exported attributes of group addresses.
+
+    Arguments:
+        group_addresses: KNX group addresses
+
+    Yields:
+        Exported attributes and the group address.
+    """
+    for ga in group_addresses:
+        exported = ExportedGroupAddress(
+            address=f"{ga.main}/{ga.middle}/{ga.sub}",
+            main_name=str(ga.main_name),
+            middle_name=str(ga.middle_name),
+            name=str(format_ga_name(ga)),
+            description=format_ga_description(ga) or "",
+            dpt=str(ga.dpt),
+        )
+        yield exported, ga
+
+
+def _read_csv_format_1_1(rows: Iterator[list[str]]) -> Iterator[ExportedGroupAddress]:
+    """Read the group addresses of a CSV file in format 1/1.
+
+    Arguments:
+        rows: CSV rows following the header
+
+    Yields:
+        Exported group addresses
+    """
+    group_names = {}
+    for name, address, _, _, description, dpt, *_ in rows:
+        main, middle, sub = address.split("/")
+        if sub == "-":
+            group_names[(main, middle)] = name
+            continue
+        yield ExportedGroupAddress(
+            address=address,
+            main_name=group_names.get((main, "-"), ""),
+            middle_name=group_names.get((main, middle), ""),
+            name=name,
+            description=description,
+            dpt=dpt,
+        )
+
+
+def _read_csv_format_3_3(rows: Iterator[list[str]]) -> Iterator[ExportedGroupAddress]:
+    """Read the group addresses of a CSV file in format 3/3.
+
+    Arguments:
+        rows: CSV rows following the header
+
+    Yields:
+        Exported group addresses
+    """
+    group_names = {}
+    for main_name, middle_name, name, main, middle, sub, _, _, description, dpt, *_ in rows:
+        if main_name:
+            group_names[(main, "")] = main_name
+        elif middle_name:
+            group_names[(main, middle)] = middle_name
+        else:
+            yield ExportedGroupAddress(
+                address=f"{main}/{middle}/{sub}",
+                main_name=group_names.get((main, ""), ""),
+                middle_name=group_names.get((main, middle), ""),
+                name=name,
+                description=description,
+                dpt=dpt,
+            )
+
+
+def _address_key(address: str) -> tuple[int, ...]:
+    """Sort key of a formatted group address.
+
+    Arguments:
+        address: Group address formatted as main/middle/sub
+
+    Returns:
+        Numeric address parts
+    """
+    return tuple(int(part) for part in address.split("/"))
@@ -0,0 +1,186 @@
+"""Compatibility of group address texts with the output file encoding."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import codecs
+import unicodedata
+from enum import Enum
+from typing import Callable, Iterable
+
+from knx_ga_exporter.group_address import GroupAddress
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Name of the codec error handler transliterating characters not representable in the output encoding
+TRANSLITERATE_ERROR_HANDLER = "knx-ga-exporter-transliterate"
+
+# Replacement of common typographic characters not decomposable by unicode normalization.
+# Transliterations are applied to the quoted CSV output, so they must not contain double quotes.
+_TRANSLITERATIONS = {
+    "‐": "-",  # hyphen
+    "‑": "-",  # non-breaking hyphen
+    "‒": "-",  # figure dash
+    "–": "-",  # en dash
+    "—": "-",  # em dash
+    "‘": "'",  # left single quotation mark
+    "’": "'",  # right single quotation mark
+    "‚": "'",  # single low-9 quotation mark
+    "“": "'",  # left double quotation mark
+    "”": "'",  # right double quotation mark
+    "„": "'",  # double low-9 quotation mark
+    "•": "*",  # bullet
+    "…": "...",  # horizontal ellipsis
+    "→": "->",  # rightwards arrow
+    "€": "EUR",  # euro sign
+    "ß": "ss",  # sharp s
+    "Ä": "Ae",
+    "Ö": "Oe",
+    "Ü": "Ue",
+    "ä": "ae",
+    "ö": "oe",
+    "ü": "ue",
+}
+
+# Group address attributes exported into the output file
+_EXPORTED_ATTRIBUTES = {
+    "main_name": "main group name",
+    "middle_name": "middle group name",
+    "sub_name": "sub group name",
+    "target_id": "target ID",
+    "comment": "comment",
+    "dpt": "DPT",
+}
+
+# Number of address levels identifying the group an attribute belongs to. Group addresses otherwise.
+_GROUP_LEVELS = {
+    "main_name": 1,
+    "middle_name": 2,
+}
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class EncodingErrors(Enum):
+    """Handling of characters not representable in the output encoding."""
+
+    strict = "strict"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    transliterate = "transliterate"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    replace = "replace"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+
+    def __str__(self) -> str:
+        """String representation.
+
+        Returns:
+            str: String representation
+        """
+        return self.value
+
+    @property
+    def codec_errors(self) -> str:
+        """Name of the codec error handler.
+
+        Returns:
+            Error handler name usable with str.encode().
+        """
+        return TRANSLITERATE_ERROR_HANDLER if self == EncodingErrors.transliterate else self.value
+
+
+def find_encoding_issues(group_addresses: Iterable[GroupAddress], encoding: str) -> list[str]:
+    """Check all exported texts of the group addresses against the output encoding in a single sweep.
+
+    Every distinct text is checked only once. Texts of a main or middle group are reported once per group.
+
+    Arguments:
+        group_addresses: KNX group addresses
+        encoding: Output file encoding
+
+    Returns:
+        Descriptions of all texts not representable in the encoding.
+    """
+    encoder = codecs.getencoder(encoding)
+    invalid_texts = {}
+    issues = {}
+    for ga in group_addresses:
+        address = (ga.main, ga.middle, ga.sub)
+        for attribute, attribute_name in _EXPORTED_ATTRIBUTES.items():
+            text = getattr(ga, attribute)
+            if type(text) is not str:
+                continue
+            characters = invalid_texts.get(text)
+            if characters is None:
+                characters = invalid_texts[text] = _invalid_characters(encoder, text)
+            if not characters:
+                continue
+            group = "/".join(str(part) for part in address[: _GROUP_LEVELS.get(attribute, 3)])
+            if (group, attribute) not in issues:
+                issues[group, attribute] = f"{group}: {attribute_name} '{text}' contains " + ", ".join(
+                    repr(character) for character in characters
+                )
+    return list(issues.values())
+
+
+def transliterate(character: str, encoding: str) -> str:
+    """Transliterate a character to a representation in the encoding.
+
+    Arguments:
+        character: Character not representable in the encoding
+        encoding: Output file encoding
+
+    Returns:
+        Transliteration of the character. '?' if no representation exists.
+    """
+    candidates = [
+        _TRANSLITERATIONS.get(character, ""),
+        "".join(c for c in unicodedata.normalize("NFKD", character) if not unicodedata.combining(c)).replace('"', "'"),
+    ]
+    encoder = codecs.getencoder(encoding)
+    return next((candidate for candidate in candidates if candidate and _is_encodable(encoder, candidate)), "?")
+
+
+def _invalid_characters(encoder: Callable, text: str) -> list[str]:
+    """Determine the characters of a text not representable in an encoding.
+
+    Arguments:
+        encoder: Encoder function of the encoding
+        text: Checked text
+
+    Returns:
+        Distinct characters not representable in order of their occurrence. Empty if the text is representable.
+    """
+    try:
+        encoder(text)
+        return []
+    except UnicodeEncodeError:
+        return list(dict.fromkeys(character for character in text if not _is_encodable(encoder, character)))
+
+
+def _is_encodable(encoder: Callable, text: str) -> bool:
+    """Check whether a text is representable in an encoding.
+
+    Arguments:
+        encoder: Encoder function of the encoding
+        text: Checked text
+
+    Returns:
+        True if representable.
+    """
+    try:
+        encoder(text)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def _transliterate_error_handler(error: UnicodeError) -> tuple[str, int]:
+    """Codec error handler transliterating the characters which cannot be encoded.
+
+    Arguments:
+        error: Encoding error
+
+    Returns:
+        Replacement text and the position where encoding continues.
+    """
+    characters = error.object[error.start : error.end]
+    return "".join(transliterate(character, error.encoding) for character in characters), error.end
+
+
+codecs.register_error(TRANSLITERATE_ERROR_HANDLER, _transliterate_error_handler)
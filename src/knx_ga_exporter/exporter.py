@@ -1,22 +1,83 @@
 """Handling of different output target and formats."""
 
 # ---- Imports ---------------------------------------------------------------------------------------------------------
+import bisect
 import csv
+import io
+import json
 import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum
+from typing import BinaryIO, Callable, Generator, Iterable, Iterator, Optional, Sequence, TextIO, Union
 
+from knx_ga_exporter.encoding import EncodingErrors, find_encoding_issues
 from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.grouping import MainGroup, build_group_index, stream_group_index
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+CSV_SEPARATORS = {"tabulator": "\t", "comma": ",", "semicolon": ";"}
+
+# File creation mask of the process, applied to new output files. Read once: Setting it is not thread-safe.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Row templates of format 1/1
+HEADER_1_1 = ("Group name", "Address", "Central", "Unfiltered", "Description", "DatapointType", "Security")
+_GROUP_SUFFIX_1_1 = ("", "", "", "", "Auto")
+
+# Row templates of format 3/3
+HEADER_3_3 = (
+    "Main",
+    "Middle",
+    "Sub",
+    "Main",
+    "Middle",
+    "Sub",
+    "Central",
+    "Unfiltered",
+    "Description",
+    "DatapointType",
+    "Security",
+)
+_MAIN_GROUP_SUFFIX_3_3 = ("", "", "", "", "", "", "Auto")
+_MIDDLE_GROUP_SUFFIX_3_3 = ("", "", "", "", "", "Auto")
+
+# Number of CSV rows formatted and encoded at once
+CSV_BATCH_SIZE = 1024
+# Buffer size of the output file
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# Namespace of the ETS group address XML format
+ETS_XML_NAMESPACE = "http://knx.org/xml/ga-export/01"
+_XML_ATTRIBUTE_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+)
+
+# Export functions writing the main groups into the output file, keyed by output format.
+ExportFunction = Callable[[dict, Iterable[MainGroup]], int]
+_EXPORTERS: dict[str, ExportFunction] = {}
 
 # ---- Functions -------------------------------------------------------------------------------------------------------
 
 
-class CsvFormat(Enum):
-    """CSV format types."""
+class OutputFormat(Enum):
+    """Output format types."""
 
     # Name / Address
     format_3_3 = "3/3"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
     # Main- Middle- Sub- Name/Main- Middle- Sub-Address
     format_1_1 = "1/1"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    # Main / middle group hierarchy as JSON document
+    json = "json"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    # One JSON object per group address and line
+    ndjson = "ndjson"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    # ETS group address XML export
+    xml = "xml"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
 
     def __str__(self) -> str:
         """String representation.
@@ -43,214 +104,671 @@ class CsvSeparator(Enum):
         return self.value
 
 
+@dataclass
+class OutputTarget:
+    """Output target of --output.targets. Unset options are taken from the --output options.
+
+    Attributes:
+        file: Path of the output file
+        format: Output format
+        separator: CSV separator
+        encoding: Output file encoding
+        encoding_errors: Handling of characters not representable in the output encoding
+    """
+
+    file: str
+    format: Optional[str] = None
+    separator: Optional[CsvSeparator] = None
+    encoding: Optional[str] = None
+    encoding_errors: Optional[EncodingErrors] = None
+
+
 class CsvWriter:
-    """Write for CSV files."""
+    """Buffered bulk writer for CSV files.
+
+    Rows are collected into batches. Each batch is formatted by a single writerows() call and encoded at once.
+    The encoded batch is written to the binary output file, which should be opened with a large buffer.
+    """
 
-    def __init__(self, file: str, delimiter: str, quoting: str) -> None:
+    def __init__(
+        self,
+        file: BinaryIO,
+        encoding: str,
+        delimiter: str,
+        quoting: int,
+        errors: str = "strict",
+        batch_size: int = CSV_BATCH_SIZE,
+    ) -> None:
         """Initialize the writer.
 
         Arguments:
-            file: File path
+            file: Binary output file
+            encoding: File encoding
             delimiter: File delimiter
             quoting: File quoting
+            errors: Codec error handler applied to characters not representable in the encoding
+            batch_size: Number of rows collected before they are written to the file
         """
-        self.writer = csv.writer(file, delimiter=delimiter, quoting=quoting)
-
-    def write_row(self, row: str) -> None:
-        """Write a single row to the CSV file.
+        self.file = file
+        self.encoding = encoding
+        self.errors = errors
+        self.batch_size = batch_size
+        self.buffer = io.StringIO(newline="")
+        self.writer = csv.writer(self.buffer, delimiter=delimiter, quoting=quoting)
+        self.delimiter = delimiter
+        self.quoting = quoting
+        self.rows = []
+        self.group_addresses = []
+
+    def write_row(self, row: Sequence, ga: Optional[GroupAddress] = None) -> None:
+        """Add a single row to the current batch. Writes the batch if full.
 
         Arguments:
             row: Row contents
+            ga: KNX group address exported by the row. Reported if the row cannot be encoded.
+        """
+        self.rows.append(row)
+        self.group_addresses.append(ga)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the current batch to the file.
 
         Raises:
             ValueError: If writing failed due to an encoding error.
         """
+        self.writer.writerows(self.rows)
         try:
-            self.writer.writerow(row)
+            data = self.buffer.getvalue().encode(self.encoding, self.errors)
         except UnicodeEncodeError as e:
-            raise ValueError(
-                f"""Failed to encode the CSV row string: {row}
+            raise ValueError(self._encoding_error_message(e)) from e
+        self.file.write(data)
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.rows.clear()
+        self.group_addresses.clear()
+
+    def _encoding_error_message(self, error: UnicodeEncodeError) -> str:
+        """Build the error message of a batch which could not be encoded.
+
+        Arguments:
+            error: Encoding error of the complete batch
+
+        Returns:
+            Message describing the row of the batch containing the first character which cannot be encoded.
+        """
+        row_buffer = io.StringIO(newline="")
+        row_writer = csv.writer(row_buffer, delimiter=self.delimiter, quoting=self.quoting)
+        row_ends = []
+        for row in self.rows:
+            row_writer.writerow(row)
+            row_ends.append(row_buffer.tell())
+        index = bisect.bisect_right(row_ends, error.start)
+        ga = self.group_addresses[index]
+        ga_details = "" if ga is None else f"\nKNX group address: {ga}"
+        character = error.object[error.start]
+        return f"""Failed to encode the CSV row string: {self.rows[index]}{ga_details}
 Some characters can most-likely not be represented in the selected encoding.
 Please use only use characters supported by the encoding.
-CSV writer error details: {e}"""
-            ) from e
+CSV writer error details: '{error.encoding}' codec can't encode character {character!r}: {error.reason}"""
+
+
+def register_exporter(output_format: str) -> Callable[[ExportFunction], ExportFunction]:
+    """Register an export function for an output format. Used as decorator.
+
+    The export function is called with the output configuration hierarchy and the main groups. It writes the output
+    file and returns the number of exported group addresses.
+
+    Arguments:
+        output_format: Name of the output format, selectable by --output.format.
+
+    Returns:
+        Decorator registering the export function.
+    """
+
+    def decorator(export_function: ExportFunction) -> ExportFunction:
+        _EXPORTERS[output_format] = export_function
+        return export_function
+
+    return decorator
+
+
+def output_formats() -> list[str]:
+    """Determine all output formats with a registered export function.
+
+    Returns:
+        Names of the output formats.
+    """
+    return list(_EXPORTERS)
 
 
-def export_csv(output_config: dict, group_addresses: list[GroupAddress]) -> None:
-    """Export KNX group address to CSV.
+def resolve_output_targets(output_config: dict) -> list[dict]:
+    """Determine the output configuration of every output target.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+
+    Returns:
+        One output configuration per entry of --output.targets, unset options taken from the --output options.
+        Only the output configuration itself if there are no targets.
+    """
+    base_config = output_config.clone()
+    del base_config.targets
+    del base_config.workers
+    if not output_config.targets:
+        return [base_config]
+
+    target_configs = []
+    for target in output_config.targets:
+        target_config = base_config.clone()
+        for name, value in vars(target).items():
+            if value is not None:
+                setattr(target_config, name, value)
+        target_configs.append(target_config)
+    return target_configs
+
+
+def export_output_targets(output_config: dict, group_addresses: Iterable[GroupAddress], stream: bool = False) -> int:
+    """Export KNX group addresses into all output targets.
+
+    The group addresses are parsed once and written into every target. With --output.workers > 1 the targets are
+    written concurrently by a pool of threads.
 
     Arguments:
         output_config: Output configuration hierarchy.
         group_addresses: KNX group addresses
+        stream: Write the group addresses while iterating them instead of collecting them first.
+                Requires group addresses sorted by address.
+
+    Returns:
+        Number of exported group addresses.
+
+    Raises:
+        ValueError: If multiple output targets are combined with streaming.
     """
-    csv_separators = {"tabulator": "\t", "comma": ",", "semicolon": ";"}
-    exporter_functions = {"1/1": _export_csv_format_1_1, "3/3": _export_csv_format_3_3}
+    target_configs = resolve_output_targets(output_config)
+    if len(target_configs) == 1:
+        return export_group_addresses(target_configs[0], group_addresses, stream)
+    if stream:
+        raise ValueError("Multiple output targets can not be combined with streaming (--stream).")
+
+    group_addresses = list(group_addresses)
+    with ThreadPoolExecutor(max_workers=output_config.workers) as executor:
+        ga_counts = list(executor.map(lambda config: export_group_addresses(config, group_addresses), target_configs))
+    return ga_counts[0]
 
-    csv_separator = csv_separators[str(output_config.separator)]
 
+def export_group_addresses(output_config: dict, group_addresses: Iterable[GroupAddress], stream: bool = False) -> int:
+    """Export KNX group addresses in the configured output format.
+
+    The output file is written to a temporary file first and replaced only if the export succeeded.
+    Unless streaming, all exported texts are checked against the output encoding before writing.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+        group_addresses: KNX group addresses
+        stream: Write the group addresses while iterating them instead of collecting them first.
+                Requires group addresses sorted by address.
+
+    Returns:
+        Number of exported group addresses.
+
+    Raises:
+        ValueError: If texts are not representable in the output encoding and encoding errors are strict.
+    """
     logging.info(
-        "Exporting group addresses into CSV file '%s'. format: %s, separator: '%s', encoding: %s",
+        "Exporting group addresses into file '%s'. format: %s, encoding: %s",
         output_config.file,
         output_config.format,
-        csv_separator.replace("\t", "[TAB]"),
         output_config.encoding,
     )
 
-    export_function = exporter_functions[str(output_config.format)]
-    export_function(output_config.file, output_config.encoding, csv_separator, group_addresses)
+    encoding_errors = output_config.encoding_errors
+    if not stream:
+        group_addresses = list(group_addresses)
+        issues = find_encoding_issues(group_addresses, output_config.encoding)
+        if issues and encoding_errors == EncodingErrors.strict:
+            raise ValueError(
+                f"{len(issues)} text(s) can not be represented in the output encoding '{output_config.encoding}':\n"
+                + "\n".join(issues)
+                + "\nPlease use only characters supported by the encoding, select another encoding or "
+                + "--output.encoding-errors transliterate / replace."
+            )
+        if issues:
+            logging.warning(
+                "%s text(s) can not be represented in the output encoding '%s'. Applying '%s':\n%s",
+                len(issues),
+                output_config.encoding,
+                encoding_errors,
+                "\n".join(issues),
+            )
 
+    main_groups = stream_group_index(group_addresses) if stream else build_group_index(group_addresses)
 
-def _filter_by_main_id(group_addresses: list[GroupAddress], main_id: int) -> list[GroupAddress]:
-    """_Filter list of KNX group addresses by main ID.
+    export_function = _EXPORTERS[str(output_config.format)]
+    return export_function(output_config, main_groups)
 
-    Args:
-        group_addresses (list[GroupAddress]): KNX group addresses
-        main_id (int): main ID
 
-    Returns:
-        list[GroupAddress]: Filtered list
+@contextmanager
+def _open_atomic(path: Union[str, BinaryIO]) -> Generator[BinaryIO, None, None]:
+    """Open a file for writing through a temporary file replacing the file on success.
+
+    The temporary file has a unique name, so concurrent writers of the same file do not interfere: The last one wins.
+    The permissions of an existing file are kept.
+
+    Arguments:
+        path: File path or a binary stream, e.g. io.BytesIO. Streams are written directly and not closed.
+
+    Yields:
+        Buffered binary file. If writing fails, the temporary file is removed and the file is left unmodified.
     """
-    return list(filter(lambda ga: ga.main == main_id, group_addresses))
+    if not isinstance(path, str):
+        yield path
+        return
+    # Imported on first use only, not needed for the CLI startup
+    import tempfile  # pylint: disable=import-outside-toplevel
+
+    directory, name = os.path.split(os.path.abspath(path))
+    temp_file = tempfile.NamedTemporaryFile(
+        "wb", buffering=CSV_BUFFER_SIZE, dir=directory, prefix=f"{name}.", suffix=".tmp", delete=False
+    )
+    try:
+        with temp_file as file:
+            yield file
+        os.chmod(temp_file.name, _file_mode(path))
+        os.replace(temp_file.name, path)
+    finally:
+        if os.path.exists(temp_file.name):
+            os.remove(temp_file.name)
 
 
-def _filter_by_middle_id(group_addresses: list[GroupAddress], middle_id: int) -> list[GroupAddress]:
-    """_Filter list of KNX group addresses by middle ID.
+def _file_mode(path: str) -> int:
+    """Determine the permissions of a written file.
 
-    Args:
-        group_addresses (list[GroupAddress]): KNX group addresses
-        middle_id (int): middle ID
+    Arguments:
+        path: File path
 
     Returns:
-        list[GroupAddress]: Filtered list
+        Permissions of the existing file, those of a new file otherwise.
     """
-    return list(filter(lambda ga: ga.middle == middle_id, group_addresses))
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def _open_text_atomic(output_config: dict) -> Generator[TextIO, None, None]:
+    """Open the output file for writing text through a temporary file replacing the file on success.
 
+    Arguments:
+        output_config: Output configuration hierarchy.
 
-def _export_csv_format_1_1(
-    output_file: str, output_file_encoding: str, csv_separator: str, group_addresses: list[GroupAddress]
-) -> None:
+    Yields:
+        Buffered text file using the output encoding and its error handling.
+    """
+    with _open_atomic(output_config.file) as binary_file:
+        text_file = io.TextIOWrapper(
+            binary_file, output_config.encoding, output_config.encoding_errors.codec_errors, newline=""
+        )
+        try:
+            yield text_file
+            text_file.flush()
+        finally:
+            # Otherwise the wrapper closes the binary file, e.g. a stream passed by the caller
+            text_file.detach()
+
+
+@register_exporter(str(OutputFormat.format_1_1))
+def _export_csv_format_1_1(output_config: dict, main_groups: Iterable[MainGroup]) -> int:
     """Export KNX group address to CSV in format 'format_1_1'.
 
     Arguments:
-        output_file: Path of output file
-        output_file_encoding: Output file encoding
-        csv_separator: CSV separator
+        output_config: Output configuration hierarchy.
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Returns:
+        Number of exported group addresses.
+    """
+    return _export_csv(output_config, _csv_rows_format_1_1(main_groups))
+
+
+@register_exporter(str(OutputFormat.format_3_3))
+def _export_csv_format_3_3(output_config: dict, main_groups: Iterable[MainGroup]) -> int:
+    """Export KNX group address to CSV in format 'format_3_3'.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Returns:
+        Number of exported group addresses.
+    """
+    return _export_csv(output_config, _csv_rows_format_3_3(main_groups))
+
+
+def iter_csv_rows(output_format: str, group_addresses: Iterable[GroupAddress]) -> Iterator[Sequence]:
+    """Build the rows of a CSV export without writing them.
+
+    Arguments:
+        output_format: CSV output format, 1/1 or 3/3.
         group_addresses: KNX group addresses
+
+    Returns:
+        Iterator of the CSV rows including the headline.
+
+    Raises:
+        ValueError: If the output format is not a CSV format.
     """
-    with open(output_file, "w", newline="", encoding=output_file_encoding) as csv_file:
-        writer = CsvWriter(csv_file, csv_separator, csv.QUOTE_ALL)
+    csv_rows_function = _CSV_ROWS.get(str(output_format))
+    if csv_rows_function is None:
+        raise ValueError(
+            f"Output format '{output_format}' is not a CSV format. Expected one of: {', '.join(_CSV_ROWS)}"
+        )
+    return (row for row, _ in csv_rows_function(build_group_index(group_addresses)))
+
+
+def _export_csv(output_config: dict, rows: Iterable[tuple[Sequence, Optional[GroupAddress]]]) -> int:
+    """Write CSV rows into the output file.
 
-        # write headline
-        writer.write_row(["Group name", "Address", "Central", "Unfiltered", "Description", "DatapointType", "Security"])
+    Arguments:
+        output_config: Output configuration hierarchy.
+        rows: CSV rows and the exported KNX group address of each row, None for the headline and groups.
+
+    Returns:
+        Number of exported group addresses.
+    """
+    ga_count = 0
+    csv_separator = CSV_SEPARATORS[str(output_config.separator)]
+    logging.info("CSV format: %s, separator: '%s'", output_config.format, csv_separator.replace("\t", "[TAB]"))
+    with _open_atomic(output_config.file) as csv_file:
+        writer = CsvWriter(
+            csv_file,
+            output_config.encoding,
+            csv_separator,
+            csv.QUOTE_ALL,
+            output_config.encoding_errors.codec_errors,
+        )
+        for row, ga in rows:
+            writer.write_row(row, ga)
+            if ga is not None:
+                ga_count += 1
+        writer.flush()
 
-        main_group_ids = {ga.main for ga in group_addresses}
-        for main_group_id in main_group_ids:
-            filtered_main_gas = _filter_by_main_id(group_addresses, main_group_id)
-            main_group_name = filtered_main_gas[0].main_name
+    return ga_count
 
-            logging.debug(str(f"Exporting main group     {main_group_id:<8d} | {main_group_name} |"))
-            writer.write_row([main_group_name, f"{main_group_id}/-/-"] + [""] * 4 + ["Auto"])
 
-            middle_group_ids = {ga.middle for ga in filtered_main_gas}
-            for middle_group_id in middle_group_ids:
-                filtered_middle_gas = _filter_by_middle_id(filtered_main_gas, middle_group_id)
-                middle_group_name = filtered_middle_gas[0].middle_name
+def _csv_rows_format_1_1(main_groups: Iterable[MainGroup]) -> Iterator[tuple[Sequence, Optional[GroupAddress]]]:
+    """Build the CSV rows of format 'format_1_1'.
 
-                main_middle_ga_formatted = f"{main_group_id}/{middle_group_id}"
+    Arguments:
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Yields:
+        CSV row and the exported KNX group address, None for the headline and groups.
+    """
+    # write headline
+    yield HEADER_1_1, None
+
+    # Checked once: Debug logging must not slow down the loops if disabled
+    debug = logging.root.isEnabledFor(logging.DEBUG)
+    for main_group in main_groups:
+        main_group_id = main_group.id
+        main_group_name = main_group.name
+
+        if debug:
+            logging.debug("Exporting main group     %-8d | %s |", main_group_id, main_group_name)
+        yield (main_group_name, f"{main_group_id}/-/-", *_GROUP_SUFFIX_1_1), None
+
+        for middle_group in main_group.middle_groups:
+            middle_group_id = middle_group.id
+            middle_group_name = middle_group.name
+
+            main_middle_ga_formatted = f"{main_group_id}/{middle_group_id}"
+            if debug:
                 logging.debug(
-                    str(
-                        "Exporting   middle group "
-                        + f"{main_middle_ga_formatted:<8s} | {' ' * len(main_group_name)} | {middle_group_name} |"
-                    )
+                    "Exporting   middle group %-8s | %s | %s |",
+                    main_middle_ga_formatted,
+                    " " * len(main_group_name),
+                    middle_group_name,
+                )
+            yield (middle_group_name, f"{main_middle_ga_formatted}/-", *_GROUP_SUFFIX_1_1), None
+
+            for sub_ga in middle_group.group_addresses:
+                if debug:
+                    logging.debug("Exporting     sub group: %s", sub_ga, extra=_ga_log_fields(sub_ga))
+                yield (
+                    (
+                        format_ga_name(sub_ga),
+                        f"{main_middle_ga_formatted}/{sub_ga.sub}",
+                        "",
+                        "",
+                        format_ga_description(sub_ga),
+                        sub_ga.dpt,
+                        "Auto",
+                    ),
+                    sub_ga,
                 )
-                writer.write_row([middle_group_name, f"{main_group_id}/{middle_group_id}/-"] + [""] * 4 + ["Auto"])
-
-                for sub_ga in filtered_middle_gas:
-                    logging.debug("Exporting     sub group: %s", sub_ga)
-                    ga_name = _format_ga_name(sub_ga)
-                    ga_description = _format_ga_description(sub_ga)
-                    writer.write_row(
-                        [
-                            ga_name,
-                            f"{sub_ga.main}/{sub_ga.middle}/{sub_ga.sub}",
-                            "",
-                            "",
-                            ga_description,
-                            sub_ga.dpt,
-                            "Auto",
-                        ]
-                    )
 
 
-def _export_csv_format_3_3(
-    output_file: str, output_file_encoding: str, csv_separator: str, group_addresses: list[GroupAddress]
-) -> None:
-    """Export KNX group address to CSV in format 'format_3_3'.
+def _csv_rows_format_3_3(main_groups: Iterable[MainGroup]) -> Iterator[tuple[Sequence, Optional[GroupAddress]]]:
+    """Build the CSV rows of format 'format_3_3'.
 
     Arguments:
-        output_file: Path of output file
-        output_file_encoding: Output file encoding
-        csv_separator: CSV separator
-        group_addresses: KNX group addresses
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Yields:
+        CSV row and the exported KNX group address, None for the headline and groups.
     """
-    with open(output_file, "w", newline="", encoding=output_file_encoding) as csv_file:
-        writer = CsvWriter(file=csv_file, delimiter=csv_separator, quoting=csv.QUOTE_ALL)
-
-        # write headline
-        writer.write_row(
-            [
-                "Main",
-                "Middle",
-                "Sub",
-                "Main",
-                "Middle",
-                "Sub",
-                "Central",
-                "Unfiltered",
-                "Description",
-                "DatapointType",
-                "Security",
-            ]
-        )
+    # write headline
+    yield HEADER_3_3, None
 
-        main_group_ids = {ga.main for ga in group_addresses}
-        for main_group_id in main_group_ids:
-            filtered_main_gas = _filter_by_main_id(group_addresses, main_group_id)
-            main_group_name = filtered_main_gas[0].main_name
+    # Checked once: Debug logging must not slow down the loops if disabled
+    debug = logging.root.isEnabledFor(logging.DEBUG)
+    for main_group in main_groups:
+        main_group_id = main_group.id
+        main_group_name = main_group.name
 
+        if debug:
             logging.debug("Exporting main group %s: %s", main_group_id, main_group_name)
-            writer.write_row([main_group_name, "", "", main_group_id] + [""] * 6 + ["Auto"])
+        yield (main_group_name, "", "", main_group_id, *_MAIN_GROUP_SUFFIX_3_3), None
 
-            middle_group_ids = {ga.middle for ga in filtered_main_gas}
-            for middle_group_id in middle_group_ids:
-                filtered_middle_gas = _filter_by_middle_id(filtered_main_gas, middle_group_id)
-                middle_group_name = filtered_middle_gas[0].middle_name
+        for middle_group in main_group.middle_groups:
+            middle_group_id = middle_group.id
+            middle_group_name = middle_group.name
 
+            if debug:
                 logging.debug("Exporting middle group %s/%s: %s", main_group_id, middle_group_id, middle_group_name)
-                writer.write_row(["", middle_group_name, "", main_group_id, middle_group_id] + [""] * 5 + ["Auto"])
-
-                for sub_ga in filtered_middle_gas:
-                    logging.debug("Exporting sub group: %s", sub_ga)
-                    ga_name = _format_ga_name(sub_ga)
-                    ga_description = _format_ga_description(sub_ga)
-                    writer.write_row(
-                        [
-                            "",
-                            "",
-                            ga_name,
-                            sub_ga.main,
-                            sub_ga.middle,
-                            sub_ga.sub,
-                            "",
-                            "",
-                            ga_description,
-                            sub_ga.dpt,
-                            "Auto",
-                        ]
+            yield ("", middle_group_name, "", main_group_id, middle_group_id, *_MIDDLE_GROUP_SUFFIX_3_3), None
+
+            for sub_ga in middle_group.group_addresses:
+                if debug:
+                    logging.debug("Exporting sub group: %s", sub_ga, extra=_ga_log_fields(sub_ga))
+                yield (
+                    (
+                        "",
+                        "",
+                        format_ga_name(sub_ga),
+                        main_group_id,
+                        middle_group_id,
+                        sub_ga.sub,
+                        "",
+                        "",
+                        format_ga_description(sub_ga),
+                        sub_ga.dpt,
+                        "Auto",
+                    ),
+                    sub_ga,
+                )
+
+
+# Functions building the CSV rows, keyed by output format.
+_CSV_ROWS = {str(OutputFormat.format_1_1): _csv_rows_format_1_1, str(OutputFormat.format_3_3): _csv_rows_format_3_3}
+
+
+@register_exporter(str(OutputFormat.json))
+def _export_json(output_config: dict, main_groups: Iterable[MainGroup]) -> int:
+    """Export KNX group addresses as JSON document containing the main / middle group hierarchy.
+
+    The document is written while iterating the groups, it is never built in memory.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Returns:
+        Number of exported group addresses.
+    """
+    ga_count = 0
+    with _open_text_atomic(output_config) as json_file:
+        json_file.write('{"main_groups": [')
+        for main_index, main_group in enumerate(main_groups):
+            json_file.write("," if main_index else "")
+            json_file.write(f'\n  {{"id": {main_group.id}, "name": {_json(main_group.name)}, "middle_groups": [')
+            for middle_index, middle_group in enumerate(main_group.middle_groups):
+                json_file.write("," if middle_index else "")
+                json_file.write(
+                    f'\n    {{"id": {middle_group.id}, "name": {_json(middle_group.name)}, "group_addresses": ['
+                )
+                for sub_index, sub_ga in enumerate(middle_group.group_addresses):
+                    ga_count += 1
+                    json_file.write("," if sub_index else "")
+                    json_file.write(f"\n      {_json(_ga_record(sub_ga))}")
+                json_file.write("]}")
+            json_file.write("]}")
+        json_file.write("]}\n")
+
+    return ga_count
+
+
+@register_exporter(str(OutputFormat.ndjson))
+def _export_ndjson(output_config: dict, main_groups: Iterable[MainGroup]) -> int:
+    """Export KNX group addresses as newline delimited JSON: One object per group address and line.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Returns:
+        Number of exported group addresses.
+    """
+    ga_count = 0
+    with _open_text_atomic(output_config) as ndjson_file:
+        for main_group in main_groups:
+            for middle_group in main_group.middle_groups:
+                for sub_ga in middle_group.group_addresses:
+                    ga_count += 1
+                    record = {"main_name": main_group.name, "middle_name": middle_group.name, **_ga_record(sub_ga)}
+                    ndjson_file.write(_json(record) + "\n")
+
+    return ga_count
+
+
+@register_exporter(str(OutputFormat.xml))
+def _export_ets_xml(output_config: dict, main_groups: Iterable[MainGroup]) -> int:
+    """Export KNX group addresses in the group address XML format of ETS.
+
+    Main and middle groups are written as nested group ranges containing the group addresses.
+
+    Arguments:
+        output_config: Output configuration hierarchy.
+        main_groups: KNX group addresses grouped by main and middle group
+
+    Returns:
+        Number of exported group addresses.
+    """
+    ga_count = 0
+    with _open_text_atomic(output_config) as xml_file:
+        xml_file.write(f'<?xml version="1.0" encoding={_xml_attribute(output_config.encoding)} standalone="yes"?>\n')
+        xml_file.write(f"<GroupAddress-Export xmlns={_xml_attribute(ETS_XML_NAMESPACE)}>\n")
+        for main_group in main_groups:
+            main_start = main_group.id << 11
+            xml_file.write(
+                f"  <GroupRange Name={_xml_attribute(main_group.name)} "
+                + f'RangeStart="{max(main_start, 1)}" RangeEnd="{main_start + 2047}">\n'
+            )
+            for middle_group in main_group.middle_groups:
+                middle_start = main_start + (middle_group.id << 8)
+                xml_file.write(
+                    f"    <GroupRange Name={_xml_attribute(middle_group.name)} "
+                    + f'RangeStart="{max(middle_start, 1)}" RangeEnd="{middle_start + 255}">\n'
+                )
+                for sub_ga in middle_group.group_addresses:
+                    ga_count += 1
+                    description = format_ga_description(sub_ga)
+                    description_attribute = "" if description is None else f" Description={_xml_attribute(description)}"
+                    xml_file.write(
+                        f"      <GroupAddress Name={_xml_attribute(format_ga_name(sub_ga))} "
+                        + f'Address="{sub_ga.main}/{sub_ga.middle}/{sub_ga.sub}"{description_attribute} '
+                        + f"DPTs={_xml_attribute(sub_ga.dpt)} />\n"
                     )
+                xml_file.write("    </GroupRange>\n")
+            xml_file.write("  </GroupRange>\n")
+        xml_file.write("</GroupAddress-Export>\n")
+
+    return ga_count
+
+
+def _ga_log_fields(ga: GroupAddress) -> dict:
+    """Build the structured log fields of a KNX group address.
+
+    Arguments:
+        ga: KNX group address
+
+    Returns:
+        Log record attributes
+    """
+    return {"ga": f"{ga.main}/{ga.middle}/{ga.sub}"}
+
+
+def _ga_record(ga: GroupAddress) -> dict:
+    """Build the exported attributes of a KNX group address.
+
+    Arguments:
+        ga: KNX group address
+
+    Returns:
+        JSON serializable attributes.
+    """
+    return {
+        "address": f"{ga.main}/{ga.middle}/{ga.sub}",
+        "main": ga.main,
+        "middle": ga.middle,
+        "sub": ga.sub,
+        "name": format_ga_name(ga),
+        "description": format_ga_description(ga),
+        "dpt": ga.dpt,
+    }
+
+
+def _xml_attribute(value: object) -> str:
+    """Quote an XML attribute value.
+
+    Implemented here since importing xml.sax.saxutils noticeably slows down the CLI startup.
+
+    Arguments:
+        value: Attribute value. Non-text values like numeric names are converted to text.
+
+    Returns:
+        Escaped value enclosed in double quotes.
+    """
+    return '"' + str(value).translate(_XML_ATTRIBUTE_ESCAPES) + '"'
+
+
+def _json(value: object) -> str:
+    """Serialize a value as compact JSON keeping non-ASCII characters.
+
+    Arguments:
+        value: JSON serializable value
+
+    Returns:
+        JSON text
+    """
+    return json.dumps(value, ensure_ascii=False)
 
 
-def _format_ga_name(ga: GroupAddress) -> str:
+def format_ga_name(ga: GroupAddress) -> str:
     """Format a KNX group address name.
 
     Args:
@@ -266,7 +784,7 @@ def _format_ga_name(ga: GroupAddress) -> str:
     return ga_name
 
 
-def _format_ga_description(ga: GroupAddress) -> str:
+def format_ga_description(ga: GroupAddress) -> str:
     """Format a KNX group address description.
 
     Args:
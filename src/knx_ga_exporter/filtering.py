@@ -0,0 +1,140 @@
+"""Selection of group addresses for partial exports."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import fnmatch
+import re
+from typing import Any, Optional
+
+from knx_ga_exporter.group_address import GroupAddress, parse_address_part
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class GroupAddressFilter:
+    """Filter selecting group addresses by address range, name pattern and DPT.
+
+    The filter is applied to the raw row values while parsing: Rows not selected are neither validated nor converted
+    into group addresses. Rows with address parts which are not integer numbers are always selected to be reported
+    by the validation.
+    """
+
+    def __init__(self, address: Optional[str] = None, name: Optional[str] = None, dpt: Optional[str] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            address: Comma separated address ranges 'MAIN' or 'MAIN/MIDDLE', each part a number or a range 'FIRST-LAST'.
+                     E.g. '1,2/0-3' selects main group 1 and the middle groups 0 to 3 of main group 2.
+            name: Glob pattern matched case-insensitive against the group address name including the target ID.
+            dpt: Comma separated glob patterns matched case-insensitive against the DPT, e.g. 'DPST-1-*,DPT-5'.
+        """
+        self.address_ranges = [_parse_address_range(text) for text in address.split(",")] if address else None
+        self.name_pattern = _compile_patterns(name) if name else None
+        self.dpt_pattern = _compile_patterns(*dpt.split(",")) if dpt else None
+
+    @classmethod
+    def from_config(cls, filter_config: Optional[dict]) -> Optional["GroupAddressFilter"]:
+        """Create the filter of the filter configuration.
+
+        Arguments:
+            filter_config: Filter configuration hierarchy
+
+        Returns:
+            Group address filter or None if no filter is configured.
+        """
+        if filter_config is None or not (filter_config.address or filter_config.name or filter_config.dpt):
+            return None
+        return cls(filter_config.address, filter_config.name, filter_config.dpt)
+
+    def matches(
+        self,
+        main: Any,  # noqa: ANN401
+        middle: Any,  # noqa: ANN401
+        sub_name: Any,  # noqa: ANN401
+        target_id: Any,  # noqa: ANN401
+        dpt: Any,  # noqa: ANN401
+    ) -> bool:
+        """Check whether the values of a sheet row are selected.
+
+        Arguments:
+            main: Main group ID
+            middle: Middle group ID
+            sub_name: Sub group name
+            target_id: Target ID
+            dpt: DPT datatype
+
+        Returns:
+            True if the row is selected by all configured criteria.
+        """
+        if self.dpt_pattern is not None and not self.dpt_pattern.match(str(dpt)):
+            return False
+        if self.name_pattern is not None:
+            name = f"{target_id} - {sub_name}" if target_id is not None and target_id != 0 else str(sub_name)
+            if not self.name_pattern.match(name):
+                return False
+        if self.address_ranges is not None:
+            main_id = parse_address_part(main)
+            middle_id = parse_address_part(middle)
+            if main_id is not None and middle_id is not None:
+                return any(
+                    main_id in main_range and middle_id in middle_range
+                    for main_range, middle_range in self.address_ranges
+                )
+        return True
+
+    def matches_group_address(self, ga: GroupAddress) -> bool:
+        """Check whether a group address is selected.
+
+        Arguments:
+            ga: KNX group address
+
+        Returns:
+            True if the group address is selected by all configured criteria.
+        """
+        return self.matches(ga.main, ga.middle, ga.sub_name, ga.target_id, ga.dpt)
+
+
+def _parse_address_range(text: str) -> tuple[range, range]:
+    """Parse an address range like '1', '0-2' or '1/0-3'.
+
+    Arguments:
+        text: Address range 'MAIN' or 'MAIN/MIDDLE'
+
+    Returns:
+        Ranges of the selected main and middle group IDs.
+
+    Raises:
+        ValueError: If the address range is invalid.
+    """
+    parts = text.strip().split("/")
+    if len(parts) > 2 or not all(re.fullmatch(r"\d+(-\d+)?", part) for part in parts):
+        raise ValueError(
+            f"Invalid address range '{text}' of --filter.address. Expected 'MAIN' or 'MAIN/MIDDLE', e.g. '1/0-3'"
+        )
+    main_range = _parse_id_range(parts[0])
+    middle_range = _parse_id_range(parts[1]) if len(parts) > 1 else range(0, 2**16)
+    return main_range, middle_range
+
+
+def _parse_id_range(text: str) -> range:
+    """Parse an ID range like '3' or '0-2'.
+
+    Arguments:
+        text: ID or range of IDs 'FIRST-LAST'
+
+    Returns:
+        Range of the IDs including the last ID.
+    """
+    first, _, last = text.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def _compile_patterns(*patterns: str) -> re.Pattern:
+    """Compile glob patterns into a single case-insensitive regular expression.
+
+    Arguments:
+        patterns: Glob patterns
+
+    Returns:
+        Regular expression matching any of the patterns.
+    """
+    return re.compile("|".join(fnmatch.translate(pattern.strip()) for pattern in patterns), re.IGNORECASE)
@@ -1,20 +1,26 @@
 """Representation of a KNX group address (GA)."""
 
 # ---- Imports ---------------------------------------------------------------------------------------------------------
-from dataclasses import dataclass
+import sys
+from typing import Any, Optional
 
 # ---- Class / Functions -----------------------------------------------------------------------------------------------
 
 
-@dataclass
 class GroupAddress:
-    """Representation of a KNX group address."""
+    """Representation of a KNX group address.
+
+    Uses __slots__ instead of a per-instance __dict__ to keep large numbers of group addresses compact in memory.
+    Address parts are stored as integers, repeated strings like group names and DPTs are interned.
+    """
+
+    __slots__ = ("main", "middle", "sub", "main_name", "middle_name", "sub_name", "target_id", "dpt", "comment")
 
     def __init__(
         self,
-        main: str,
-        middle: str,
-        sub: str,
+        main: int,
+        middle: int,
+        sub: int,
         main_name: str,
         middle_name: str,
         sub_name: str,
@@ -25,9 +31,9 @@ class GroupAddress:
         """Constructor.
 
         Args:
-            main (str): Main group ID
-            middle (str): Middle group ID
-            sub (str): Sub group ID
+            main (int): Main group ID
+            middle (int): Middle group ID
+            sub (int): Sub group ID
             main_name (str): Main group name
             middle_name (str): Middle group name
             sub_name (str): Sub group name
@@ -38,13 +44,16 @@ class GroupAddress:
         self.main = main
         self.middle = middle
         self.sub = sub
-        self.main_name = main_name
-        self.middle_name = middle_name
+        self.main_name = _intern(main_name)
+        self.middle_name = _intern(middle_name)
         self.sub_name = sub_name
         self.target_id = target_id
-        self.dpt = dpt
+        self.dpt = _intern(dpt)
         self.comment = comment
         self._validate()
+        self.main = _address_part(self.main, "main", self)
+        self.middle = _address_part(self.middle, "middle", self)
+        self.sub = _address_part(self.sub, "sub", self)
 
     def _validate(self) -> None:
         # check mandatory attributes
@@ -59,14 +68,113 @@ class GroupAddress:
         ):
             raise ValueError(f"Incomplete KNX group address detected: {str(self)}")
 
+    def __eq__(self, other: object) -> bool:
+        """Compare with another group address.
+
+        Arguments:
+            other: Compared object
+
+        Returns:
+            True if all attributes are equal.
+        """
+        if not isinstance(other, GroupAddress):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        """Build debug representation.
+
+        Returns:
+            Formatted string.
+        """
+        attributes = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"GroupAddress({attributes})"
+
     def __str__(self) -> str:
         """Build string representation.
 
         Returns:
             Formatted string.
         """
-        addr_formatted = f"{self.main}/{self.middle}/{self.sub}"
-        return (
-            f"{addr_formatted:8s} | {self.main_name} | {self.middle_name} | "
-            + f"{self.dpt} | {self.target_id} - {self.sub_name}"
+        return format_group_address(
+            self.main, self.middle, self.sub, self.main_name, self.middle_name, self.sub_name, self.target_id, self.dpt
         )
+
+
+def format_group_address(
+    main: Any,  # noqa: ANN401
+    middle: Any,  # noqa: ANN401
+    sub: Any,  # noqa: ANN401
+    main_name: Any,  # noqa: ANN401
+    middle_name: Any,  # noqa: ANN401
+    sub_name: Any,  # noqa: ANN401
+    target_id: Any,  # noqa: ANN401
+    dpt: Any,  # noqa: ANN401
+) -> str:
+    """Format the attributes of a (possibly invalid) KNX group address.
+
+    Args:
+        main: Main group ID
+        middle: Middle group ID
+        sub: Sub group ID
+        main_name: Main group name
+        middle_name: Middle group name
+        sub_name: Sub group name
+        target_id: Target ID
+        dpt: DPT datatype
+
+    Returns:
+        Formatted string.
+    """
+    addr_formatted = f"{main}/{middle}/{sub}"
+    return f"{addr_formatted:8s} | {main_name} | {middle_name} | " + f"{dpt} | {target_id} - {sub_name}"
+
+
+def _intern(value: Optional[Any]) -> Optional[Any]:  # noqa: ANN401
+    """Intern string values. Other values are returned unmodified.
+
+    Arguments:
+        value: Value
+
+    Returns:
+        Interned string or the unmodified value.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def parse_address_part(value: Any) -> Optional[int]:  # noqa: ANN401
+    """Convert a group address part read from the sheet into an integer.
+
+    Arguments:
+        value: Address part read from the sheet
+
+    Returns:
+        Address part as integer or None if the value is not an integer number.
+    """
+    if type(value) is int:
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+
+def _address_part(value: Any, part: str, ga: GroupAddress) -> int:  # noqa: ANN401
+    """Convert a group address part into an integer.
+
+    Arguments:
+        value: Address part read from the sheet
+        part: Name of the address part
+        ga: Converted group address
+
+    Returns:
+        Address part as integer
+
+    Raises:
+        ValueError: If the address part is not an integer number.
+    """
+    number = parse_address_part(value)
+    if number is None:
+        raise ValueError(f"Invalid {part} group ID '{value}' of KNX group address detected: {ga}")
+    return number
@@ -0,0 +1,135 @@
+"""Hierarchical grouping of KNX group addresses into main / middle / sub groups."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+from dataclasses import dataclass
+from itertools import chain, groupby
+from operator import attrgetter
+from typing import Iterable, Iterator
+
+from knx_ga_exporter.group_address import GroupAddress
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@dataclass
+class MiddleGroup:
+    """KNX middle group containing all of its sub group addresses."""
+
+    id: int
+    name: str
+    group_addresses: Iterable[GroupAddress]
+
+
+@dataclass
+class MainGroup:
+    """KNX main group containing all of its middle groups."""
+
+    id: int
+    name: str
+    middle_groups: Iterable[MiddleGroup]
+
+
+def build_group_index(group_addresses: Iterable[GroupAddress]) -> list[MainGroup]:
+    """Build the main -> middle -> sub group hierarchy in a single pass over all group addresses.
+
+    Main and middle groups are ordered by their IDs, sub group addresses by their sub ID.
+    The name of a main or middle group is taken from the first group address belonging to it.
+
+    Arguments:
+        group_addresses: KNX group addresses
+
+    Returns:
+        Sorted main groups.
+    """
+    index: dict[int, tuple[str, dict[int, tuple[str, list[GroupAddress]]]]] = {}
+    for ga in group_addresses:
+        main_entry = index.get(ga.main)
+        if main_entry is None:
+            main_entry = index[ga.main] = (ga.main_name, {})
+        middle_entry = main_entry[1].get(ga.middle)
+        if middle_entry is None:
+            middle_entry = main_entry[1][ga.middle] = (ga.middle_name, [])
+        middle_entry[1].append(ga)
+
+    return [
+        MainGroup(
+            id=main_id,
+            name=main_name,
+            middle_groups=[
+                MiddleGroup(
+                    id=middle_id,
+                    name=middle_name,
+                    group_addresses=sorted(middle_gas, key=lambda ga: ga.sub),
+                )
+                for middle_id, (middle_name, middle_gas) in sorted(middle_index.items())
+            ],
+        )
+        for main_id, (main_name, middle_index) in sorted(index.items())
+    ]
+
+
+def stream_group_index(group_addresses: Iterable[GroupAddress]) -> Iterator[MainGroup]:
+    """Lazily build the main -> middle -> sub group hierarchy of group addresses already sorted by address.
+
+    In contrast to build_group_index() no group address is kept in memory. Main groups, middle groups and their
+    group addresses are produced while iterating and must be consumed in order.
+
+    Arguments:
+        group_addresses: KNX group addresses sorted by main, middle and sub ID.
+
+    Yields:
+        Main groups in order of the input.
+    """
+    for main_id, main_group in groupby(_ensure_sorted(group_addresses), key=attrgetter("main")):
+        first_ga, main_gas = _peek(main_group)
+        yield MainGroup(id=main_id, name=first_ga.main_name, middle_groups=_stream_middle_groups(main_gas))
+
+
+def _stream_middle_groups(group_addresses: Iterator[GroupAddress]) -> Iterator[MiddleGroup]:
+    """Lazily split the sorted group addresses of one main group into middle groups.
+
+    Arguments:
+        group_addresses: KNX group addresses of a single main group, sorted by middle and sub ID.
+
+    Yields:
+        Middle groups in order of the input.
+    """
+    for middle_id, middle_group in groupby(group_addresses, key=attrgetter("middle")):
+        first_ga, middle_gas = _peek(middle_group)
+        yield MiddleGroup(id=middle_id, name=first_ga.middle_name, group_addresses=middle_gas)
+
+
+def _peek(group_addresses: Iterator[GroupAddress]) -> tuple[GroupAddress, Iterator[GroupAddress]]:
+    """Peek the first group address of a non-empty iterator.
+
+    Arguments:
+        group_addresses: Non-empty iterator of KNX group addresses
+
+    Returns:
+        The first group address and an iterator still providing all group addresses.
+    """
+    first_ga = next(group_addresses)
+    return first_ga, chain([first_ga], group_addresses)
+
+
+def _ensure_sorted(group_addresses: Iterable[GroupAddress]) -> Iterator[GroupAddress]:
+    """Pass through group addresses while checking that they are strictly sorted by address.
+
+    Arguments:
+        group_addresses: KNX group addresses
+
+    Yields:
+        The unmodified group addresses.
+
+    Raises:
+        ValueError: If a group address is not sorted after its predecessor.
+    """
+    previous_ga = None
+    previous_address = None
+    for ga in group_addresses:
+        address = (ga.main, ga.middle, ga.sub)
+        if previous_address is not None and address <= previous_address:
+            raise ValueError(f"Streaming export requires group addresses sorted by address: {ga} follows {previous_ga}")
+        previous_ga = ga
+        previous_address = address
+        yield ga
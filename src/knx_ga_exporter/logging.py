@@ -1,21 +1,271 @@
-"""Handling of different output target and formats."""
+"""Configuration of the logging infrastructure.
+
+Log records are formatted and written by a background thread (QueueHandler / QueueListener). Logging threads, e.g.
+the parser and exporter loops, only enqueue the records and are not blocked by console or file I/O.
+"""
 
 # ---- Imports ---------------------------------------------------------------------------------------------------------
+import json
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Generator, Optional
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s: %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes of every log record. All other attributes are structured fields passed by 'extra'.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Conversion stage of the current thread, added to all log records as structured field 'stage'.
+log_stage: ContextVar[Optional[str]] = ContextVar("log_stage", default=None)
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class LogFormat(Enum):
+    """Formats of the log messages."""
+
+    text = "text"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    json = "json"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+
+    def __str__(self) -> str:
+        """String representation.
 
-# ---- Functions -------------------------------------------------------------------------------------------------------
+        Returns:
+            str: String representation
+        """
+        return self.value
 
 
-def configure_logging(verbosity_level: int) -> None:
+class JsonFormatter(logging.Formatter):
+    """Formatter of log records as JSON lines including the structured fields passed by 'extra'."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a log record.
+
+        Arguments:
+            record: Log record
+
+        Returns:
+            JSON object of the record in a single line.
+        """
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(
+    verbosity_level: int, log_format: LogFormat = LogFormat.text, log_file: Optional[str] = None
+) -> None:
     """Config logging infrastructure.
 
+    Does nothing if the root logger already has handlers not installed by this function, e.g. of pytest.
+    A pipeline installed by a previous call is replaced.
+
     Arguments:
         verbosity_level: Configured verbosity level
+        log_format: Format of the log messages
+        log_file: Optional path of the log file. Default: Log to stderr.
     """
-    log_level = logging.WARN
-    if verbosity_level == 1:
-        log_level = logging.INFO
-    elif verbosity_level >= 2:
-        log_level = logging.DEBUG
+    root_logger = logging.getLogger()
+    stop_logging()
+    if root_logger.handlers:
+        return
+
+    handler = logging.FileHandler(log_file, encoding="utf-8") if log_file is not None else logging.StreamHandler()
+    handler.setFormatter(
+        JsonFormatter() if log_format == LogFormat.json else logging.Formatter(TEXT_FORMAT, TEXT_DATE_FORMAT)
+    )
+    root_logger.addHandler(_QueueHandler(handler))
+    root_logger.setLevel(_log_level(verbosity_level))
+
+
+def stop_logging() -> None:
+    """Stop the pipeline installed by configure_logging(). All pending log records are written."""
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, _QueueHandler):
+            root_logger.removeHandler(handler)
+            handler.close()
+
+
+def configure_worker_logging(log_queue: Any, verbosity_level: int) -> None:  # noqa: ANN401
+    """Config logging infrastructure of a worker process forwarding all log records to the main process.
+
+    Arguments:
+        log_queue: Multiprocessing queue consumed by forward_worker_logging() of the main process.
+        verbosity_level: Configured verbosity level
+    """
+    import logging.handlers  # pylint: disable=import-outside-toplevel
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(_add_stage)
+    root_logger = logging.getLogger()
+    # Handlers inherited from the main process are not served by a listener thread in this process.
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(_log_level(verbosity_level))
+
+
+@contextmanager
+def forward_worker_logging(log_queue: Any) -> Generator[None, None, None]:  # noqa: ANN401
+    """Log the records of worker processes configured by configure_worker_logging() in the main process.
+
+    Arguments:
+        log_queue: Multiprocessing queue passed to the worker processes.
+
+    Yields:
+        None
+    """
+    import logging.handlers  # pylint: disable=import-outside-toplevel
+
+    listener = logging.handlers.QueueListener(log_queue, _ForwardingHandler())
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+
+
+@contextmanager
+def trace_logging(trace_file: Optional[str]) -> Generator[None, None, None]:
+    """Write all DEBUG messages into a trace file while the context is active.
+
+    The console keeps its configured log-level.
 
-    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+    Arguments:
+        trace_file: Path of the trace file. Tracing is disabled if None.
+
+    Yields:
+        None
+    """
+    if trace_file is None:
+        yield
+        return
+
+    root_logger = logging.getLogger()
+    root_level = root_logger.level
+    handler_levels = [(handler, handler.level) for handler in root_logger.handlers]
+    for handler, level in handler_levels:
+        handler.setLevel(max(level, root_level))
+
+    file_handler = logging.FileHandler(trace_file, mode="w", encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    queue_handler = _QueueHandler(file_handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(logging.DEBUG)
+    try:
+        yield
+    finally:
+        root_logger.removeHandler(queue_handler)
+        root_logger.setLevel(root_level)
+        for handler, level in handler_levels:
+            handler.setLevel(level)
+        queue_handler.close()
+
+
+class _ForwardingHandler(logging.Handler):
+    """Handler passing the records received from worker processes to the loggers of the main process."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Log a record of a worker process.
+
+        Arguments:
+            record: Log record, already filtered by the log-level of the worker process.
+        """
+        logging.getLogger(record.name).handle(record)
+
+
+class _QueueHandler(logging.Handler):
+    """Handler enqueuing the log records for a background thread writing them into another handler.
+
+    Unlike logging.handlers.QueueHandler, the records are neither formatted nor copied by the logging thread.
+    This is done by the background thread.
+    """
+
+    def __init__(self, handler: logging.Handler) -> None:
+        """Constructor. Starts the background thread.
+
+        Arguments:
+            handler: Handler formatting and writing the log records.
+        """
+        import logging.handlers  # pylint: disable=import-outside-toplevel
+        import queue  # pylint: disable=import-outside-toplevel
+
+        super().__init__()
+        self.addFilter(_add_stage)
+        self.queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(self.queue, handler)
+        self.listener.start()
+        self.closed = False
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Enqueue a log record. No lock is acquired, the queue is thread-safe.
+
+        Arguments:
+            record: Log record
+
+        Returns:
+            True if the record was enqueued.
+        """
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Enqueue a log record.
+
+        Arguments:
+            record: Log record
+        """
+        self.queue.put_nowait(record)
+
+    def close(self) -> None:
+        """Write all pending log records and stop the background thread. Also called by logging.shutdown() at exit."""
+        if not self.closed:
+            self.closed = True
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+        super().close()
+
+
+def _add_stage(record: logging.LogRecord) -> bool:
+    """Add the current conversion stage to a log record.
+
+    Arguments:
+        record: Log record
+
+    Returns:
+        True, all records are logged.
+    """
+    stage = log_stage.get()
+    if stage is not None:
+        record.stage = stage
+    return True
+
+
+def _log_level(verbosity_level: int) -> int:
+    """Determine the log-level of a verbosity level.
+
+    Arguments:
+        verbosity_level: Configured verbosity level
+
+    Returns:
+        Log-level
+    """
+    if verbosity_level == 1:
+        return logging.INFO
+    if verbosity_level >= 2:
+        return logging.DEBUG
+    return logging.WARN
@@ -1,61 +1,329 @@
 """Workbook parser."""
 
 # ---- Imports ---------------------------------------------------------------------------------------------------------
+import fnmatch
+import functools
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Callable, Iterable, Iterator, Optional, Union
 
-import openpyxl
-import openpyxl.workbook
-
+from knx_ga_exporter.filtering import GroupAddressFilter
 from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.profiling import StageStatistics
+from knx_ga_exporter.reader import InputEngine, WorkbookReader, open_workbook
+from knx_ga_exporter.validation import GroupAddressValidator
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Layout options of the parsed columns in order of the values of a parsed row
+LAYOUT_COLUMNS = (
+    "target_ID_column",
+    "main_ID_column",
+    "middle_ID_column",
+    "sub_ID_column",
+    "main_name_column",
+    "middle_name_column",
+    "sub_name_column",
+    "dpt_column",
+    "comment_column",
+)
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """Sheet layout compiled for the parser: Validated integer options instead of the configuration hierarchy."""
+
+    columns: tuple[int, ...]
+    first_row: int
+    max_empty_rows: int
+
+
+def compile_layout(layout_config: dict) -> SheetLayout:
+    """Compile the layout configuration. Compiled layouts are cached, repeated conversions reuse them.
+
+    Arguments:
+        layout_config: Workbook layout configuration
+
+    Returns:
+        Compiled sheet layout
+    """
+    return _compile_layout(
+        tuple(getattr(layout_config, name) for name in LAYOUT_COLUMNS),
+        layout_config.first_row,
+        layout_config.max_empty_rows,
+        layout_config.last_column,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_layout(
+    columns: tuple, first_row: Union[int, str], max_empty_rows: Union[int, str], last_column: Optional[Union[int, str]]
+) -> SheetLayout:
+    """Compile the layout options. Options given on the command line are strings.
 
-# ---- Functions -------------------------------------------------------------------------------------------------------
+    Arguments:
+        columns: Column options in order of LAYOUT_COLUMNS
+        first_row: First row containing GAs
+        max_empty_rows: Number of consecutive empty rows marking the end of the group addresses.
+        last_column: Deprecated last column, warned about if set.
+
+    Returns:
+        Compiled sheet layout
+
+    Raises:
+        ValueError: If an option is not a valid number.
+    """
+    try:
+        layout = SheetLayout(
+            columns=tuple(int(column) for column in columns),
+            first_row=int(first_row),
+            max_empty_rows=int(max_empty_rows),
+        )
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid layout configuration: {e}") from e
+    if min(layout.columns) < 0 or layout.first_row < 1 or layout.max_empty_rows < 0:
+        raise ValueError(
+            "Invalid layout configuration: Columns and --layout.max-empty-rows must not be negative, "
+            + "--layout.first-row must be at least 1."
+        )
+    if last_column is not None:
+        logging.warning(
+            "--layout.last-column is deprecated and ignored: Only the configured columns are read. "
+            + "Please remove it from the configuration."
+        )
+    return layout
 
 
-def load_workbook(input_file: str) -> openpyxl.workbook:
+def load_workbook(input_file: str, engine: Optional[InputEngine] = None) -> WorkbookReader:
     """Load XLX workbook.
 
     Args:
         input_file (str): Path of input file.
+        engine (InputEngine): Workbook reader backend.
 
     Returns:
         Loaded workbook
     """
     logging.info("Loading XLSX input file '%s'", input_file)
-    wb = openpyxl.load_workbook(filename=input_file, read_only=True, data_only=True)
+    wb = open_workbook(input_file, engine)
     return wb
 
 
-def parse_group_addresses(wb: openpyxl.workbook, layout_config: dict) -> list[GroupAddress]:
+def resolve_sheet_names(wb: WorkbookReader, sheet_name: Union[str, list[str]]) -> list[str]:
+    """Resolve the configured sheet names and glob patterns to the names of existing sheets.
+
+    Arguments:
+        wb: Workbook
+        sheet_name: Sheet name, glob pattern or list of both.
+
+    Returns:
+        Sheet names in order of the configuration. Sheets matched by a pattern are in workbook order.
+
+    Raises:
+        KeyError: If a sheet name or pattern does not match any sheet.
+    """
+    patterns = [sheet_name] if isinstance(sheet_name, str) else sheet_name
+    sheet_names = []
+    for pattern in patterns:
+        matches = [pattern] if pattern in wb.sheet_names else fnmatch.filter(wb.sheet_names, pattern)
+        if not matches:
+            raise KeyError(f"Worksheet {pattern} does not exist.")
+        sheet_names.extend(match for match in matches if match not in sheet_names)
+    return sheet_names
+
+
+def parse_sheets(
+    input_file: str,
+    engine: InputEngine,
+    layout_config: dict,
+    sheet_names: list[str],
+    workers: int,
+    stats: Optional[StageStatistics] = None,
+    ga_filter: Optional[GroupAddressFilter] = None,
+    workbook_loader: Callable[..., WorkbookReader] = load_workbook,
+) -> list[GroupAddress]:
+    """Parse the group addresses of multiple sheets concurrently in worker processes.
+
+    Arguments:
+        input_file: Path of input file.
+        engine: Workbook reader backend.
+        layout_config: Workbook layout configuration
+        sheet_names: Names of the parsed sheets
+        workers: Number of worker processes
+        stats: Optional statistics accounting the scanned rows of all sheets.
+        ga_filter: Optional filter selecting the parsed group addresses.
+        workbook_loader: Function loading the workbook in the worker processes. Must be picklable.
+
+    Returns:
+        Merged KNX group addresses of all sheets.
+    """
+    logging.info("Parsing %s sheets with %s workers", len(sheet_names), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            _parse_sheet,
+            repeat(input_file),
+            repeat(engine),
+            repeat(layout_config),
+            sheet_names,
+            repeat(ga_filter),
+            repeat(workbook_loader),
+        )
+        sheet_gas = []
+        for sheet_name, (gas, rows_scanned, rows_skipped) in zip(sheet_names, results):
+            if stats is not None:
+                stats.add_rows(rows_scanned, rows_skipped)
+            sheet_gas.append((sheet_name, gas))
+        return merge_sheet_group_addresses(sheet_gas)
+
+
+def merge_sheet_group_addresses(sheet_gas: Iterable[tuple[str, list[GroupAddress]]]) -> list[GroupAddress]:
+    """Merge the group addresses parsed from multiple sheets.
+
+    Arguments:
+        sheet_gas: Sheet names and their parsed KNX group addresses
+
+    Returns:
+        Merged KNX group addresses in order of the sheets.
+
+    Raises:
+        ValueError: If the same group address is defined in multiple sheets.
+    """
+    merged_gas = []
+    address_sheets = {}
+    collisions = []
+    for sheet_name, gas in sheet_gas:
+        sheet_addresses = set()
+        for ga in gas:
+            address = (ga.main, ga.middle, ga.sub)
+            other_sheet_name = address_sheets.get(address)
+            if other_sheet_name is not None:
+                collisions.append(f"{ga.main}/{ga.middle}/{ga.sub} in sheets '{other_sheet_name}' and '{sheet_name}'")
+            sheet_addresses.add(address)
+        address_sheets.update(dict.fromkeys(sheet_addresses, sheet_name))
+        merged_gas.extend(gas)
+
+    if collisions:
+        raise ValueError("Group address collisions between sheets detected:\n" + "\n".join(collisions))
+    return merged_gas
+
+
+def parse_group_addresses(
+    wb: WorkbookReader,
+    layout_config: dict,
+    sheet_name: Optional[str] = None,
+    stats: Optional[StageStatistics] = None,
+    ga_filter: Optional[GroupAddressFilter] = None,
+) -> list[GroupAddress]:
     """Parse the group addresses.
 
     Arguments:
         wb: Workbook
         layout_config: Workbook layout configuration
+        sheet_name: Name of the parsed sheet. Default: Sheet name of the layout configuration.
+        stats: Optional statistics accounting the scanned rows.
+        ga_filter: Optional filter selecting the parsed group addresses.
 
     Returns:
         Parsed KNX group addresses
     """
-    gas = []
-    ws = wb[layout_config.sheet_name]
-    for row in ws.iter_rows(min_row=layout_config.first_row, max_col=layout_config.last_column):
-        target_id = row[layout_config.target_ID_column].value
+    return list(iter_group_addresses(wb, layout_config, sheet_name, stats, ga_filter))
+
+
+def iter_group_addresses(
+    wb: WorkbookReader,
+    layout_config: dict,
+    sheet_name: Optional[str] = None,
+    stats: Optional[StageStatistics] = None,
+    ga_filter: Optional[GroupAddressFilter] = None,
+) -> Iterator[GroupAddress]:
+    """Parse the group addresses row by row.
+
+    All rows are validated in a single pass. Invalid rows are not yielded, instead a ValidationError reporting every
+    issue found is raised after the last row. Only the configured columns are read. Reading stops at the end of the
+    group addresses, detected by a run of --layout.max-empty-rows consecutive empty rows.
 
-        group_main = row[layout_config.main_ID_column].value
-        group_middle = row[layout_config.middle_ID_column].value
-        group_sub = row[layout_config.sub_ID_column].value
+    Arguments:
+        wb: Workbook
+        layout_config: Workbook layout configuration
+        sheet_name: Name of the parsed sheet. Default: Sheet name of the layout configuration.
+        stats: Optional statistics accounting the scanned rows once the sheet is parsed completely.
+        ga_filter: Optional filter selecting the parsed group addresses. Rows not selected are skipped unvalidated.
 
-        group_main_name = row[layout_config.main_name_column].value
-        group_middle_name = row[layout_config.middle_name_column].value
-        group_sub_name = row[layout_config.sub_name_column].value
+    Yields:
+        Parsed KNX group addresses in order of the sheet rows.
+    """
+    layout = compile_layout(layout_config)
+    sheet_name = sheet_name or layout_config.sheet_name
+    validator = GroupAddressValidator(sheet_name)
+    rows = wb.iter_rows(
+        sheet_name,
+        min_row=layout.first_row,
+        columns=layout.columns,
+    )
+    empty_row = (None,) * len(layout.columns)
+    max_empty_rows = layout.max_empty_rows
+    empty_rows = 0
+    row_number = layout.first_row - 1
+    rows_skipped = 0
+    # Checked once: Debug logging must not slow down the loop if disabled
+    debug = logging.root.isEnabledFor(logging.DEBUG)
+    for row_number, row in enumerate(rows, start=layout.first_row):
+        if row == empty_row:
+            empty_rows += 1
+            if empty_rows == max_empty_rows:
+                logging.info(
+                    "End of sheet '%s' detected after %s empty rows in row %s, following rows are not read",
+                    sheet_name,
+                    empty_rows,
+                    row_number,
+                )
+                # Release the sheet early. Readers may return any iterator, not only closable generators.
+                close = getattr(rows, "close", None)
+                if close is not None:
+                    close()
+                rows_skipped += 1
+                break
+        else:
+            empty_rows = 0
 
-        dpt = row[layout_config.dpt_column].value
-        comment = row[layout_config.comment_column].value
+        (
+            target_id,
+            group_main,
+            group_middle,
+            group_sub,
+            group_main_name,
+            group_middle_name,
+            group_sub_name,
+            dpt,
+            comment,
+        ) = row
 
         # Skip invalid / incomplete GAs
         if (
             dpt is None
             or dpt == 0
             or ((group_sub_name is None or group_sub_name == 0) and (target_id is None or (target_id == 0)))
+        ):
+            rows_skipped += 1
+            continue
+        if ga_filter is not None and not ga_filter.matches(group_main, group_middle, group_sub_name, target_id, dpt):
+            rows_skipped += 1
+            continue
+
+        if not validator.validate(
+            row_number,
+            group_main,
+            group_middle,
+            group_sub,
+            group_main_name,
+            group_middle_name,
+            group_sub_name,
+            target_id,
+            dpt,
         ):
             continue
 
@@ -70,7 +338,36 @@ def parse_group_addresses(wb: openpyxl.workbook, layout_config: dict) -> list[Gr
             dpt,
             comment,
         )
-        logging.debug("Parsed GA: %s", ga)
-        gas.append(ga)
+        if debug:
+            logging.debug("Parsed GA: %s", ga, extra={"row": row_number, "ga": f"{ga.main}/{ga.middle}/{ga.sub}"})
+        yield ga
+
+    validator.raise_on_issues()
+    if stats is not None:
+        stats.add_rows(row_number - layout.first_row + 1, rows_skipped)
+
+
+def _parse_sheet(
+    input_file: str,
+    engine: InputEngine,
+    layout_config: dict,
+    sheet_name: str,
+    ga_filter: Optional[GroupAddressFilter] = None,
+    workbook_loader: Callable[..., WorkbookReader] = load_workbook,
+) -> tuple[list[GroupAddress], int, int]:
+    """Load the workbook and parse the group addresses of a single sheet. Executed in a worker process.
 
-    return gas
+    Arguments:
+        input_file: Path of input file.
+        engine: Workbook reader backend.
+        layout_config: Workbook layout configuration
+        sheet_name: Name of the parsed sheet
+        ga_filter: Optional filter selecting the parsed group addresses.
+        workbook_loader: Function loading the workbook
+
+    Returns:
+        Parsed KNX group addresses, number of scanned rows and number of skipped rows.
+    """
+    stats = StageStatistics(name=sheet_name)
+    gas = parse_group_addresses(workbook_loader(input_file, engine), layout_config, sheet_name, stats, ga_filter)
+    return gas, stats.rows_scanned, stats.rows_skipped
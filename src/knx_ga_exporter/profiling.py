@@ -0,0 +1,148 @@
+"""Per-stage timing and resource statistics of a conversion."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Generator, Optional
+
+from .logging import log_stage
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Not available on Windows
+    resource = None
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class TimingsFormat(Enum):
+    """Report formats of the stage timings."""
+
+    text = "text"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    json = "json"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+
+    def __str__(self) -> str:
+        """String representation.
+
+        Returns:
+            str: String representation
+        """
+        return self.value
+
+
+@dataclass
+class StageStatistics:
+    """Statistics of a single conversion stage. Counters not applicable to a stage are None."""
+
+    name: str
+    duration: float = 0.0
+    rows_scanned: Optional[int] = None
+    rows_skipped: Optional[int] = None
+    ga_count: Optional[int] = None
+    peak_rss: Optional[int] = None
+
+    def add_rows(self, rows_scanned: int, rows_skipped: int) -> None:
+        """Account scanned sheet rows.
+
+        Arguments:
+            rows_scanned: Number of scanned rows
+            rows_skipped: Number of scanned rows not containing a group address
+        """
+        self.rows_scanned = (self.rows_scanned or 0) + rows_scanned
+        self.rows_skipped = (self.rows_skipped or 0) + rows_skipped
+
+
+@dataclass
+class Timings:
+    """Statistics of all stages of a conversion in order of execution."""
+
+    stages: list[StageStatistics] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[StageStatistics, None, None]:
+        """Measure a conversion stage.
+
+        Arguments:
+            name: Stage name
+
+        Yields:
+            Statistics of the stage. Counters are filled in by the caller. The stage name is added to all log records
+            of the stage.
+        """
+        stats = StageStatistics(name=name)
+        stage_token = log_stage.set(name)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            log_stage.reset(stage_token)
+            stats.duration = time.perf_counter() - start
+            stats.peak_rss = peak_rss()
+            self.stages.append(stats)
+
+    def format(self, timings_format: TimingsFormat) -> str:
+        """Format the report of all stages.
+
+        Arguments:
+            timings_format: Report format
+
+        Returns:
+            Formatted report.
+        """
+        total_duration = sum(stats.duration for stats in self.stages)
+        if timings_format == TimingsFormat.json:
+            return json.dumps(
+                {"stages": [asdict(stats) for stats in self.stages], "total_duration": total_duration}, indent=2
+            )
+
+        lines = [
+            f"{'Stage':16s} | {'Duration':>10s} | {'Rows':>8s} | {'Skipped':>8s} | {'#GA':>8s} | {'Peak RSS':>10s}"
+        ]
+        lines.extend(
+            f"{stats.name:16s} | {stats.duration:8.3f} s | {_format_count(stats.rows_scanned)} | "
+            + f"{_format_count(stats.rows_skipped)} | {_format_count(stats.ga_count)} | {_format_size(stats.peak_rss)}"
+            for stats in self.stages
+        )
+        lines.append(f"{'total':16s} | {total_duration:8.3f} s |")
+        return "\n".join(lines)
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of the current process.
+
+    Returns:
+        Peak RSS in bytes or None if not supported by the platform.
+    """
+    if resource is None:  # pragma: no cover - Not available on Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _format_count(count: Optional[int]) -> str:
+    """Format an optional counter.
+
+    Arguments:
+        count: Counter value
+
+    Returns:
+        Right aligned counter or '-' if not applicable.
+    """
+    return f"{'-' if count is None else count:>8}"
+
+
+def _format_size(size: Optional[int]) -> str:
+    """Format an optional memory size.
+
+    Arguments:
+        size: Size in bytes
+
+    Returns:
+        Right aligned size in MiB or '-' if not available.
+    """
+    return f"{'-':>10s}" if size is None else f"{size / 1024 / 1024:6.1f} MiB"
@@ -0,0 +1,446 @@
+"""Workbook reader backends."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import functools
+import posixpath
+import re
+import zipfile
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import IO, Any, BinaryIO, Iterator, Optional, Sequence, Union
+from xml.etree.ElementTree import iterparse
+from xml.parsers import expat
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_SHARED_STRINGS_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"
+
+# Namespace qualified tags as reported by expat with a blank as namespace separator
+_TAG_ROW = f"{_NS_MAIN[1:-1]} row"
+_TAG_C = f"{_NS_MAIN[1:-1]} c"
+_TAG_V = f"{_NS_MAIN[1:-1]} v"
+_TAG_IS = f"{_NS_MAIN[1:-1]} is"
+_TAG_T = f"{_NS_MAIN[1:-1]} t"
+_TAG_SI = f"{_NS_MAIN[1:-1]} si"
+_TAG_RPH = f"{_NS_MAIN[1:-1]} rPh"
+
+_CHUNK_SIZE = 64 * 1024
+
+# OOXML escape of characters not representable in XML, e.g. '_x000D_'. A literal '_x' is escaped as '_x005F_x'.
+_ESCAPED_CHARACTER = re.compile(r"_x([0-9A-Fa-f]{4})_")
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+class InputEngine(Enum):
+    """Workbook reader engine types."""
+
+    openpyxl = "openpyxl"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+    xml = "xml"  # pylint: disable=invalid-name;reason=camel_case style wanted for cli param
+
+    def __str__(self) -> str:
+        """String representation.
+
+        Returns:
+            str: String representation
+        """
+        return self.value
+
+
+class WorkbookReader(ABC):
+    """Base class of all workbook reader backends."""
+
+    @property
+    @abstractmethod
+    def sheet_names(self) -> list[str]:
+        """Names of all sheets contained in the workbook.
+
+        Returns:
+            Sheet names
+        """
+
+    @abstractmethod
+    def iter_rows(self, sheet_name: str, min_row: int, columns: Sequence[int]) -> Iterator[tuple]:
+        """Iterate the rows of a sheet. Only the requested columns are read.
+
+        Arguments:
+            sheet_name: Name of the sheet
+            min_row: First row (1-based) to be read
+            columns: Indexes (0-based) of the columns to be returned for every row
+
+        Returns:
+            Iterator providing the cell values of the requested columns for every row.
+        """
+
+
+class OpenpyxlReader(WorkbookReader):
+    """Workbook reader based on openpyxl."""
+
+    def __init__(self, input_file: Union[str, BinaryIO]) -> None:
+        """Open the workbook.
+
+        Arguments:
+            input_file: Path of input file or a seekable binary stream of the workbook.
+        """
+        # Imported on first use only: openpyxl dominates the startup time of the CLI
+        import openpyxl  # pylint: disable=import-outside-toplevel
+
+        self.wb = openpyxl.load_workbook(filename=input_file, read_only=True, data_only=True)
+
+    @property
+    def sheet_names(self) -> list[str]:
+        """Names of all sheets contained in the workbook.
+
+        Returns:
+            Sheet names
+        """
+        return self.wb.sheetnames
+
+    def iter_rows(self, sheet_name: str, min_row: int, columns: Sequence[int]) -> Iterator[tuple]:
+        """Iterate the rows of a sheet.
+
+        Only the range spanned by the requested columns is read. Plain values are requested instead of cell objects.
+        Escaped characters of texts are decoded like the xml engine does, openpyxl keeps them.
+
+        Arguments:
+            sheet_name: Name of the sheet
+            min_row: First row (1-based) to be read
+            columns: Indexes (0-based) of the columns to be returned for every row
+
+        Yields:
+            Cell values of the requested columns.
+        """
+        ws = self.wb[sheet_name]
+        min_col = min(columns)
+        offsets = [column - min_col for column in columns]
+        for row in ws.iter_rows(min_row=min_row, min_col=min_col + 1, max_col=max(columns) + 1, values_only=True):
+            values = [row[offset] for offset in offsets]
+            yield tuple(_unescape(value) if value.__class__ is str else value for value in values)
+
+
+class XmlReader(WorkbookReader):
+    """Workbook reader streaming the sheet XML directly out of the XLSX zip container.
+
+    The sheet XML is parsed with the expat parser underlying xml.etree.ElementTree.iterparse, but without creating
+    any element objects. Only the requested columns are converted into plain values.
+    Number formats are not evaluated: Cells formatted as date are returned as plain numbers.
+    """
+
+    def __init__(self, input_file: Union[str, BinaryIO]) -> None:
+        """Open the workbook and read the sheet index and the shared strings.
+
+        Arguments:
+            input_file: Path of input file or a seekable binary stream of the workbook.
+        """
+        self.input_file = input_file
+        with zipfile.ZipFile(input_file) as archive:
+            relationships = self._read_relationships(archive, "xl/workbook.xml")
+            self.sheet_paths = {}
+            with archive.open("xl/workbook.xml") as workbook_xml:
+                for _, element in iterparse(workbook_xml):
+                    if element.tag == f"{_NS_MAIN}sheet":
+                        self.sheet_paths[element.get("name")] = relationships[element.get(f"{_NS_REL}id")][1]
+
+            shared_strings_paths = [
+                path for rel_type, path in relationships.values() if rel_type == _SHARED_STRINGS_REL_TYPE
+            ]
+            self.shared_strings = []
+            if shared_strings_paths:
+                with archive.open(shared_strings_paths[0]) as shared_strings_xml:
+                    for shared_strings in _parse_chunked(shared_strings_xml, _SharedStringsHandler()):
+                        self.shared_strings.extend(shared_strings)
+
+    @property
+    def sheet_names(self) -> list[str]:
+        """Names of all sheets contained in the workbook.
+
+        Returns:
+            Sheet names
+        """
+        return list(self.sheet_paths)
+
+    def iter_rows(self, sheet_name: str, min_row: int, columns: Sequence[int]) -> Iterator[tuple]:
+        """Iterate the rows of a sheet.
+
+        Arguments:
+            sheet_name: Name of the sheet
+            min_row: First row (1-based) to be read
+            columns: Indexes (0-based) of the columns to be returned for every row
+
+        Yields:
+            Cell values of the requested columns.
+
+        Raises:
+            KeyError: If the sheet does not exist.
+        """
+        sheet_path = self.sheet_paths.get(sheet_name)
+        if sheet_path is None:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+        with zipfile.ZipFile(self.input_file) as archive, archive.open(sheet_path) as sheet_xml:
+            for rows in _parse_chunked(sheet_xml, _SheetHandler(self.shared_strings, min_row, columns)):
+                yield from rows
+
+    @staticmethod
+    def _read_relationships(archive: zipfile.ZipFile, part_path: str) -> dict[str, tuple[str, str]]:
+        """Read the relationships of a package part.
+
+        Arguments:
+            archive: XLSX zip container
+            part_path: Path of the package part
+
+        Returns:
+            Relationship type and absolute target path by relationship ID.
+        """
+        part_dir, part_name = posixpath.split(part_path)
+        relationships = {}
+        with archive.open(posixpath.join(part_dir, "_rels", f"{part_name}.rels")) as rels_xml:
+            for _, element in iterparse(rels_xml):
+                if element.tag == f"{_NS_PKG_REL}Relationship":
+                    target = element.get("Target")
+                    target = target.lstrip("/") if target.startswith("/") else posixpath.join(part_dir, target)
+                    relationships[element.get("Id")] = (element.get("Type"), posixpath.normpath(target))
+        return relationships
+
+
+class _SharedStringsHandler:
+    """Expat handler collecting the plain text of all shared string items. Phonetic runs are ignored."""
+
+    def __init__(self) -> None:
+        """Initialize the handler."""
+        self.results = []
+        self._text = []
+        self._in_text = False
+        self._in_phonetic = False
+
+    def start_element(self, tag: str, attrs: dict) -> None:  # noqa: ARG002
+        """Handle an opening XML tag.
+
+        Arguments:
+            tag: Namespace qualified tag
+            attrs: Tag attributes
+        """
+        if tag == _TAG_T:
+            self._in_text = not self._in_phonetic
+        elif tag == _TAG_RPH:
+            self._in_phonetic = True
+
+    def end_element(self, tag: str) -> None:
+        """Handle a closing XML tag.
+
+        Arguments:
+            tag: Namespace qualified tag
+        """
+        if tag == _TAG_SI:
+            self.results.append(_unescape("".join(self._text)))
+            self._text = []
+        elif tag == _TAG_T:
+            self._in_text = False
+        elif tag == _TAG_RPH:
+            self._in_phonetic = False
+
+    def character_data(self, data: str) -> None:
+        """Handle character data.
+
+        Arguments:
+            data: Character data
+        """
+        if self._in_text:
+            self._text.append(data)
+
+
+class _SheetHandler:
+    """Expat handler converting the rows of a sheet into tuples of the requested column values."""
+
+    def __init__(self, shared_strings: list[str], min_row: int, columns: Sequence[int]) -> None:
+        """Initialize the handler.
+
+        Arguments:
+            shared_strings: Shared strings table
+            min_row: First row (1-based) to be read
+            columns: Indexes (0-based) of the columns to be returned for every row
+        """
+        self.results = []
+        self._shared_strings = shared_strings
+        self._min_row = min_row
+        self._next_row = min_row
+        self._column_positions = {column: position for position, column in enumerate(columns)}
+        self._empty_row = (None,) * len(columns)
+
+        self._row = 0
+        self._values = []
+        self._column = -1
+        self._position = None
+        self._data_type = None
+        self._text = None
+        self._in_text = False
+        self._in_phonetic = False
+
+    def start_element(self, tag: str, attrs: dict) -> None:
+        """Handle an opening XML tag.
+
+        Arguments:
+            tag: Namespace qualified tag
+            attrs: Tag attributes
+        """
+        if tag == _TAG_C:
+            reference = attrs.get("r")
+            self._column = _column_index(reference) if reference else self._column + 1
+            self._position = self._column_positions.get(self._column)
+            if self._position is not None:
+                self._data_type = attrs.get("t", "n")
+                self._text = None
+        elif self._position is not None:
+            if tag == _TAG_V:
+                self._in_text = self._data_type != "inlineStr"
+                if self._in_text:
+                    self._text = []
+            elif tag == _TAG_IS:
+                self._text = []
+            elif tag == _TAG_T:
+                self._in_text = self._data_type == "inlineStr" and not self._in_phonetic
+            elif tag == _TAG_RPH:
+                self._in_phonetic = True
+        elif tag == _TAG_ROW:
+            reference = attrs.get("r")
+            self._row = int(reference) if reference else self._row + 1
+            self._values = list(self._empty_row)
+            self._column = -1
+
+    def end_element(self, tag: str) -> None:
+        """Handle a closing XML tag.
+
+        Arguments:
+            tag: Namespace qualified tag
+        """
+        if tag == _TAG_C:
+            if self._position is not None:
+                self._values[self._position] = self._cell_value()
+                self._position = None
+        elif tag in {_TAG_V, _TAG_T}:
+            self._in_text = False
+        elif tag == _TAG_RPH:
+            self._in_phonetic = False
+        elif tag == _TAG_ROW and self._row >= self._min_row:
+            # Fill gaps of rows not contained in the XML
+            self.results.extend(self._empty_row for _ in range(self._next_row, self._row))
+            self.results.append(tuple(self._values))
+            self._next_row = self._row + 1
+
+    def character_data(self, data: str) -> None:
+        """Handle character data.
+
+        Arguments:
+            data: Character data
+        """
+        if self._in_text:
+            self._text.append(data)
+
+    def _cell_value(self) -> Any:  # noqa: ANN401
+        """Convert the collected text of the current cell into its plain value.
+
+        Returns:
+            Cell value
+        """
+        if self._text is None:
+            return None
+        value = "".join(self._text)
+        data_type = self._data_type
+        if data_type == "inlineStr":
+            return _unescape(value)
+        if not value:
+            return None
+        if data_type == "n":
+            return float(value) if "." in value or "E" in value or "e" in value else int(value)
+        if data_type == "s":
+            return self._shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return datetime.fromisoformat(value)
+        return _unescape(value)
+
+
+def open_workbook(input_file: Union[str, BinaryIO], engine: Optional[InputEngine] = None) -> WorkbookReader:
+    """Open a workbook with the selected reader backend.
+
+    Arguments:
+        input_file: Path of input file or a seekable binary stream of the workbook.
+        engine: Reader backend. Default: openpyxl
+
+    Returns:
+        Workbook reader
+    """
+    readers = {"openpyxl": OpenpyxlReader, "xml": XmlReader}
+    return readers[str(engine or InputEngine.openpyxl)](input_file)
+
+
+def _parse_chunked(xml_file: IO[bytes], handler: Any) -> Iterator[list]:  # noqa: ANN401
+    """Parse an XML file chunk by chunk with an expat based handler.
+
+    Arguments:
+        xml_file: XML file
+        handler: Handler providing start_element, end_element, character_data and a results list.
+
+    Yields:
+        Results produced by the handler while parsing the last chunk.
+    """
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start_element
+    parser.EndElementHandler = handler.end_element
+    parser.CharacterDataHandler = handler.character_data
+
+    while chunk := xml_file.read(_CHUNK_SIZE):
+        parser.Parse(chunk, False)
+        if handler.results:
+            yield handler.results
+            handler.results = []
+    parser.Parse(b"", True)
+    yield handler.results
+
+
+def _unescape(text: str) -> str:
+    """Decode the OOXML escaped characters of a text, e.g. '_x000D_' into a carriage return.
+
+    Arguments:
+        text: Text as stored in the XML
+
+    Returns:
+        Decoded text
+    """
+    if "_x" not in text:
+        return text
+    return _ESCAPED_CHARACTER.sub(lambda match: chr(int(match.group(1), 16)), text)
+
+
+def _column_index(cell_reference: str) -> int:
+    """Convert a cell reference like 'AB12' into the 0-based column index.
+
+    Arguments:
+        cell_reference: Cell reference
+
+    Returns:
+        Column index
+    """
+    return _column_letters_index(cell_reference.rstrip("0123456789"))
+
+
+@functools.cache
+def _column_letters_index(column_letters: str) -> int:
+    """Convert column letters like 'AB' into the 0-based column index.
+
+    Arguments:
+        column_letters: Column letters
+
+    Returns:
+        Column index
+    """
+    index = 0
+    for char in column_letters.upper():
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index - 1
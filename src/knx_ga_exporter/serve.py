@@ -0,0 +1,515 @@
+"""HTTP server converting uploaded workbooks on a pool of warm worker processes.
+
+Endpoints:
+    POST /convert   Body: XLSX workbook. Query: Configuration options as dotted keys, e.g.
+                    '?output.format=3/3&layout.sheet-name=KNX*'. Values are parsed as JSON if possible, e.g. lists.
+                    Response: The export, converted completely by a worker and sent with chunked transfer encoding.
+    GET  /metrics   JSON document of the latencies of the conversion requests, the queue depth and the busy workers.
+
+Every connection serves a single request.
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import asyncio
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from .api import build_memory_config, export_workbook
+from .argparse import parse_serve_config
+from .exporter import OutputFormat
+from .logging import configure_logging, configure_worker_logging, forward_worker_logging
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Size of the chunks the export is sent in
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# Number of most recent requests the latency statistics are calculated of
+LATENCY_WINDOW = 1000
+
+# Paths and their supported methods
+_ROUTES = {"/convert": "POST", "/metrics": "GET"}
+
+_MEDIA_TYPES = {
+    str(OutputFormat.format_1_1): "text/csv",
+    str(OutputFormat.format_3_3): "text/csv",
+    str(OutputFormat.json): "application/json",
+    str(OutputFormat.ndjson): "application/x-ndjson",
+    str(OutputFormat.xml): "application/xml",
+}
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@dataclass
+class ServerMetrics:
+    """Statistics of the conversion requests and the queue of the server."""
+
+    workers: int
+    queue_limit: int
+    requests: int = 0
+    status_counts: dict[int, int] = field(default_factory=dict)
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    busy_workers: int = 0
+
+    def record_request(self, status: int, latency: float) -> None:
+        """Account a finished conversion request.
+
+        Arguments:
+            status: HTTP status code of the response
+            latency: Duration from receiving the request until the response was sent in seconds
+        """
+        self.requests += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.latencies.append(latency)
+
+    def enqueue(self) -> None:
+        """Account a conversion waiting for a free worker."""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def to_report(self) -> dict:
+        """Build the machine-readable report.
+
+        Returns:
+            JSON serializable report.
+        """
+        latencies = sorted(self.latencies)
+        return {
+            "requests": {
+                "total": self.requests,
+                "status": {str(status): count for status, count in sorted(self.status_counts.items())},
+            },
+            "latency_seconds": {
+                "window": len(latencies),
+                "mean": sum(latencies) / len(latencies) if latencies else None,
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "p99": _percentile(latencies, 99),
+                "max": latencies[-1] if latencies else None,
+            },
+            "queue": {"depth": self.queue_depth, "max_depth": self.max_queue_depth, "limit": self.queue_limit},
+            "workers": {"total": self.workers, "busy": self.busy_workers},
+        }
+
+
+@dataclass
+class ConversionResult:
+    """Export of an uploaded workbook, created by a worker process."""
+
+    content: bytes
+    ga_count: int
+    media_type: str
+
+
+class HttpError(Exception):
+    """Request failing with an HTTP error status."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        """Constructor.
+
+        Arguments:
+            status: HTTP status of the response
+            message: Error message returned as response body.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class ConversionServer:
+    """Asyncio HTTP server running the conversions on a bounded pool of worker processes.
+
+    The worker processes are started and import the conversion modules before the server accepts requests.
+    At most 'workers' conversions run concurrently, at most 'max_queue' conversions wait for a free worker.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        workers: int = 1,
+        max_queue: int = 16,
+        max_upload: int = 64 * 1024 * 1024,
+        verbosity_level: int = 0,
+    ) -> None:
+        """Constructor.
+
+        Arguments:
+            host: Address the server listens on.
+            port: Port the server listens on. 0: Any free port, see port after start().
+            workers: Number of worker processes
+            max_queue: Number of conversions waiting for a free worker.
+            max_upload: Maximum size of an uploaded workbook in bytes.
+            verbosity_level: Configured verbosity level of the worker processes.
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_upload = max_upload
+        self.verbosity_level = verbosity_level
+        self.metrics = ServerMetrics(workers=workers, queue_limit=max_queue)
+        self._server = None
+        self._pool = None
+        self._slots = None
+        self._exit_stack = ExitStack()
+
+    async def start(self) -> None:
+        """Start the worker processes and listen for requests."""
+        # Log records of the workers are written by the log pipeline of the main process.
+        log_queue = multiprocessing.Queue()
+        self._exit_stack.enter_context(forward_worker_logging(log_queue))
+        self._pool = self._exit_stack.enter_context(
+            ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(log_queue, self.verbosity_level),
+            )
+        )
+        self._slots = asyncio.Semaphore(self.workers)
+        loop = asyncio.get_running_loop()
+        # Concurrent tasks start all worker processes before the first request
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info("Serving conversions on http://%s:%s with %s workers", self.host, self.port, self.workers)
+
+    async def serve_forever(self) -> None:
+        """Serve requests until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and stop the worker processes."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._exit_stack.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the request of a connection.
+
+        Arguments:
+            reader: Stream of the request
+            writer: Stream of the response
+        """
+        start = time.perf_counter()
+        method = path = None
+        try:
+            method, path, query, headers = await _read_request_head(reader)
+            _check_route(method, path)
+            if path == "/metrics":
+                await _write_response(
+                    writer, HTTPStatus.OK, json.dumps(self.metrics.to_report()).encode(), "application/json"
+                )
+            else:
+                workbook = await self._read_body(reader, headers)
+                result = await self._convert(workbook, _query_options(query))
+                await _write_chunked_response(writer, HTTPStatus.OK, result)
+            status = HTTPStatus.OK.value
+        except HttpError as e:
+            status = e.status.value
+            await _write_response(writer, e.status, f"{e}\n".encode(), "text/plain; charset=utf-8")
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            status = None
+            logging.warning("Connection closed by client: %s", e)
+        except Exception as e:  # pylint: disable=broad-exception-caught;reason=Unexpected errors must not stop the server.
+            status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+            logging.exception("Request %s %s failed", method, path)
+            await _write_response(
+                writer,
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                f"Internal server error: {e}\n".encode(),
+                "text/plain; charset=utf-8",
+            )
+        finally:
+            writer.close()
+
+        latency = time.perf_counter() - start
+        # Polling the metrics does not distort the statistics of the conversions
+        if path == "/convert" and status is not None:
+            self.metrics.record_request(status, latency)
+        logging.info("%s %s %s %.3f s", method, path, status, latency, extra={"status": status, "latency": latency})
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: dict[str, str]) -> bytes:
+        """Read the uploaded workbook.
+
+        Arguments:
+            reader: Stream of the request
+            headers: Request headers, names in lower case.
+
+        Returns:
+            Workbook contents
+
+        Raises:
+            HttpError: If the size of the upload is unknown or too large.
+        """
+        if "content-length" not in headers:
+            raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Header 'Content-Length' is required.")
+        try:
+            size = int(headers["content-length"])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid header 'Content-Length'.") from None
+        if size > self.max_upload:
+            raise HttpError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Upload of {size} bytes exceeds the limit of {self.max_upload}."
+            )
+        return await reader.readexactly(size)
+
+    async def _convert(self, workbook: bytes, options: dict) -> ConversionResult:
+        """Convert a workbook on a free worker process, waiting for one if all are busy.
+
+        Arguments:
+            workbook: Workbook contents
+            options: Configuration options
+
+        Returns:
+            Export of the workbook
+
+        Raises:
+            HttpError: If the queue is full or the conversion failed.
+        """
+        if self._slots.locked() and self.metrics.queue_depth >= self.max_queue:
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "All workers are busy and the queue is full.")
+        self.metrics.enqueue()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.metrics.queue_depth -= 1
+
+        self.metrics.busy_workers += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, _convert_upload, workbook, options)
+        except Exception as e:  # pylint: disable=broad-exception-caught;reason=Failed conversions must not stop the server.
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, f"Conversion failed: {e}") from e
+        finally:
+            self.metrics.busy_workers -= 1
+            self._slots.release()
+
+
+def run_serve(prog: str, version: str, copy_right: str, author: str, arg_list: list[str]) -> int:
+    """Run the conversion server until interrupted.
+
+    Arguments:
+        prog: Program name.
+        version: Program version.
+        copy_right: Copyright info.
+        author: Author info.
+        arg_list: Command line arguments list following the 'serve' command.
+
+    Returns:
+        int: Numeric exit code
+    """
+    serve_config = parse_serve_config(
+        prog=prog, version=version, copy_right=copy_right, author=author, arg_list=arg_list
+    )
+    configure_logging(serve_config.verbose, serve_config.log.format, serve_config.log.file)
+
+    server = ConversionServer(
+        host=serve_config.host,
+        port=serve_config.port,
+        workers=serve_config.workers,
+        max_queue=serve_config.max_queue,
+        max_upload=serve_config.max_upload,
+        verbosity_level=serve_config.verbose,
+    )
+    try:
+        asyncio.run(_serve(server))
+    except KeyboardInterrupt:
+        logging.info("Server stopped.")
+    return os.EX_OK
+
+
+async def _serve(server: ConversionServer) -> None:
+    """Start the server and serve requests until interrupted.
+
+    Arguments:
+        server: Conversion server
+    """
+    try:
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def _init_worker(log_queue: multiprocessing.Queue, verbosity_level: int) -> None:
+    """Initialize a worker process: Forward the log records and import the workbook reader.
+
+    Arguments:
+        log_queue: Multiprocessing queue consumed by the main process.
+        verbosity_level: Configured verbosity level
+    """
+    configure_worker_logging(log_queue, verbosity_level)
+    # Imported once per worker instead of on the first conversion
+    import openpyxl  # noqa: F401 # pylint: disable=import-outside-toplevel,unused-import
+
+
+def _convert_upload(workbook: bytes, options: dict) -> ConversionResult:
+    """Convert an uploaded workbook. Runs within a worker process.
+
+    Arguments:
+        workbook: Workbook contents
+        options: Configuration options
+
+    Returns:
+        Export of the workbook
+    """
+    output_config = build_memory_config(options).output
+    output = io.BytesIO()
+    ga_count = export_workbook(workbook, output, options)
+    media_type = f"{_MEDIA_TYPES[str(output_config.format)]}; charset={output_config.encoding}"
+    return ConversionResult(content=output.getvalue(), ga_count=ga_count, media_type=media_type)
+
+
+async def _read_request_head(reader: asyncio.StreamReader) -> tuple[str, str, str, dict[str, str]]:
+    """Read the request line and the headers of a request.
+
+    Arguments:
+        reader: Stream of the request
+
+    Returns:
+        Method, path, query and headers with names in lower case.
+
+    Raises:
+        HttpError: If the request line is invalid.
+    """
+    request_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Invalid request line '{request_line}'.")
+    method, target, _ = parts
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    url = urlsplit(target)
+    return method, url.path, url.query, headers
+
+
+def _check_route(method: str, path: str) -> None:
+    """Check that the server provides the requested path and method.
+
+    Arguments:
+        method: Requested method
+        path: Requested path
+
+    Raises:
+        HttpError: If the path or the method is not supported.
+    """
+    expected_method = _ROUTES.get(path)
+    if expected_method is None:
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Unknown path '{path}'. Expected: {', '.join(_ROUTES)}")
+    if method != expected_method:
+        raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method {method} not allowed. Expected: {expected_method}")
+
+
+def _query_options(query: str) -> dict:
+    """Convert the query parameters into nested configuration options.
+
+    Arguments:
+        query: Query of the request URL, e.g. 'output.format=3/3&layout.first-row=10'
+
+    Returns:
+        Configuration options, e.g. {"output": {"format": "3/3"}, "layout": {"first_row": 10}}.
+    """
+    options = {}
+    for key, text in parse_qsl(query, keep_blank_values=True):
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text
+        *sections, name = key.replace("-", "_").split(".")
+        section = options
+        for section_name in sections:
+            section = section.setdefault(section_name, {})
+        section[name] = value
+    return options
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes, media_type: str) -> None:
+    """Write a complete response.
+
+    Arguments:
+        writer: Stream of the response
+        status: HTTP status
+        body: Response body
+        media_type: Content type of the body
+    """
+    headers = [("Content-Type", media_type), ("Content-Length", str(len(body)))]
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        headers.append(("Retry-After", "1"))
+    writer.write(_response_head(status, headers) + body)
+    await writer.drain()
+
+
+async def _write_chunked_response(writer: asyncio.StreamWriter, status: HTTPStatus, result: ConversionResult) -> None:
+    """Write a response sending the export in chunks.
+
+    Arguments:
+        writer: Stream of the response
+        status: HTTP status
+        result: Export of the workbook
+    """
+    headers = [
+        ("Content-Type", result.media_type),
+        ("Transfer-Encoding", "chunked"),
+        ("X-GA-Count", str(result.ga_count)),
+    ]
+    writer.write(_response_head(status, headers))
+    content = memoryview(result.content)
+    for offset in range(0, len(content), RESPONSE_CHUNK_SIZE):
+        chunk = content[offset : offset + RESPONSE_CHUNK_SIZE]
+        writer.write(b"%x\r\n" % len(chunk) + chunk + b"\r\n")
+        # Waits while the client is slower than the server, the export is not copied into the transport at once
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def _response_head(status: HTTPStatus, headers: list[tuple[str, str]]) -> bytes:
+    """Build the status line and the headers of a response.
+
+    Arguments:
+        status: HTTP status
+        headers: Response headers
+
+    Returns:
+        Encoded response head incl. the empty line.
+    """
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", *(f"{name}: {value}" for name, value in headers)]
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def _percentile(sorted_values: list[float], percent: int) -> Optional[float]:
+    """Determine a percentile by the nearest-rank method.
+
+    Arguments:
+        sorted_values: Values in ascending order
+        percent: Percentile, 0-100
+
+    Returns:
+        Percentile or None if there are no values.
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)]
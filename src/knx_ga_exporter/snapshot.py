@@ -0,0 +1,267 @@
+"""Snapshot files of parsed group addresses.
+
+Snapshots are written either as JSON (*.json) or in a compact binary columnar format. Both are detected by content:
+JSON snapshots start with the marker key "knx_ga_snapshot", binary snapshots with magic bytes.
+
+
+    header:       magic (7 bytes), format version (uint8), #GA, #values, size of the value table in bytes (uint32 each)
+    value table:  JSON array of all distinct values of the text columns (names, target ID, DPT, comment),
+                  padded to 4 bytes
+    columns:      main, middle, sub IDs (uint16 each, padded to 4 bytes),
+                  main name, middle name, sub name, target ID, DPT, comment (uint32 index into the value table)
+
+All numbers are little-endian. Columns have a fixed width and are aligned, so they can be read directly from
+a memory-mapped file. Repeated values like group names and DPTs are stored only once.
+"""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import json
+import logging
+import os
+import re
+import struct
+import sys
+from array import array
+from typing import Iterable, Optional
+
+from knx_ga_exporter.group_address import GroupAddress
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Magic bytes and version of the binary snapshot format
+SNAPSHOT_MAGIC = b"KNXGAS\x00"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<7sBIII")
+# Marker key and format version of JSON snapshots, the first key of the snapshot object
+_JSON_MARKER = "knx_ga_snapshot"
+_JSON_MARKER_PATTERN = re.compile(rb'\s*\{\s*"' + _JSON_MARKER.encode("ascii") + rb'"\s*:')
+# Number of bytes read to detect the snapshot format
+_DETECTION_SIZE = 64
+_ADDRESS_ATTRIBUTES = ("main", "middle", "sub")
+_VALUE_ATTRIBUTES = ("main_name", "middle_name", "sub_name", "target_id", "dpt", "comment")
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+def group_addresses_to_records(group_addresses: Iterable[GroupAddress]) -> list[list]:
+    """Convert group addresses into JSON serializable records.
+
+    Arguments:
+        group_addresses: KNX group addresses
+
+    Returns:
+        One list of all group address attributes per group address.
+    """
+    return [[getattr(ga, name) for name in GroupAddress.__slots__] for ga in group_addresses]
+
+
+def records_to_group_addresses(records: Iterable[list]) -> list[GroupAddress]:
+    """Convert records created by group_addresses_to_records() back into group addresses.
+
+    Arguments:
+        records: Group address records
+
+    Returns:
+        KNX group addresses
+    """
+    return [GroupAddress(*record) for record in records]
+
+
+def is_snapshot(path: str) -> bool:
+    """Check whether a file is a snapshot.
+
+    Arguments:
+        path: File path
+
+    Returns:
+        True for files starting with the marker key of JSON snapshots or the magic bytes of binary snapshots.
+    """
+    try:
+        with open(path, "rb") as snapshot_file:
+            return _detect_format(snapshot_file.read(_DETECTION_SIZE)) is not None
+    except OSError:
+        return False
+
+
+def write_snapshot(path: str, group_addresses: Iterable[GroupAddress]) -> None:
+    """Write a snapshot of the group addresses. The file is replaced atomically.
+
+    Arguments:
+        path: Snapshot file path. Written as JSON for *.json files, otherwise in the binary snapshot format.
+        group_addresses: KNX group addresses
+    """
+    group_addresses = list(group_addresses)
+    logging.info("Writing snapshot of %s group addresses into '%s'", len(group_addresses), path)
+    temp_path = f"{path}.tmp"
+    if path.endswith(".json"):
+        with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(
+                {_JSON_MARKER: SNAPSHOT_VERSION, "group_addresses": group_addresses_to_records(group_addresses)},
+                snapshot_file,
+                ensure_ascii=False,
+            )
+    else:
+        with open(temp_path, "wb") as snapshot_file:
+            snapshot_file.write(_encode_binary_snapshot(group_addresses))
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str) -> list[GroupAddress]:
+    """Read a snapshot of group addresses.
+
+    Arguments:
+        path: Snapshot file path. The JSON or binary snapshot format is detected by content.
+
+    Returns:
+        KNX group addresses
+
+    Raises:
+        ValueError: If the file is no snapshot or the snapshot is invalid.
+    """
+    logging.info("Reading snapshot '%s'", path)
+    with open(path, "rb") as snapshot_file:
+        data = snapshot_file.read()
+    snapshot_format = _detect_format(data[:_DETECTION_SIZE])
+    if snapshot_format is None:
+        raise ValueError(f"'{path}' is no snapshot file.")
+    try:
+        if snapshot_format == "json":
+            return _decode_json_snapshot(data, path)
+        return _decode_binary_snapshot(data, path)
+    except (IndexError, KeyError, TypeError, struct.error, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Snapshot '{path}' is corrupt: {e}") from e
+
+
+def _detect_format(head: bytes) -> Optional[str]:
+    """Detect the snapshot format by the start of a file.
+
+    Arguments:
+        head: First bytes of the file
+
+    Returns:
+        "json", "binary" or None if the file is no snapshot.
+    """
+    if head.startswith(SNAPSHOT_MAGIC):
+        return "binary"
+    if _JSON_MARKER_PATTERN.match(head):
+        return "json"
+    return None
+
+
+def _decode_json_snapshot(data: bytes, path: str) -> list[GroupAddress]:
+    """Decode group addresses from the JSON snapshot format.
+
+    Arguments:
+        data: Snapshot file contents
+        path: Snapshot file path, reported on errors.
+
+    Returns:
+        KNX group addresses
+
+    Raises:
+        ValueError: If the snapshot was written by an unsupported version.
+    """
+    snapshot = json.loads(data.decode("utf-8"))
+    version = snapshot[_JSON_MARKER]
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot '{path}' has the unsupported format version {version}.")
+    return records_to_group_addresses(snapshot["group_addresses"])
+
+
+def _encode_binary_snapshot(group_addresses: list[GroupAddress]) -> bytes:
+    """Encode group addresses in the binary snapshot format.
+
+    Arguments:
+        group_addresses: KNX group addresses
+
+    Returns:
+        Snapshot file contents
+    """
+    values = []
+    value_indices = {}
+    value_columns = [array("I") for _ in _VALUE_ATTRIBUTES]
+    for ga in group_addresses:
+        for column, name in zip(value_columns, _VALUE_ATTRIBUTES):
+            value = getattr(ga, name)
+            # Keyed by type as well, e.g. 1 == True == 1.0 have the same hash
+            key = (type(value), value)
+            index = value_indices.get(key)
+            if index is None:
+                index = value_indices[key] = len(values)
+                values.append(value)
+            column.append(index)
+    address_columns = [array("H", (getattr(ga, name) for ga in group_addresses)) for name in _ADDRESS_ATTRIBUTES]
+
+    value_table = json.dumps(values, ensure_ascii=False, default=str).encode("utf-8")
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(group_addresses), len(values), len(value_table))
+    chunks = [header, _pad(value_table)]
+    for column in (*address_columns, *value_columns):
+        if sys.byteorder == "big":  # pragma: no cover
+            column.byteswap()
+        chunks.append(_pad(column.tobytes()))
+    return b"".join(chunks)
+
+
+def _decode_binary_snapshot(data: bytes, path: str) -> list[GroupAddress]:
+    """Decode group addresses from the binary snapshot format.
+
+    Arguments:
+        data: Snapshot file contents
+        path: Snapshot file path, reported on errors.
+
+    Returns:
+        KNX group addresses
+
+    Raises:
+        ValueError: If the snapshot was written by an unsupported version or is truncated.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Snapshot '{path}' is truncated.")
+    _, version, ga_count, value_count, value_table_size = _HEADER.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot '{path}' has the unsupported format version {version}.")
+    offset = _HEADER.size
+    values = json.loads(data[offset : offset + value_table_size].decode("utf-8"))
+    offset += _padded_size(value_table_size)
+
+    columns = []
+    for typecode in ("H",) * len(_ADDRESS_ATTRIBUTES) + ("I",) * len(_VALUE_ATTRIBUTES):
+        column = array(typecode)
+        size = ga_count * column.itemsize
+        column.frombytes(data[offset : offset + size])
+        if sys.byteorder == "big":  # pragma: no cover
+            column.byteswap()
+        offset += _padded_size(size)
+        columns.append(column)
+    if len(values) != value_count or offset > len(data):
+        raise ValueError(f"Snapshot '{path}' is truncated.")
+
+    main_column, middle_column, sub_column, *value_columns = columns
+    return [
+        GroupAddress(main, middle, sub, *(values[index] for index in indices))
+        for main, middle, sub, *indices in zip(main_column, middle_column, sub_column, *value_columns)
+    ]
+
+
+def _padded_size(size: int) -> int:
+    """Round a size up to the 4 bytes alignment of the snapshot sections.
+
+    Arguments:
+        size: Size in bytes
+
+    Returns:
+        Aligned size in bytes
+    """
+    return (size + 3) & ~3
+
+
+def _pad(data: bytes) -> bytes:
+    """Pad a snapshot section to the 4 bytes alignment.
+
+    Arguments:
+        data: Section contents
+
+    Returns:
+        Padded section contents
+    """
+    return data + b"\x00" * (_padded_size(len(data)) - len(data))
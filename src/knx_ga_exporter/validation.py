@@ -0,0 +1,175 @@
+"""Validation of the group addresses of a whole sheet."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from knx_ga_exporter.group_address import format_group_address, parse_address_part
+
+# ---- Globals ---------------------------------------------------------------------------------------------------------
+
+# Valid ranges of the 3-level group address parts
+ADDRESS_RANGES = {"main": (0, 31), "middle": (0, 7), "sub": (0, 255)}
+
+# Datapoint types like 'DPT-1', 'DPST-1-1' or the dotted notation '1.001' / 'DPT1.001', case-insensitive
+DPT_PATTERN = re.compile(r"DPS?T-\d+(-\d+)?|(DPT-?)?\d+(\.\d+)?", re.IGNORECASE)
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+@dataclass
+class ValidationIssue:
+    """Single validation issue of a sheet row."""
+
+    row: int
+    message: str
+
+    def __str__(self) -> str:
+        """Build string representation.
+
+        Returns:
+            Formatted string.
+        """
+        return f"Row {self.row}: {self.message}"
+
+
+class ValidationError(ValueError):
+    """Validation of a sheet failed. Contains all detected issues."""
+
+    def __init__(self, sheet_name: str, issues: list[ValidationIssue]) -> None:
+        """Constructor.
+
+        Args:
+            sheet_name: Name of the validated sheet
+            issues: All detected validation issues
+        """
+        self.sheet_name = sheet_name
+        self.issues = issues
+        super().__init__(
+            f"Validation of sheet '{sheet_name}' failed with {len(issues)} issue(s):\n"
+            + "\n".join(str(issue) for issue in issues)
+        )
+
+    def __reduce__(self) -> tuple:
+        """Support pickling, e.g. to pass the error from a worker process to the main process.
+
+        Returns:
+            Class and constructor arguments.
+        """
+        return self.__class__, (self.sheet_name, self.issues)
+
+
+class GroupAddressValidator:
+    """Validate all group address rows of a sheet in one pass and collect every issue instead of failing fast."""
+
+    def __init__(self, sheet_name: str) -> None:
+        """Constructor.
+
+        Args:
+            sheet_name: Name of the validated sheet
+        """
+        self.sheet_name = sheet_name
+        self.issues = []
+        self._address_rows = {}
+
+    def validate(
+        self,
+        row: int,
+        main: Any,  # noqa: ANN401
+        middle: Any,  # noqa: ANN401
+        sub: Any,  # noqa: ANN401
+        main_name: Any,  # noqa: ANN401
+        middle_name: Any,  # noqa: ANN401
+        sub_name: Any,  # noqa: ANN401
+        target_id: Any,  # noqa: ANN401
+        dpt: Any,  # noqa: ANN401
+    ) -> bool:
+        """Validate a single group address row.
+
+        Args:
+            row: Row number within the sheet
+            main: Main group ID
+            middle: Middle group ID
+            sub: Sub group ID
+            main_name: Main group name
+            middle_name: Middle group name
+            sub_name: Sub group name
+            target_id: Target ID
+            dpt: DPT datatype
+
+        Returns:
+            True if the row is a valid group address.
+        """
+        issue_count = len(self.issues)
+
+        mandatory = {
+            "main group ID": main,
+            "middle group ID": middle,
+            "sub group ID": sub,
+            "main group name": main_name,
+            "middle group name": middle_name,
+            "sub group name": sub_name,
+            "DPT": dpt,
+        }
+        missing = [name for name, value in mandatory.items() if value is None]
+        if missing:
+            formatted = format_group_address(main, middle, sub, main_name, middle_name, sub_name, target_id, dpt)
+            self._add(row, f"Incomplete KNX group address detected: {formatted} (missing: {', '.join(missing)})")
+
+        address = []
+        for part, value in zip(ADDRESS_RANGES, (main, middle, sub)):
+            if value is None:
+                continue
+            number = parse_address_part(value)
+            minimum, maximum = ADDRESS_RANGES[part]
+            if number is None:
+                self._add(row, f"Invalid {part} group ID '{value}'")
+            elif not minimum <= number <= maximum:
+                self._add(row, f"{part.capitalize()} group ID {number} out of range {minimum}-{maximum}")
+            address.append(number)
+
+        if dpt is not None and not _is_valid_dpt(dpt):
+            self._add(row, f"Invalid DPT format '{dpt}'. Expected e.g. 'DPT-1', 'DPST-1-1' or '1.001'")
+
+        if len(self.issues) == issue_count:
+            address = tuple(address)
+            first_row = self._address_rows.setdefault(address, row)
+            if first_row != row:
+                self._add(
+                    row, f"Duplicate group address {'/'.join(map(str, address))}, already defined in row {first_row}"
+                )
+
+        return len(self.issues) == issue_count
+
+    def raise_on_issues(self) -> None:
+        """Raise if any issue was detected.
+
+        Raises:
+            ValidationError: Containing all detected issues.
+        """
+        if self.issues:
+            raise ValidationError(self.sheet_name, self.issues)
+
+    def _add(self, row: int, message: str) -> None:
+        """Add a validation issue.
+
+        Args:
+            row: Row number within the sheet
+            message: Issue description
+        """
+        self.issues.append(ValidationIssue(row, message))
+
+
+def _is_valid_dpt(dpt: Any) -> bool:  # noqa: ANN401
+    """Check the format of a datapoint type. The DPT is exported unchanged, only its format is checked.
+
+    Args:
+        dpt: DPT datatype. Numeric cells like 1.001 are accepted as dotted notation.
+
+    Returns:
+        True if the DPT has a valid format.
+    """
+    if isinstance(dpt, (int, float)) and not isinstance(dpt, bool):
+        dpt = str(dpt)
+    return isinstance(dpt, str) and DPT_PATTERN.fullmatch(dpt) is not None
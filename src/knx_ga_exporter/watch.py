@@ -0,0 +1,88 @@
+"""Watch mode re-exporting the input workbook whenever it changes."""
+
+# ---- Imports ---------------------------------------------------------------------------------------------------------
+import logging
+import os
+import time
+from datetime import datetime
+from threading import Event
+from typing import Callable, Optional
+
+# ---- Class / Functions -----------------------------------------------------------------------------------------------
+
+
+def watch(config: dict, convert_function: Callable[[dict], Optional[int]], stop_event: Optional[Event] = None) -> int:
+    """Poll the input file and convert it whenever it changed.
+
+    A change is converted once the file is unchanged for the debounce time. This skips the intermediate states of
+    a file still being saved. Failed conversions are reported and watching continues.
+
+    Arguments:
+        config: Config hierarchy, parsed once for all conversions.
+        convert_function: Function converting the input file. Returns the number of exported group addresses.
+        stop_event: Optional event stopping the watch. Default: Watch until interrupted (Ctrl+C).
+
+    Returns:
+        int: Numeric exit code
+    """
+    stop_event = stop_event if stop_event is not None else Event()
+    input_file = config.input.file
+    print(f"Watching '{input_file}' for changes. Press Ctrl+C to stop.", flush=True)
+
+    cycle = 0
+    converted_signature = None
+    pending_signature = None
+    pending_since = 0.0
+    try:
+        while True:
+            signature = _file_signature(input_file)
+            if signature is not None and signature != converted_signature:
+                if signature != pending_signature:
+                    pending_signature = signature
+                    pending_since = time.monotonic()
+                if time.monotonic() - pending_since >= config.watch_debounce:
+                    cycle += 1
+                    _run_cycle(cycle, config, convert_function)
+                    converted_signature = signature
+            if stop_event.wait(config.watch_interval):
+                break
+    except KeyboardInterrupt:
+        pass
+
+    print(f"Stopped watching '{input_file}' after {cycle} conversions.", flush=True)
+    return os.EX_OK
+
+
+def _run_cycle(cycle: int, config: dict, convert_function: Callable[[dict], Optional[int]]) -> None:
+    """Run and report a single conversion.
+
+    Arguments:
+        cycle: Number of the conversion
+        config: Config hierarchy
+        convert_function: Function converting the input file.
+    """
+    start = time.perf_counter()
+    try:
+        ga_count = convert_function(config)
+        status = "OK (up-to-date)" if ga_count is None else f"OK (#GA: {ga_count})"
+    except Exception as e:  # pylint: disable=broad-exception-caught;reason=Failed conversions must not stop watching.
+        logging.error(e)
+        status = f"FAILED: {str(e).splitlines()[0]}"
+    duration = time.perf_counter() - start
+    print(f"{datetime.now():%H:%M:%S} | Cycle {cycle:3d} | {duration:8.3f} s | {status}", flush=True)
+
+
+def _file_signature(path: str) -> Optional[tuple[int, int]]:
+    """Determine the signature of a file changing with every modification.
+
+    Arguments:
+        path: File path
+
+    Returns:
+        Modification time and size. None if the file does not exist, e.g. while being replaced.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
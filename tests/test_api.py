@@ -0,0 +1,160 @@
+"""Test of the in-memory conversion API."""
+
+import csv
+import io
+import os
+
+import pytest
+
+from knx_ga_exporter.api import convert_workbook, export_workbook, iter_rows, read_group_addresses
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from knx_ga_exporter.exporter import iter_csv_rows
+from tests.test_conversion import read_file
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+
+def read_workbook(path: str = "tests/inputs/KNX-planning-example.xlsx") -> bytes:
+    """Read the contents of a workbook.
+
+    Arguments:
+        path: Path of the workbook
+
+    Returns:
+        Workbook contents
+    """
+    with open(path, "rb") as workbook_file:
+        return workbook_file.read()
+
+
+def decode(output: bytes, encoding: str) -> str:
+    """Decode an export like a text file read from disk, i.e. with universal newlines.
+
+    Arguments:
+        output: Export contents
+        encoding: Output encoding
+
+    Returns:
+        Decoded export
+    """
+    return io.TextIOWrapper(io.BytesIO(output), encoding).read()
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "options,expected_path,expected_encoding",
+    [
+        ({}, "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT),
+        (
+            {"input": {"engine": "xml"}, "output": {"format": "3/3"}},
+            "tests/expected_outputs/KNX-planning-example_format_3_3.csv",
+            OUTPUT_ENCODING_DEFAULT,
+        ),
+        (
+            {"output": {"separator": "comma", "encoding": "utf-8"}},
+            "tests/expected_outputs/KNX-planning-example_format_1_1_separator_comma.csv",
+            "utf-8",
+        ),
+        (
+            {"output": {"format": "ndjson", "encoding": "utf-8"}, "stream": True},
+            "tests/expected_outputs/KNX-planning-example.ndjson",
+            "utf-8",
+        ),
+        (
+            {"output": {"format": "xml", "encoding": "utf-8", "file": "ignored.xml", "targets": [{"file": "x.csv"}]}},
+            "tests/expected_outputs/KNX-planning-example.xml",
+            "utf-8",
+        ),
+    ],
+)
+def test_ct_convert_workbook(options: dict, expected_path: str, expected_encoding: str, tmp_path: str) -> None:
+    """Test that in-memory conversions of bytes and streams match the exported files and touch no files.
+
+    Arguments:
+        options: Configuration options
+        expected_path: Path of the expected export
+        expected_encoding: Encoding of the expected export
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    workbook = read_workbook()
+    expected = read_file(expected_path, expected_encoding)
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        output = convert_workbook(workbook, options)
+        stream_output = io.BytesIO()
+        ga_count = export_workbook(io.BytesIO(workbook), stream_output, options)
+        assert not os.listdir(tmp_path)
+    finally:
+        os.chdir(cwd)
+
+    assert ga_count == 16
+    assert decode(output, expected_encoding) == expected
+    assert stream_output.getvalue() == output
+    assert not stream_output.closed
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "xml"])
+@pytest.mark.parametrize("output_format", ["1/1", "3/3"])
+def test_ct_iter_rows(engine: str, output_format: str) -> None:
+    """Test that the CSV rows match the rows of the CSV export.
+
+    Arguments:
+        engine: Reader backend
+        output_format: CSV output format
+    """
+    workbook = read_workbook()
+    options = {"input": {"engine": engine}, "output": {"format": output_format, "encoding": "utf-8"}}
+    rows = [["" if value is None else str(value) for value in row] for row in iter_rows(workbook, options)]
+    expected_rows = list(csv.reader(io.StringIO(decode(convert_workbook(workbook, options), "utf-8")), delimiter="\t"))
+    assert rows == expected_rows
+    assert len(rows) == 1 + 16 + 2 + 6
+
+
+def test_ct_read_group_addresses() -> None:
+    """Test parsing an in-memory workbook with layout and filter options."""
+    gas = read_group_addresses(
+        read_workbook("tests/inputs/multi-sheet.xlsx"),
+        {"layout": {"sheet_name": ["Wing A", "Wing B"]}, "filter": {"address": "1"}},
+    )
+    assert [f"{ga.main}/{ga.middle}/{ga.sub}" for ga in gas][:2] == ["1/0/0", "1/0/1"]
+    assert {ga.main for ga in gas} == {1}
+
+
+def test_ct_read_group_addresses_sorted() -> None:
+    """Test that the group addresses are sorted by address regardless of the order of the sheets."""
+    workbook = read_workbook("tests/inputs/multi-sheet.xlsx")
+    gas = read_group_addresses(workbook, {"layout": {"sheet_name": ["Wing B", "Wing A"]}})
+    addresses = [(ga.main, ga.middle, ga.sub) for ga in gas]
+    assert len(addresses) == 16
+    assert addresses == sorted(addresses)
+    assert gas == read_group_addresses(workbook, {"layout": {"sheet_name": ["Wing A", "Wing B"]}})
+
+
+@pytest.mark.parametrize(
+    "workbook,options,expected_error",
+    [
+        (b"no workbook", {}, "File is not a zip file"),
+        (read_workbook(), {"output": {"format": "json"}}, "Output format 'json' is not a CSV format"),
+        (read_workbook(), {"layout": {"sheet_name": "Missing"}}, "Missing"),
+        (read_workbook(), {"unknown": 1}, "Unknown configuration option 'unknown'"),
+    ],
+)
+def test_ct_invalid_iter_rows(workbook: bytes, options: dict, expected_error: str) -> None:
+    """Test the errors of invalid workbooks and options.
+
+    Arguments:
+        workbook: Workbook contents
+        options: Configuration options
+        expected_error: Expected error message
+    """
+    with pytest.raises(Exception, match=expected_error):
+        list(iter_rows(workbook, options))
+
+
+def test_ut_iter_csv_rows_invalid_format() -> None:
+    """Test that only CSV formats are supported."""
+    with pytest.raises(ValueError, match="Expected one of: 1/1, 3/3"):
+        iter_csv_rows("xml", [])
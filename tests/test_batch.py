@@ -0,0 +1,121 @@
+"""Test of the batch mode."""
+
+import json
+import logging
+import os
+import re
+
+import pytest
+
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT, parse_batch_config
+from tests.test_conversion import read_file
+from tests.util_runner import run_cli
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ct_batch(
+    workers: int,
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+) -> None:
+    """Test conversion of a batch manifest including failing jobs.
+
+    Arguments:
+        workers: Number of worker processes
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    manifest = {
+        "jobs": [
+            {
+                "input": {"file": "tests/inputs/KNX-planning-example.xlsx"},
+                "output": {"file": f"{tmp_path}/format_1_1.csv"},
+            },
+            {
+                "input": {"file": "tests/inputs/KNX-planning-example.xlsx", "engine": "xml"},
+                "output": {"file": f"{tmp_path}/format_3_3.csv", "format": "3/3"},
+            },
+            {
+                "input": {"file": "tests/inputs/KNX-planning-example.xlsx"},
+                "layout": {"sheet_name": "Unknown"},
+                "output": {"file": f"{tmp_path}/unknown-sheet.csv"},
+            },
+            {
+                "output": {"file": f"{tmp_path}/missing-input.csv"},
+            },
+            {
+                "input": {"file": "tests/inputs/multi-sheet.xlsx", "workers": 2},
+                "layout": {"sheet_name": ["Wing A", "Wing B"]},
+                "output": {"file": f"{tmp_path}/multi-sheet.csv"},
+            },
+        ]
+    }
+    manifest_path = f"{tmp_path}/manifest.json"
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    with caplog.at_level(logging.INFO):
+        cli_result = run_cli(f"batch {manifest_path} --workers {workers} -v", capsys)
+    assert cli_result.exit_code != os.EX_OK
+
+    assert re.search(r"Job +1 .*format_1_1.csv \| OK \(#GA: 16\)", cli_result.stdout_lines[0])
+    assert re.search(r"Job +2 .*format_3_3.csv \| OK \(#GA: 16\)", cli_result.stdout_lines[1])
+    assert re.search(r"Job +3 .*unknown-sheet.csv \| FAILED: .*Unknown does not exist", cli_result.stdout_lines[2])
+    assert re.search(r"Job +4 .*missing-input.csv \| FAILED: .*input.file.* is required", cli_result.stdout_lines[3])
+    assert re.search(r"Job +5 .*multi-sheet.csv \| OK \(#GA: 16\)", cli_result.stdout_lines[4])
+    assert re.search(r"Batch finished in .* 3 succeeded, 2 failed", cli_result.stdout_lines[5])
+    assert re.search(r"ERROR.*Job +3", caplog.text)
+
+    for output_file, expected_csv_path in [
+        ("format_1_1.csv", "tests/expected_outputs/KNX-planning-example_format_1_1.csv"),
+        ("format_3_3.csv", "tests/expected_outputs/KNX-planning-example_format_3_3.csv"),
+        ("multi-sheet.csv", "tests/expected_outputs/KNX-planning-example_format_1_1.csv"),
+    ]:
+        output_csv = read_file(f"{tmp_path}/{output_file}", OUTPUT_ENCODING_DEFAULT)
+        assert output_csv == read_file(expected_csv_path, OUTPUT_ENCODING_DEFAULT)
+
+
+def test_ct_batch_up_to_date(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that a successful batch run reports up-to-date outputs of cached jobs.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    manifest = {
+        "jobs": [
+            {
+                "input": {"file": "tests/inputs/KNX-planning-example.xlsx"},
+                "output": {"file": f"{tmp_path}/format_1_1.csv"},
+                "cache": {"dir": f"{tmp_path}/cache"},
+            },
+        ]
+    }
+    manifest_path = f"{tmp_path}/manifest.json"
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    assert run_cli(f"batch {manifest_path} --workers 1", capsys).exit_code == os.EX_OK
+    cli_result = run_cli(f"batch {manifest_path} --workers 1", capsys)
+
+    assert cli_result.exit_code == os.EX_OK
+    assert re.search(r"Job +1 .*format_1_1.csv \| OK \(up-to-date\)", cli_result.stdout_lines[0])
+
+
+def test_ct_batch_workers(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the default number of workers if the number of CPUs is unknown and that invalid numbers are rejected.
+
+    Arguments:
+        capsys: System capture
+        monkeypatch: Unknown number of CPUs
+    """
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert parse_batch_config("knx-ga-exporter", "1.0", "", "", ["manifest.json"]).workers == 1
+
+    cli_result = run_cli("batch manifest.json --workers 0", capsys)
+    assert cli_result.exit_code != os.EX_OK
+    assert "Not of type PositiveInt: 0" in cli_result.stderr
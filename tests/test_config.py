@@ -0,0 +1,105 @@
+"""Test of the configuration API."""
+
+import os
+
+import pytest
+
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT, build_arg_parser, build_config, parse_config
+from knx_ga_exporter.conversion import convert
+from knx_ga_exporter.encoding import EncodingErrors
+from knx_ga_exporter.exporter import CsvSeparator
+from knx_ga_exporter.parser import SheetLayout, compile_layout
+from tests.test_conversion import read_file
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+def test_ut_build_arg_parser_cached() -> None:
+    """Test that the configuration parser is built only once."""
+    arg_parser = build_arg_parser(prog="knx-ga-exporter", version="1.0", copy_right="", author="")
+    assert build_arg_parser(prog="knx-ga-exporter", version="1.0", copy_right="", author="") is arg_parser
+    other_arg_parser = build_arg_parser(
+        prog="knx-ga-exporter", version="1.0", copy_right="", author="", exit_on_error=False
+    )
+    assert other_arg_parser is not arg_parser
+
+
+def test_ut_build_config(tmp_path: str) -> None:
+    """Test that configurations built from Python match the parsed command line and convert the same way.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    config = build_config(
+        {
+            "input": {"file": "tests/inputs/KNX-planning-example.xlsx"},
+            "output": {
+                "file": f"{tmp_path}/format_1_1.csv",
+                "separator": "semicolon",
+                "targets": [
+                    {"file": f"{tmp_path}/format_3_3.csv", "format": "3/3", "encoding-errors": "replace"},
+                    {"file": f"{tmp_path}/format_1_1.csv"},
+                ],
+            },
+            "layout": {"max_empty_rows": 10},
+        }
+    )
+    parsed_config = parse_config(
+        prog="knx-ga-exporter",
+        version="1.0",
+        copy_right="",
+        author="",
+        arg_list=[
+            "--input.file",
+            "tests/inputs/KNX-planning-example.xlsx",
+            "--output.file",
+            f"{tmp_path}/format_1_1.csv",
+            "--output.separator",
+            "semicolon",
+            "--output.targets",
+            f'[{{"file": "{tmp_path}/format_3_3.csv", "format": "3/3", "encoding_errors": "replace"}}, '
+            + f'{{"file": "{tmp_path}/format_1_1.csv"}}]',
+            "--layout.max-empty-rows",
+            "10",
+        ],
+    )
+    assert config == parsed_config
+    assert config.output.separator == CsvSeparator.semicolon
+    assert config.output.targets[0].encoding_errors == EncodingErrors.replace
+    assert config.output.targets[1].separator is None
+
+    assert convert(config) == 16
+    assert read_file(f"{tmp_path}/format_1_1.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1_separator_semicolon.csv", OUTPUT_ENCODING_DEFAULT
+    )
+    assert os.path.exists(f"{tmp_path}/format_3_3.csv")
+
+    # Defaults are not modified
+    assert build_config({"input": {"file": "ga.xlsx"}}).output.separator == CsvSeparator.tabulator
+
+
+@pytest.mark.parametrize(
+    "options,expected_error",
+    [
+        ({"input": {"file": "ga.xlsx"}, "output": {"unknown": 1}}, r"Unknown configuration option 'output.unknown'"),
+        ({"output": {"file": "ga.csv"}}, r"Configuration option 'input.file' is required"),
+        ({"input": {"file": "ga.xlsx"}, "output": {"separator": "pipe"}}, r"'pipe' is not a valid CsvSeparator"),
+    ],
+)
+def test_ut_build_config_invalid(options: dict, expected_error: str) -> None:
+    """Test invalid configurations built from Python.
+
+    Arguments:
+        options: Configuration options
+        expected_error: Expected error message (RegEx)
+    """
+    with pytest.raises(ValueError, match=expected_error):
+        build_config(options)
+
+
+def test_ut_compile_layout() -> None:
+    """Test that layouts are compiled into integer options once."""
+    config = build_config({"input": {"file": "ga.xlsx"}, "layout": {"dpt_column": "7", "first_row": "9"}})
+    layout = compile_layout(config.layout)
+    assert layout == SheetLayout(columns=(6, 0, 2, 4, 1, 3, 8, 7, 9), first_row=9, max_empty_rows=0)
+    assert compile_layout(config.clone().layout) is layout
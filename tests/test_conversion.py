@@ -7,9 +7,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+import openpyxl
 import pytest
 
-from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT, build_config
+from knx_ga_exporter.conversion import convert
+from knx_ga_exporter.parser import load_workbook
+from knx_ga_exporter.reader import InputEngine, WorkbookReader
 from tests.util_runner import run_cli
 
 
@@ -62,6 +66,20 @@ def read_file(path: str, encoding: str) -> str:
     return local_file.read()
 
 
+def load_multi_sheet_workbook(input_file: str, engine: Optional[InputEngine] = None) -> WorkbookReader:
+    """Load the multi-sheet workbook instead of the input file. Module function to be usable by worker processes.
+
+    Arguments:
+        input_file: Path of input file. Ignored.
+        engine: Workbook reader backend.
+
+    Returns:
+        Loaded workbook
+    """
+    assert input_file == "injected.xlsx"
+    return load_workbook("tests/inputs/multi-sheet.xlsx", engine)
+
+
 # ---- Testcases -------------------------------------------------------------------------------------------------------
 
 
@@ -96,6 +114,34 @@ def read_file(path: str, encoding: str) -> str:
             "tests/expected_outputs/KNX-planning-example_format_1_1_separator_comma.csv",
             "INFO.*format: 1/1.*separator: ','",
         ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--layout.first-row 8 --layout.dpt-column 5 --layout.comment-column 9 --layout.max-empty-rows 2",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            "",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--layout.last-column 10",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            "WARNING.*--layout.last-column is deprecated and ignored",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--output.format 1/1 --stream -vv",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            ".*Statistics: #GA: 16",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--output.format 3/3 --stream",
+            "tests/expected_outputs/KNX-planning-example_format_3_3.csv",
+            ".*",
+        ),
         (
             "tests/inputs/custom-layout.xlsx",
             OUTPUT_ENCODING_DEFAULT,
@@ -103,6 +149,69 @@ def read_file(path: str, encoding: str) -> str:
             "tests/expected_outputs/custom-layout.csv",
             ".*",
         ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--layout.sheet-name 'Wing [AB]' -v",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            ".*",
+        ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--layout.sheet-name '[Wing B, Wing A]' --input.workers 2 -v",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            "Parsing 2 sheets with 2 workers",
+        ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--layout.sheet-name '[Wing A, Wing B]' --stream --input.engine xml",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            ".*",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--input.engine xml --output.format 3/3",
+            "tests/expected_outputs/KNX-planning-example_format_3_3.csv",
+            ".*",
+        ),
+        (
+            "tests/inputs/custom-layout.xlsx",
+            OUTPUT_ENCODING_DEFAULT,
+            "--input.engine xml --config tests/inputs/custom-layout-config.json",
+            "tests/expected_outputs/custom-layout.csv",
+            ".*",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            "utf-8",
+            "--output.format json",
+            "tests/expected_outputs/KNX-planning-example.json",
+            "INFO.*format: json, encoding: utf-8",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            "utf-8",
+            "--output.format ndjson --stream",
+            "tests/expected_outputs/KNX-planning-example.ndjson",
+            ".*",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            "utf-8",
+            "--output.format xml",
+            "tests/expected_outputs/KNX-planning-example.xml",
+            ".*",
+        ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            "utf-8",
+            "--layout.sheet-name '[Wing A, Wing B]' --stream --output.format xml",
+            "tests/expected_outputs/KNX-planning-example.xml",
+            ".*",
+        ),
     ],
 )
 def test_ct_valid_conversion(
@@ -144,20 +253,63 @@ def test_ct_valid_conversion(
 
 
 @pytest.mark.parametrize(
-    "input_file_path,expected_error",
+    "input_file_path,extra_cli_args,expected_error",
     [
         (
             "tests/inputs/missing-maingroup-name.xlsx",
+            "",
             r"Incomplete KNX group address detected.*1/0/0.*Missing main group name",
         ),
         (
             "tests/inputs/encoding-error.xlsx",
-            r"Encoding Error of „long“ minus character",
+            "",
+            r"1 text\(s\) can not be represented in the output encoding 'iso-8859-1':\n"
+            + r"1/0/1: sub group name 'Encoding Error of „long“ minus character: –' contains '„', '“', '–'",
+        ),
+        (
+            "tests/inputs/encoding-error.xlsx",
+            "--stream",
+            r"Failed to encode the CSV row string: .*Encoding Error of „long“ minus character.*\n"
+            + r"KNX group address: 1/0/1 ",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            "--layout.dpt-column F",
+            r"Invalid layout configuration: invalid literal for int\(\) with base 10: 'F'",
+        ),
+        (
+            "tests/inputs/KNX-planning-example.xlsx",
+            "--layout.first-row 0",
+            r"Invalid layout configuration: .*--layout.first-row must be at least 1",
+        ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            "--layout.sheet-name 'Wing *'",
+            r"collisions between sheets detected:\n1/0/1 in sheets 'Wing B' and 'Wing C'",
+        ),
+        (
+            "tests/inputs/multi-sheet.xlsx",
+            "--layout.sheet-name '[Wing A, Missing*]'",
+            r"Worksheet Missing\* does not exist",
+        ),
+        (
+            "tests/inputs/validation-errors.xlsx",
+            "",
+            r"(?s)Validation of sheet 'KNX Group Addresses' failed with 8 issue\(s\):\n"
+            + r"Row 10: Main group ID 32 out of range 0-31\n"
+            + r"Row 11: Middle group ID 8 out of range 0-7\n"
+            + r"Row 12: Sub group ID 256 out of range 0-255\n"
+            + r"Row 14: Invalid DPT format 'Switch'.*\n"
+            + r"Row 16: Incomplete KNX group address detected: 0/1/1 .*\(missing: middle group name\)\n"
+            + r"Row 24: Invalid sub group ID 'x'\n"
+            + r"Row 25: Duplicate group address 1/0/0, already defined in row 23\n"
+            + r"Row 26: Incomplete KNX group address detected: 1/1/None .*\(missing: sub group ID\)",
         ),
     ],
 )
 def test_ct_invalid_conversion(
     input_file_path: str,
+    extra_cli_args: str,
     expected_error: str,
     capsys: pytest.CaptureFixture[str],
     caplog: pytest.LogCaptureFixture,
@@ -167,6 +319,7 @@ def test_ct_invalid_conversion(
 
     Arguments:
         input_file_path: CLI arguments
+        extra_cli_args: Additional CLI arguments
         expected_error: Expected error message
         capsys: System capture
         caplog: Logging capture
@@ -174,14 +327,291 @@ def test_ct_invalid_conversion(
     """
     output_csv_path = f"{tmp_path}/conversion_result.csv"
 
-    cli_args = f"--input.file {input_file_path} --output.file {output_csv_path} "
+    cli_args = f"--input.file {input_file_path} --output.file {output_csv_path} {extra_cli_args}"
 
     with caplog.at_level(logging.ERROR):
         cli_result = run_cli(cli_args, capsys)
         assert cli_result.exit_code != os.EX_OK
 
     assert re.search(expected_error, caplog.text)
+    # Neither a truncated output file nor a temporary file is left behind
+    assert os.listdir(tmp_path) == []
 
     # output_csv = read_file(output_csv_path, output_encoding)
     # expected_csv = read_file(expected_csv_path, output_encoding)
     # assert output_csv == expected_csv
+
+
+def test_ct_invalid_conversion_workers(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str
+) -> None:
+    """Test that the validation report of a sheet parsed by a worker process is reported. Expected to fail.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    wb = openpyxl.load_workbook("tests/inputs/validation-errors.xlsx")
+    wb.copy_worksheet(wb.active).title = "Wing B"
+    wb.active.title = "Wing A"
+    input_file_path = f"{tmp_path}/validation-errors-multi-sheet.xlsx"
+    wb.save(input_file_path)
+
+    cli_args = (
+        f"--input.file {input_file_path} --output.file {tmp_path}/conversion_result.csv "
+        + "--layout.sheet-name 'Wing *' --input.workers 2"
+    )
+    with caplog.at_level(logging.ERROR):
+        assert run_cli(cli_args, capsys).exit_code != os.EX_OK
+
+    assert re.search(
+        r"(?s)Validation of sheet 'Wing A' failed with 8 issue\(s\):\nRow 10: .*Row 26: Incomplete", caplog.text
+    )
+    assert not os.path.exists(f"{tmp_path}/conversion_result.csv")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ct_conversion_workbook_loader(workers: int, tmp_path: str) -> None:
+    """Test that the injected workbook loader is used, also by the worker processes parsing multiple sheets.
+
+    Arguments:
+        workers: Number of worker processes
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    config = build_config(
+        {
+            "input": {"file": "injected.xlsx", "workers": workers},
+            "layout": {"sheet_name": ["Wing A", "Wing B"]},
+            "output": {"file": f"{tmp_path}/conversion_result.csv"},
+        }
+    )
+    assert convert(config, workbook_loader=load_multi_sheet_workbook) == 16
+    assert read_file(f"{tmp_path}/conversion_result.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+def test_ct_conversion_unknown_cpu_count(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch, tmp_path: str
+) -> None:
+    """Test that multiple sheets are parsed by the main process if the number of CPUs is unknown.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        monkeypatch: Unknown number of CPUs
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    cli_args = (
+        f"--input.file tests/inputs/multi-sheet.xlsx --output.file {tmp_path}/conversion_result.csv "
+        + "--layout.sheet-name 'Wing [AB]'"
+    )
+    with caplog.at_level(logging.INFO):
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    assert "Parsing 2 sheets" not in caplog.text
+    assert read_file(f"{tmp_path}/conversion_result.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+@pytest.mark.parametrize("max_empty_rows,expected_ga_count", [(0, 16), (100, 8), (152, 16)])
+def test_ct_empty_rows_gap_conversion(
+    max_empty_rows: int,
+    expected_ga_count: int,
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+) -> None:
+    """Test that group addresses after a gap of empty rows are only ignored if the gap reaches the configured limit.
+
+    Arguments:
+        max_empty_rows: Number of consecutive empty rows marking the end of data
+        expected_ga_count: Expected number of group addresses
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    wb = openpyxl.load_workbook("tests/inputs/KNX-planning-example.xlsx", data_only=True)
+    # Extend the empty row between main groups 0 and 1 to a gap of 151 empty rows
+    wb["KNX Group Addresses"].insert_rows(22, 150)
+    input_file_path = f"{tmp_path}/empty-rows-gap.xlsx"
+    wb.save(input_file_path)
+
+    cli_args = (
+        f"--input.file {input_file_path} --output.file {tmp_path}/conversion_result.csv "
+        + f"--layout.max-empty-rows {max_empty_rows}"
+    )
+    with caplog.at_level(logging.INFO):
+        cli_result = run_cli(cli_args, capsys)
+    assert cli_result.exit_code == os.EX_OK
+
+    output_lines = read_file(f"{tmp_path}/conversion_result.csv", OUTPUT_ENCODING_DEFAULT).splitlines()
+    assert len([line for line in output_lines if re.search(r'\t"\d+/\d+/\d+"\t', line)]) == expected_ga_count
+    gap_detected = "End of sheet 'KNX Group Addresses' detected after 100 empty rows in row 121" in caplog.text
+    assert gap_detected == (expected_ga_count < 16)
+
+
+@pytest.mark.parametrize(
+    "encoding,encoding_errors,expected_name",
+    [
+        ("iso-8859-1", "transliterate", "T1-1-B - Encoding Error of 'long' minus character: -"),
+        ("ascii", "transliterate", "T1-1-B - Encoding Error of 'long' minus character: -"),
+        ("iso-8859-1", "replace", "T1-1-B - Encoding Error of ?long? minus character: ?"),
+    ],
+)
+def test_ct_encoding_errors_conversion(
+    encoding: str,
+    encoding_errors: str,
+    expected_name: str,
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+) -> None:
+    """Test conversions replacing characters not representable in the output encoding.
+
+    Arguments:
+        encoding: Output file encoding
+        encoding_errors: Handling of characters not representable in the output encoding
+        expected_name: Expected exported name of the group address containing such characters
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    output_csv_path = f"{tmp_path}/conversion_result.csv"
+    cli_args = (
+        f"--input.file tests/inputs/encoding-error.xlsx --output.file {output_csv_path} "
+        + f"--output.encoding {encoding} --output.encoding-errors {encoding_errors}"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    assert f"1 text(s) can not be represented in the output encoding '{encoding}'. Applying '{encoding_errors}'" in (
+        caplog.text
+    )
+    assert f'"{expected_name}"\t"1/0/1"' in read_file(output_csv_path, encoding)
+
+
+def test_ct_cached_conversion(
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+) -> None:
+    """Test incremental conversions using the export cache.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    output_csv_path = f"{tmp_path}/conversion_result.csv"
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {output_csv_path} "
+        + f"--cache.dir {tmp_path}/cache -v"
+    )
+
+    with caplog.at_level(logging.INFO):
+        # Initial conversion
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+        assert "Loading XLSX input file" in caplog.text
+        caplog.clear()
+
+        # Unchanged input, configuration and output
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+        assert re.search(r"Output file .* is up-to-date", caplog.text)
+        assert "Loading XLSX input file" not in caplog.text
+        caplog.clear()
+
+        # Modified output file is re-exported from the cached group addresses
+        with open(output_csv_path, "w", encoding=OUTPUT_ENCODING_DEFAULT) as output_file:
+            output_file.write("modified")
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+        assert "Using 16 cached group addresses" in caplog.text
+        assert "Loading XLSX input file" not in caplog.text
+        caplog.clear()
+
+        # Changed output options reuse the cached group addresses
+        assert run_cli(f"{cli_args} --output.format 3/3", capsys).exit_code == os.EX_OK
+        assert "Using 16 cached group addresses" in caplog.text
+        assert "Loading XLSX input file" not in caplog.text
+        caplog.clear()
+
+        # Unreadable cache files are ignored
+        for cache_file in os.listdir(f"{tmp_path}/cache"):
+            with open(f"{tmp_path}/cache/{cache_file}", "w", encoding="utf-8") as corrupted_file:
+                corrupted_file.write("{")
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+        assert "Loading XLSX input file" in caplog.text
+
+    assert read_file(output_csv_path, OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+@pytest.mark.parametrize("extra_cli_args", ["", "--output.workers 4", "--cache.dir {tmp_path}/cache"])
+def test_ct_output_targets_conversion(
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+    extra_cli_args: str,
+) -> None:
+    """Test the export into multiple output targets from a single parse.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        extra_cli_args: Additional CLI arguments
+    """
+    expected_outputs = {
+        "format_1_1.csv": ("tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT),
+        "format_3_3.csv": ("tests/expected_outputs/KNX-planning-example_format_3_3.csv", OUTPUT_ENCODING_DEFAULT),
+        "comma.csv": ("tests/expected_outputs/KNX-planning-example_format_1_1_separator_comma.csv", "utf-8"),
+        "ga.json": ("tests/expected_outputs/KNX-planning-example.json", "utf-8"),
+        "ga.xml": ("tests/expected_outputs/KNX-planning-example.xml", "utf-8"),
+    }
+    targets = (
+        f'[{{"file": "{tmp_path}/format_1_1.csv"}}, {{"file": "{tmp_path}/format_3_3.csv", "format": "3/3"}}, '
+        + f'{{"file": "{tmp_path}/comma.csv", "separator": "comma", "encoding": "utf-8"}}, '
+        + f'{{"file": "{tmp_path}/ga.json", "format": "json", "encoding": "utf-8"}}, '
+        + f'{{"file": "{tmp_path}/ga.xml", "format": "xml", "encoding": "utf-8"}}]'
+    )
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/unused.csv "
+        + f"--output.targets '{targets}' -v {extra_cli_args.format(tmp_path=tmp_path)}"
+    )
+
+    with caplog.at_level(logging.INFO):
+        assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    assert caplog.text.count("Loading XLSX input file") == 1
+    assert caplog.text.count("Exporting group addresses into file") == len(expected_outputs)
+    assert not os.path.exists(f"{tmp_path}/unused.csv")
+    for output_file, (expected_path, encoding) in expected_outputs.items():
+        assert read_file(f"{tmp_path}/{output_file}", encoding) == read_file(expected_path, encoding)
+
+    if "--cache.dir" in extra_cli_args:
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+        assert caplog.text.count("is up-to-date") == len(expected_outputs)
+        assert "Exporting group addresses" not in caplog.text
+
+
+def test_ct_output_targets_stream(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str
+) -> None:
+    """Test that multiple output targets can not be streamed.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    cli_args = (
+        "--input.file tests/inputs/KNX-planning-example.xlsx --stream "
+        + f'--output.targets \'[{{"file": "{tmp_path}/a.csv"}}, {{"file": "{tmp_path}/b.xml", "format": "xml"}}]\''
+    )
+    assert run_cli(cli_args, capsys).exit_code != os.EX_OK
+    assert "Multiple output targets can not be combined with streaming" in caplog.text
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,189 @@
+"""Test of the diff-aware export."""
+
+import json
+import os
+
+import pytest
+
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from tests.test_conversion import read_file
+from tests.util_runner import run_cli
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "previous_cli_args,previous_file_name",
+    [
+        ("--output.format 1/1", "previous.csv"),
+        ("--output.format 3/3", "previous.csv"),
+        ("--output.format 1/1 --snapshot.file {tmp_path}/previous.json", "previous.json"),
+        ("--output.format 3/3 --snapshot.file {tmp_path}/previous.knxgas", "previous.knxgas"),
+    ],
+)
+def test_ct_diff_conversion(
+    capsys: pytest.CaptureFixture[str], tmp_path: str, previous_cli_args: str, previous_file_name: str
+) -> None:
+    """Test the delta CSV and the change report compared with a previous export or snapshot.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        previous_cli_args: CLI arguments of the previous export
+        previous_file_name: File name of the previous export or snapshot
+    """
+    previous_cli_args = previous_cli_args.format(tmp_path=tmp_path)
+    result = run_cli(
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/previous.csv "
+        + previous_cli_args,
+        capsys,
+    )
+    assert result.exit_code == os.EX_OK
+
+    result = run_cli(
+        "--input.file tests/inputs/KNX-planning-example-modified.xlsx "
+        + f"--output.file {tmp_path}/current.csv --diff.previous {tmp_path}/{previous_file_name} "
+        + f"--diff.delta-file {tmp_path}/delta.csv --diff.report-file {tmp_path}/report.json",
+        capsys,
+    )
+    assert result.exit_code == os.EX_OK
+    assert read_file(f"{tmp_path}/delta.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_delta_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+    with open(f"{tmp_path}/report.json", encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    assert report["summary"] == {"added": 1, "removed": 1, "changed": 4, "renamed": 1}
+    assert [ga["address"] for ga in report["added"]] == ["0/0/4"]
+    assert [ga["address"] for ga in report["removed"]] == ["0/1/5"]
+    assert report["renamed"] == [
+        {
+            "address": "0/0/3",
+            "previous_name": "T1-0-L - Top Floor Bedroom - Wall light (north) - Light & Power Switch",
+            "name": "T1-0-L - Top Floor Bedroom - Wall light (south) - Light & Power Switch",
+        }
+    ]
+    assert {change["address"]: list(change["fields"]) for change in report["changed"]} == {
+        "0/0/3": ["name"],
+        "0/1/3": ["dpt"],
+        "1/4/0": ["middle_name"],
+        "1/4/1": ["middle_name"],
+    }
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        {"current.csv", "delta.csv", "previous.csv", "report.json", previous_file_name}
+    )
+
+
+def test_ct_diff_missing_previous(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str
+) -> None:
+    """Test that all group addresses are reported as added if there is no previous export.
+
+    Arguments:
+        capsys: System capture
+        caplog: Log capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    result = run_cli(
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/current.csv "
+        + f"--diff.previous {tmp_path}/missing.csv --diff.delta-file {tmp_path}/delta.csv",
+        capsys,
+    )
+    assert result.exit_code == os.EX_OK
+    assert "Previous export '" in caplog.text
+    assert read_file(f"{tmp_path}/delta.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        f"{tmp_path}/current.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+@pytest.mark.parametrize(
+    "output_format,expected_delta_path",
+    [
+        ("3/3", "tests/expected_outputs/KNX-planning-example_format_3_3.csv"),
+        ("json", "tests/expected_outputs/KNX-planning-example_format_1_1.csv"),
+        ("xml", "tests/expected_outputs/KNX-planning-example_format_1_1.csv"),
+    ],
+)
+def test_ct_diff_delta_format(
+    capsys: pytest.CaptureFixture[str], tmp_path: str, output_format: str, expected_delta_path: str
+) -> None:
+    """Test that the delta file is written as CSV regardless of the output format.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        output_format: Output format of the current export
+        expected_delta_path: Path of the expected delta CSV
+    """
+    result = run_cli(
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/current "
+        + f"--output.format {output_format} --diff.previous {tmp_path}/missing.csv "
+        + f"--diff.delta-file {tmp_path}/delta.csv",
+        capsys,
+    )
+    assert result.exit_code == os.EX_OK
+    assert read_file(f"{tmp_path}/delta.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        expected_delta_path, OUTPUT_ENCODING_DEFAULT
+    )
+
+
+def test_ct_diff_cached_conversion(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that the delta file and the report are written although the cached output file is current.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/current.csv "
+        + f"--cache.dir {tmp_path}/cache"
+    )
+    assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    result = run_cli(
+        f"{cli_args} --diff.previous {tmp_path}/missing.csv --diff.delta-file {tmp_path}/delta.csv "
+        + f"--diff.report-file {tmp_path}/report.json",
+        capsys,
+    )
+    assert result.exit_code == os.EX_OK
+    assert read_file(f"{tmp_path}/delta.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        f"{tmp_path}/current.csv", OUTPUT_ENCODING_DEFAULT
+    )
+    with open(f"{tmp_path}/report.json", encoding="utf-8") as report_file:
+        assert json.load(report_file)["summary"]["added"] == 16
+
+
+@pytest.mark.parametrize(
+    "extra_cli_args,expected_error",
+    [
+        (
+            "--diff.previous tests/expected_outputs/KNX-planning-example_format_1_1_separator_comma.csv",
+            "Unsupported format of previous export",
+        ),
+        ("--diff.previous {tmp_path}/previous.csv --stream", "can not be combined with streaming"),
+        ("--snapshot.file {tmp_path}/snapshot.json --stream", "can not be combined with streaming"),
+    ],
+)
+def test_ct_invalid_diff_conversion(
+    capsys: pytest.CaptureFixture[str],
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: str,
+    extra_cli_args: str,
+    expected_error: str,
+) -> None:
+    """Test invalid diff-aware exports.
+
+    Arguments:
+        capsys: System capture
+        caplog: Log capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        extra_cli_args: Extra CLI arguments
+        expected_error: Expected error message
+    """
+    result = run_cli(
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/current.csv "
+        + extra_cli_args.format(tmp_path=tmp_path),
+        capsys,
+    )
+    assert result.exit_code != os.EX_OK
+    assert expected_error in caplog.text
+    assert os.listdir(tmp_path) == []
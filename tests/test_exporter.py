@@ -0,0 +1,199 @@
+"""Test of the CSV writer and the output encoding handling."""
+
+import csv
+import io
+import os
+import stat
+from types import SimpleNamespace
+from typing import Iterable
+
+import pytest
+
+from knx_ga_exporter import exporter
+from knx_ga_exporter.encoding import EncodingErrors, find_encoding_issues, transliterate
+from knx_ga_exporter.exporter import CsvWriter, export_group_addresses, output_formats, register_exporter
+from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.grouping import MainGroup
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+def test_ut_csv_writer_batches() -> None:
+    """Test that rows are written in batches and the pending rows on flush."""
+    output = io.BytesIO()
+    writer = CsvWriter(output, "iso-8859-1", ";", csv.QUOTE_ALL, batch_size=2)
+
+    writer.write_row(("a", 1))
+    assert output.getvalue() == b""
+    writer.write_row(("b\nc", 2))
+    assert output.getvalue() == b'"a";"1"\r\n"b\nc";"2"\r\n'
+    writer.write_row(("ä", None))
+    writer.flush()
+    assert output.getvalue() == b'"a";"1"\r\n"b\nc";"2"\r\n' + '"ä";""\r\n'.encode("iso-8859-1")
+
+
+def test_ut_csv_writer_encoding_error() -> None:
+    """Test that an encoding error of a batch reports the offending row and group address."""
+    gas = [GroupAddress(1, 2, sub, "Blinds", "Position", f"Pos\n{sub} –", None, "DPST-5-1", None) for sub in range(3)]
+    writer = CsvWriter(io.BytesIO(), "ascii", ";", csv.QUOTE_ALL, batch_size=10)
+    writer.write_row(("Main", "1/-/-"))
+    writer.write_row(("Middle\nwith line-break", "1/2/-"))
+    for ga in gas:
+        writer.write_row((ga.sub_name.split(" ")[0], f"{ga.main}/{ga.middle}/{ga.sub}"), ga)
+    writer.write_row((gas[2].sub_name, "1/2/2"), gas[2])
+
+    with pytest.raises(ValueError, match=r"(?s)row string: \('Pos\\n2 –', '1/2/2'\)\nKNX group address: 1/2/2 .*'–'"):
+        writer.flush()
+
+
+def test_ut_register_exporter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that registered export functions are selectable as output format.
+
+    Arguments:
+        monkeypatch: Patching of the exporter registry
+    """
+    monkeypatch.setattr(exporter, "_EXPORTERS", dict(exporter._EXPORTERS))
+    exported = []
+
+    @register_exporter("addresses")
+    def export_addresses(_output_config: dict, main_groups: Iterable[MainGroup]) -> int:
+        exported.extend(
+            f"{ga.main}/{ga.middle}/{ga.sub}"
+            for main_group in main_groups
+            for middle_group in main_group.middle_groups
+            for ga in middle_group.group_addresses
+        )
+        return len(exported)
+
+    assert output_formats() == ["1/1", "3/3", "json", "ndjson", "xml", "addresses"]
+    gas = [GroupAddress(1, middle, 0, "Blinds", "Position", "Pos", None, "DPST-5-1", None) for middle in (2, 1)]
+    output_config = SimpleNamespace(
+        file="unused", format="addresses", encoding="utf-8", encoding_errors=EncodingErrors.strict
+    )
+    assert export_group_addresses(output_config, gas) == 2
+    assert exported == ["1/1/0", "1/2/0"]
+
+
+def test_ut_export_xml_numeric_names() -> None:
+    """Test that numeric group and group address names are exported as XML attributes."""
+    gas = [GroupAddress(1, 2, 3, 10, 20, 4711, None, "DPST-1-1", None)]
+    output = io.BytesIO()
+    output_config = SimpleNamespace(file=output, format="xml", encoding="utf-8", encoding_errors=EncodingErrors.strict)
+    assert export_group_addresses(output_config, gas) == 1
+    xml = output.getvalue().decode("utf-8")
+    assert '<GroupRange Name="10" ' in xml
+    assert '<GroupRange Name="20" ' in xml
+    assert '<GroupAddress Name="4711" Address="1/2/3" DPTs="DPST-1-1" />' in xml
+
+
+@pytest.mark.parametrize("output_format", ["json", "xml"])
+def test_ut_export_stream_not_closed_on_error(output_format: str) -> None:
+    """Test that an output stream of the caller is not closed if a text export fails.
+
+    Arguments:
+        output_format: Output format written as text
+    """
+    gas = [GroupAddress(1, 2, 3, "Main", "Middle", "Sub –", None, "DPST-1-1", None)]
+    output = io.BytesIO()
+    output_config = SimpleNamespace(
+        file=output, format=output_format, encoding="ascii", encoding_errors=EncodingErrors.strict
+    )
+    with pytest.raises(UnicodeEncodeError):
+        export_group_addresses(output_config, gas, stream=True)
+    assert not output.closed
+
+
+def test_ut_encoding_issues_per_group() -> None:
+    """Test that a group name which can not be encoded is reported once per group."""
+    gas = [
+        GroupAddress(1, 0, 0, "Main –", "Middle", "Sub 1", None, "DPST-1-1", None),
+        GroupAddress(1, 0, 1, "Main –", "Middle", "Sub 2 –", None, "DPST-1-1", None),
+        GroupAddress(1, 1, 0, "Main –", "Middle 2 –", "Sub", None, "DPST-1-1", None),
+        GroupAddress(1, 1, 1, "Main –", "Middle 2 –", "Sub", None, "DPST-1-1", None),
+        GroupAddress(2, 1, 0, "Main 2", "Middle 2 –", "Sub", None, "DPST-1-1", None),
+    ]
+    assert find_encoding_issues(gas, "ascii") == [
+        "1: main group name 'Main –' contains '–'",
+        "1/0/1: sub group name 'Sub 2 –' contains '–'",
+        "1/1: middle group name 'Middle 2 –' contains '–'",
+        "2/1: middle group name 'Middle 2 –' contains '–'",
+    ]
+
+
+def test_ut_open_atomic_concurrent_writers(tmp_path: str) -> None:
+    """Test that concurrent writers of the same file do not clobber each other's temporary file.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    path = f"{tmp_path}/ga.csv"
+    with exporter._open_atomic(path) as first_file:  # pylint: disable=protected-access
+        first_file.write(b"first")
+        with exporter._open_atomic(path) as second_file:  # pylint: disable=protected-access
+            second_file.write(b"second")
+        with open(path, "rb") as written_file:
+            assert written_file.read() == b"second"
+    with open(path, "rb") as written_file:
+        assert written_file.read() == b"first"
+    assert os.listdir(tmp_path) == ["ga.csv"]
+
+
+def test_ut_open_atomic_permissions(tmp_path: str) -> None:
+    """Test that the permissions of a replaced file are kept and new files get the default permissions.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    path = f"{tmp_path}/ga.csv"
+    with exporter._open_atomic(path) as file:  # pylint: disable=protected-access
+        file.write(b"new")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    with exporter._open_atomic(path) as file:  # pylint: disable=protected-access
+        file.write(b"replaced")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_ut_open_atomic_error(tmp_path: str) -> None:
+    """Test that a failed write leaves the file unmodified and removes the temporary file.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+
+    Raises:
+        RuntimeError: Simulated write error
+    """
+    path = f"{tmp_path}/ga.csv"
+    with open(path, "wb") as file:
+        file.write(b"previous")
+    with pytest.raises(RuntimeError, match="failed"):
+        with exporter._open_atomic(path) as file:  # pylint: disable=protected-access
+            file.write(b"partial")
+            raise RuntimeError("failed")
+    with open(path, "rb") as file:
+        assert file.read() == b"previous"
+    assert os.listdir(tmp_path) == ["ga.csv"]
+
+
+@pytest.mark.parametrize(
+    "character,encoding,expected",
+    [
+        ("č", "iso-8859-1", "c"),
+        ("ä", "ascii", "ae"),
+        ("€", "iso-8859-1", "EUR"),
+        ("＂", "ascii", "'"),
+        ("☃", "ascii", "?"),
+    ],
+)
+def test_ut_transliterate(character: str, encoding: str, expected: str) -> None:
+    """Test the transliteration of characters not representable in an encoding.
+
+    Arguments:
+        character: Transliterated character
+        encoding: Output encoding
+        expected: Expected transliteration
+    """
+    assert transliterate(character, encoding) == expected
@@ -0,0 +1,124 @@
+"""Test of the group address filters of partial exports."""
+
+import csv
+import os
+
+import pytest
+
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from tests.util_runner import run_cli
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+
+def read_exported_addresses(path: str) -> list[str]:
+    """Read the addresses of all group addresses exported into a CSV file in format 1/1.
+
+    Arguments:
+        path: Path of the CSV file
+
+    Returns:
+        Group addresses without main and middle groups.
+    """
+    with open(path, encoding=OUTPUT_ENCODING_DEFAULT, newline="") as csv_file:
+        return [row[1] for row in list(csv.reader(csv_file, delimiter="\t"))[1:] if not row[1].endswith("/-")]
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("input_kind", ["workbook", "workers", "stream", "snapshot"])
+@pytest.mark.parametrize(
+    "filter_cli_args,expected_addresses",
+    [
+        ("--filter.address 1/0-1", ["1/0/0", "1/0/1", "1/1/0", "1/1/1"]),
+        ("--filter.address '0/1, 1/4'", ["0/1/1", "0/1/2", "0/1/3", "0/1/5", "1/4/0", "1/4/1"]),
+        ("--filter.name '*top floor bedroom*status*'", ["0/1/3", "1/4/1"]),
+        ("--filter.name 'B0-*'", ["0/0/1", "0/1/1", "1/0/0", "1/1/0", "1/2/0", "1/4/0"]),
+        ("--filter.dpt 'DPST-5-*, DPST-1-8'", ["1/0/0", "1/0/1", "1/2/0", "1/2/1", "1/4/0", "1/4/1"]),
+        ("--filter.address 1 --filter.dpt DPST-1-1 --filter.name 'T*'", ["1/1/1"]),
+        ("--filter.address 2-31", []),
+    ],
+)
+def test_ct_filtered_conversion(
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: str,
+    input_kind: str,
+    filter_cli_args: str,
+    expected_addresses: list[str],
+) -> None:
+    """Test partial exports of the group addresses selected by filters.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        input_kind: Parsed workbook with or without worker processes, streamed workbook or snapshot.
+        filter_cli_args: CLI arguments of the filters
+        expected_addresses: Expected exported group addresses
+    """
+    input_file = "tests/inputs/KNX-planning-example.xlsx"
+    extra_cli_args = {"workbook": "", "workers": "--input.workers 2", "stream": "--stream", "snapshot": ""}[input_kind]
+    if input_kind == "snapshot":
+        input_file = f"{tmp_path}/snapshot.knxgas"
+        run_cli(
+            "--input.file tests/inputs/KNX-planning-example.xlsx "
+            + f"--output.file {tmp_path}/full.csv --snapshot.file {input_file}",
+            capsys,
+        )
+    output_csv_path = f"{tmp_path}/conversion_result.csv"
+
+    cli_result = run_cli(
+        f"--input.file {input_file} --output.file {output_csv_path} {filter_cli_args} {extra_cli_args}", capsys
+    )
+    assert cli_result.exit_code == os.EX_OK
+    assert read_exported_addresses(output_csv_path) == expected_addresses
+
+
+def test_ct_filtered_invalid_rows(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that invalid rows outside of the selected address range are not validated.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    cli_args = f"--input.file tests/inputs/validation-errors.xlsx --output.file {tmp_path}/result.csv"
+    assert run_cli(cli_args, capsys).exit_code != os.EX_OK
+    assert run_cli(f"{cli_args} --filter.dpt DPT-0", capsys).exit_code == os.EX_OK
+
+
+@pytest.mark.parametrize("address", ["1/2/3", "a", "1-", "0/"])
+def test_ct_invalid_filter(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str, address: str
+) -> None:
+    """Test invalid address ranges.
+
+    Arguments:
+        capsys: System capture
+        caplog: Log capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        address: Invalid address range
+    """
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/result.csv "
+        + f"--filter.address '{address}'"
+    )
+    assert run_cli(cli_args, capsys).exit_code != os.EX_OK
+    assert f"Invalid address range '{address}' of --filter.address" in caplog.text
+
+
+def test_ct_filtered_cached_conversion(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that the cached group addresses of partial exports are not reused for other filters.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    output_csv_path = f"{tmp_path}/conversion_result.csv"
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {output_csv_path} "
+        + f"--cache.dir {tmp_path}/cache"
+    )
+    assert run_cli(f"{cli_args} --filter.address 1/4", capsys).exit_code == os.EX_OK
+    assert read_exported_addresses(output_csv_path) == ["1/4/0", "1/4/1"]
+    assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    assert len(read_exported_addresses(output_csv_path)) == 16
@@ -0,0 +1,38 @@
+"""Test of the KNX group address representation."""
+
+import pytest
+
+from knx_ga_exporter.group_address import GroupAddress
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+def test_ut_group_address_compact() -> None:
+    """Test that address parts are converted to integers and group names are shared."""
+    ga = GroupAddress("1", 2.0, 3, "Blinds", "Position", "Pos", None, "DPST-5-1", None)
+    other_ga = GroupAddress(1, 2, 4, "".join(["Bli", "nds"]), "Position", "Pos", None, "DPST-5-1", None)
+
+    assert (ga.main, ga.middle, ga.sub) == (1, 2, 3)
+    assert ga.main_name is other_ga.main_name
+    assert not hasattr(ga, "__dict__")
+    assert ga == GroupAddress(1, 2, 3, "Blinds", "Position", "Pos", None, "DPST-5-1", None)
+    assert ga != other_ga
+    assert ga != "1/2/3"
+    assert repr(ga).startswith("GroupAddress(main=1, middle=2, sub=3, main_name='Blinds'")
+
+
+@pytest.mark.parametrize("sub", ["1a", 1.5, "", [1]])
+def test_ut_group_address_invalid_address(sub: object) -> None:
+    """Test that non-integer address parts are rejected.
+
+    Arguments:
+        sub: Invalid sub group ID
+    """
+    with pytest.raises(ValueError, match="Invalid sub group ID .* of KNX group address detected: 1/2/"):
+        GroupAddress(1, 2, sub, "Blinds", "Position", "Pos", None, "DPST-5-1", None)
+
+
+def test_ut_group_address_incomplete() -> None:
+    """Test that group addresses with missing mandatory attributes are rejected."""
+    with pytest.raises(ValueError, match="Incomplete KNX group address detected: 1/2/3 .* None"):
+        GroupAddress(1, 2, 3, "Blinds", "Position", "Pos", None, None, None)
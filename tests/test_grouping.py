@@ -0,0 +1,59 @@
+"""Test of the hierarchical group address grouping."""
+
+import pytest
+
+from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.grouping import build_group_index, stream_group_index
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+def test_ut_group_index_sorted() -> None:
+    """Test that unsorted group addresses are grouped and ordered by main, middle and sub ID."""
+    gas = [
+        GroupAddress(1, 2, 3, "Blinds", "Position", "Pos", None, "DPST-5-1", None),
+        GroupAddress(0, 1, 2, "Light", "Status", "Status 2", None, "DPST-1-1", None),
+        GroupAddress(1, 0, 1, "Blinds", "Up/Down", "Up", None, "DPST-1-8", None),
+        GroupAddress(0, 1, 1, "Light", "Status", "Status 1", None, "DPST-1-1", None),
+        GroupAddress(0, 0, 1, "Light", "Switch", "Switch 1", None, "DPST-1-1", None),
+    ]
+
+    main_groups = build_group_index(gas)
+
+    assert [(main.id, main.name) for main in main_groups] == [(0, "Light"), (1, "Blinds")]
+    assert [(middle.id, middle.name) for middle in main_groups[0].middle_groups] == [(0, "Switch"), (1, "Status")]
+    assert [(middle.id, middle.name) for middle in main_groups[1].middle_groups] == [(0, "Up/Down"), (2, "Position")]
+    assert [ga.sub_name for ga in main_groups[0].middle_groups[1].group_addresses] == ["Status 1", "Status 2"]
+
+
+def test_ut_stream_group_index() -> None:
+    """Test lazy grouping of group addresses sorted by address."""
+    gas = [
+        GroupAddress(0, 0, 1, "Light", "Switch", "Switch 1", None, "DPST-1-1", None),
+        GroupAddress(0, 1, 1, "Light", "Status", "Status 1", None, "DPST-1-1", None),
+        GroupAddress(0, 1, 2, "Light", "Status", "Status 2", None, "DPST-1-1", None),
+        GroupAddress(1, 0, 1, "Blinds", "Up/Down", "Up", None, "DPST-1-8", None),
+    ]
+
+    grouped = [
+        (main.id, main.name, [(middle.id, middle.name, list(middle.group_addresses)) for middle in main.middle_groups])
+        for main in stream_group_index(iter(gas))
+    ]
+
+    assert grouped == [
+        (0, "Light", [(0, "Switch", gas[0:1]), (1, "Status", gas[1:3])]),
+        (1, "Blinds", [(0, "Up/Down", gas[3:4])]),
+    ]
+
+
+def test_ut_stream_group_index_unsorted() -> None:
+    """Test that unsorted group addresses are rejected by the lazy grouping."""
+    gas = [
+        GroupAddress(0, 1, 1, "Light", "Status", "Status 1", None, "DPST-1-1", None),
+        GroupAddress(0, 0, 1, "Light", "Switch", "Switch 1", None, "DPST-1-1", None),
+    ]
+
+    with pytest.raises(ValueError, match=r"sorted by address: 0/0/1.*follows 0/1/1"):
+        for main in stream_group_index(gas):
+            for middle in main.middle_groups:
+                list(middle.group_addresses)
@@ -0,0 +1,283 @@
+"""Test of the logging infrastructure."""
+
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+import pytest
+
+from knx_ga_exporter import logging as knx_logging
+from knx_ga_exporter.argparse import parse_config
+from knx_ga_exporter.conversion import convert
+from knx_ga_exporter.logging import JsonFormatter, LogFormat, configure_logging, stop_logging
+from tests.util_runner import run_cli
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+
+@contextmanager
+def isolated_root_logger() -> Generator[logging.Logger, None, None]:
+    """Remove the handlers of pytest from the root logger, so the CLI configures its own log pipeline.
+
+    Yields:
+        Root logger
+    """
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers
+    level = root_logger.level
+    root_logger.handlers = []
+    try:
+        yield root_logger
+    finally:
+        stop_logging()
+        root_logger.handlers = handlers
+        root_logger.setLevel(level)
+
+
+class SlowHandler(logging.Handler):
+    """Handler simulating a slow console: Writing a record blocks for 5 ms."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format and write a record.
+
+        Arguments:
+            record: Log record
+        """
+        self.format(record)
+        time.sleep(0.005)
+
+
+def conversion_duration(config: dict) -> float:
+    """Measure the fastest of three conversions.
+
+    Arguments:
+        config: Config hierarchy
+
+    Returns:
+        Duration in seconds
+    """
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        convert(config)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("output_format", ["1/1", "3/3"])
+def test_ct_trace_file(
+    output_format: str, capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str
+) -> None:
+    """Test that the trace file receives all DEBUG messages incl. structured fields while the console stays quiet.
+
+    Arguments:
+        output_format: Exported output format
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    trace_path = f"{tmp_path}/trace.jsonl"
+    root_level = logging.getLogger().level
+    with caplog.at_level(logging.WARNING):
+        cli_result = run_cli(
+            "--input.file tests/inputs/KNX-planning-example.xlsx "
+            + f"--output.file {tmp_path}/conversion_result.csv --output.format {output_format} "
+            + f"--log.trace-file {trace_path}",
+            capsys,
+        )
+    assert cli_result.exit_code == os.EX_OK
+    assert logging.getLogger().level == root_level
+    assert not caplog.text
+
+    with open(trace_path, encoding="utf-8") as trace_file:
+        records = [json.loads(line) for line in trace_file]
+    parsed = [record for record in records if record["message"].startswith("Parsed GA")]
+    exported = [record for record in records if "sub group" in record["message"]]
+    assert len(parsed) == len(exported) == 16
+    assert parsed[0]["level"] == "DEBUG"
+    assert parsed[0]["row"] == 10
+    assert parsed[0]["ga"] == "0/0/1"
+    assert exported[-1]["ga"] == "1/4/1"
+    assert any(record["message"].startswith("Loading XLSX input file") for record in records)
+
+
+@pytest.mark.parametrize("output_format", ["1/1", "3/3"])
+def test_ct_debug_disabled(
+    output_format: str, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, tmp_path: str
+) -> None:
+    """Test that the parser and exporter loops skip the debug logging entirely if DEBUG is disabled.
+
+    Arguments:
+        output_format: Exported output format
+        capsys: System capture
+        monkeypatch: Patching of the debug logging
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    debug_calls = []
+    monkeypatch.setattr(logging, "debug", lambda *args, **_kwargs: debug_calls.append(args))
+    cli_result = run_cli(
+        "--input.file tests/inputs/KNX-planning-example.xlsx "
+        + f"--output.file {tmp_path}/conversion_result.csv --output.format {output_format} -v",
+        capsys,
+    )
+    assert cli_result.exit_code == os.EX_OK
+    assert not [args for args in debug_calls if args[0].startswith(("Parsed GA", "Exporting"))]
+
+
+def test_ut_json_formatter() -> None:
+    """Test the JSON formatting of log records incl. structured fields and exceptions."""
+    exc_info = (ValueError, ValueError("Invalid value"), None)
+    record = logging.makeLogRecord(
+        {"msg": "Parsed GA: %s", "args": ("1/2/3",), "levelname": "ERROR", "exc_info": exc_info, "row": 7}
+    )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Parsed GA: 1/2/3"
+    assert entry["row"] == 7
+    assert "ValueError: Invalid value" in entry["exception"]
+    assert {"time", "level", "message", "row", "exception"} == set(entry)
+
+
+@pytest.mark.parametrize("log_format", ["text", "json"])
+def test_ct_log_file(log_format: str, capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test logging into a file in text and JSON format.
+
+    Arguments:
+        log_format: Format of the log messages
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    log_path = f"{tmp_path}/conversion.log"
+    with isolated_root_logger():
+        cli_result = run_cli(
+            "--input.file tests/inputs/KNX-planning-example.xlsx "
+            + f"--output.file {tmp_path}/conversion_result.csv -vv --log.format {log_format} --log.file {log_path}",
+            capsys,
+        )
+    assert cli_result.exit_code == os.EX_OK
+    assert not cli_result.stderr
+
+    with open(log_path, encoding="utf-8") as log_file:
+        log_lines = log_file.read().splitlines()
+    if log_format == "text":
+        assert re.match(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d INFO: Loading XLSX input file", log_lines[0])
+        assert sum(1 for line in log_lines if " DEBUG: Parsed GA: " in line) == 16
+        assert log_lines[-1].endswith("INFO: Conversion successfully finished.")
+    else:
+        records = [json.loads(line) for line in log_lines]
+        parsed = [record for record in records if record["message"].startswith("Parsed GA")]
+        assert len(parsed) == 16
+        assert {"time": parsed[0]["time"], "level": "DEBUG", "row": 10, "ga": "0/0/1", "stage": "parse"} == {
+            key: value for key, value in parsed[0].items() if key != "message"
+        }
+        assert {record.get("stage") for record in records if "sub group" in record["message"]} == {"export"}
+        assert records[-1]["message"] == "Conversion successfully finished."
+        assert "stage" not in records[-1]
+
+
+def test_ct_log_stderr(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that all log messages are written to stderr before the CLI returns.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    with isolated_root_logger():
+        cli_result = run_cli(
+            f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/conversion_result.csv -v",
+            capsys,
+        )
+    assert cli_result.exit_code == os.EX_OK
+    assert "INFO: Loading XLSX input file" in cli_result.stderr
+    assert cli_result.stderr.endswith("INFO: Conversion successfully finished.")
+    assert "DEBUG" not in cli_result.stderr
+
+
+def test_ct_batch_log_file(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that the log records of the batch worker processes are written by the main process.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    manifest_path = f"{tmp_path}/manifest.json"
+    log_path = f"{tmp_path}/batch.log"
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(
+            {
+                "jobs": [
+                    {"input": {"file": "tests/inputs/KNX-planning-example.xlsx"}, "output": {"file": output_file}}
+                    for output_file in (f"{tmp_path}/first.csv", f"{tmp_path}/second.csv")
+                ]
+            },
+            manifest_file,
+        )
+    with isolated_root_logger():
+        cli_result = run_cli(f"batch {manifest_path} --workers 2 -vv --log.format json --log.file {log_path}", capsys)
+    assert cli_result.exit_code == os.EX_OK
+
+    with open(log_path, encoding="utf-8") as log_file:
+        records = [json.loads(line) for line in log_file]
+    assert records[0]["message"] == "Running 2 batch jobs with 2 workers"
+    assert sum(1 for record in records if record["message"].startswith("Parsed GA")) == 32
+    assert sum(1 for record in records if record.get("stage") == "export" and "ga" in record) == 32
+
+
+def test_ct_debug_throughput(tmp_path: str) -> None:
+    """Test that a slow log output does not slow down conversions with DEBUG messages.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    config = parse_config(
+        prog="knx-ga-exporter",
+        version="0.0.0",
+        copy_right="",
+        author="",
+        arg_list=["-i", "tests/inputs/KNX-planning-example.xlsx", "-o", f"{tmp_path}/conversion_result.csv"],
+    )
+    with isolated_root_logger() as root_logger:
+        root_logger.setLevel(logging.WARNING)
+        convert(config)
+        duration = conversion_duration(config)
+
+        # DEBUG messages written synchronously
+        root_logger.handlers = [SlowHandler()]
+        root_logger.setLevel(logging.DEBUG)
+        sync_duration = conversion_duration(config)
+
+        # DEBUG messages written by the background thread
+        root_logger.handlers = [knx_logging._QueueHandler(SlowHandler())]  # pylint: disable=protected-access
+        debug_duration = conversion_duration(config)
+
+    # About 50 messages per conversion, i.e. the synchronous output adds 250 ms
+    assert sync_duration - duration > 0.2
+    assert debug_duration - duration < (sync_duration - duration) / 4
+
+
+def test_ut_configure_logging(tmp_path: str) -> None:
+    """Test the log-level and the filtering of the log pipeline.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    log_path = f"{tmp_path}/warnings.log"
+    with isolated_root_logger() as root_logger:
+        configure_logging(0, LogFormat.json, log_path)
+        assert root_logger.level == logging.WARNING
+        root_logger.handlers[0].addFilter(lambda record: "ignored" not in record.getMessage())
+        logging.info("Not logged")
+        logging.warning("Warning %s", "ignored")
+        logging.warning("Warning %s", str(LogFormat.json), extra={"ga": "1/2/3"})
+        stop_logging()
+
+    with open(log_path, encoding="utf-8") as log_file:
+        records = [json.loads(line) for line in log_file]
+    assert [(record["message"], record["ga"]) for record in records] == [("Warning json", "1/2/3")]
@@ -0,0 +1,112 @@
+"""Test of the profiling and per-stage timing report."""
+
+import json
+import os
+import pstats
+import re
+
+import pytest
+
+from tests.util_runner import run_cli
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "extra_cli_args,expected_stages",
+    [
+        ("", ["load workbook", "parse", "export"]),
+        ("--stream", ["load workbook", "parse + export"]),
+        ("--layout.sheet-name 'Wing [AB]' --input.workers 2", ["load workbook", "parse", "export"]),
+    ],
+)
+def test_ct_timings_json(
+    extra_cli_args: str, expected_stages: list[str], capsys: pytest.CaptureFixture[str], tmp_path: str
+) -> None:
+    """Test the JSON stage timing report.
+
+    Arguments:
+        extra_cli_args: Additional CLI arguments
+        expected_stages: Expected names of the reported stages
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    input_file = "multi-sheet.xlsx" if "sheet-name" in extra_cli_args else "KNX-planning-example.xlsx"
+    cli_result = run_cli(
+        f"--input.file tests/inputs/{input_file} --output.file {tmp_path}/result.csv --timings json {extra_cli_args}",
+        capsys,
+    )
+    assert cli_result.exit_code == os.EX_OK
+
+    report = json.loads(cli_result.stdout)
+    stages = {stats["name"]: stats for stats in report["stages"]}
+    assert list(stages) == expected_stages
+    parse_stats = stages[expected_stages[1]]
+    assert parse_stats["ga_count"] == 16
+    assert parse_stats["rows_scanned"] > parse_stats["rows_skipped"] > 0
+    assert all(stats["duration"] >= 0.0 and stats["peak_rss"] > 0 for stats in report["stages"])
+    assert report["total_duration"] == pytest.approx(sum(stats["duration"] for stats in report["stages"]))
+
+
+def test_ct_timings_text_and_profile(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test the human readable stage timing report and the cProfile dump.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    profile_path = f"{tmp_path}/conversion.prof"
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/result.csv "
+        + f"--cache.dir {tmp_path}/cache --timings text --profile {profile_path}"
+    )
+    cli_result = run_cli(cli_args, capsys)
+    assert cli_result.exit_code == os.EX_OK
+
+    assert re.match(r"Stage +\| +Duration \| +Rows \| +Skipped \| +#GA \| +Peak RSS", cli_result.stdout_lines[0])
+    assert re.match(r"cache check +\| +[\d.]+ s \| +- \| +- \| +- \| +[\d.]+ MiB", cli_result.stdout_lines[1])
+    assert re.match(r"parse +\| +[\d.]+ s \| +\d+ \| +\d+ \| +16 \|", cli_result.stdout_lines[4])
+    assert re.match(r"total +\| +[\d.]+ s \|", cli_result.stdout_lines[-1])
+
+    stats = pstats.Stats(profile_path)
+    assert any(function_name == "convert" for _, _, function_name in stats.stats)
+
+    # Up-to-date output reports the cache check only
+    cli_result = run_cli(cli_args, capsys)
+    assert cli_result.exit_code == os.EX_OK
+    assert [line.split(" |")[0].strip() for line in cli_result.stdout_lines[1:]] == ["cache check", "total"]
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "xml"])
+@pytest.mark.parametrize(
+    "max_empty_rows,expected_rows_scanned,expected_ga_count",
+    [(0, 271, 16), (100, 123, 16), (2, 25, 16), (1, 2, 0)],
+)
+def test_ct_end_of_data_detection(
+    engine: str,
+    max_empty_rows: int,
+    expected_rows_scanned: int,
+    expected_ga_count: int,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: str,
+) -> None:
+    """Test that reading a sheet stops after a run of empty rows.
+
+    Arguments:
+        engine: Reader engine
+        max_empty_rows: Number of consecutive empty rows marking the end of data
+        expected_rows_scanned: Expected number of read rows
+        expected_ga_count: Expected number of group addresses
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    cli_result = run_cli(
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/result.csv --timings json "
+        + f"--input.engine {engine} --layout.max-empty-rows {max_empty_rows}",
+        capsys,
+    )
+    assert cli_result.exit_code == os.EX_OK
+
+    parse_stats = {stats["name"]: stats for stats in json.loads(cli_result.stdout)["stages"]}["parse"]
+    assert parse_stats["rows_scanned"] == expected_rows_scanned
+    assert parse_stats["ga_count"] == expected_ga_count
@@ -0,0 +1,194 @@
+"""Test of the workbook reader backends."""
+
+import zipfile
+from datetime import datetime
+from typing import Iterator, Sequence
+
+import pytest
+
+from knx_ga_exporter.argparse import build_config
+from knx_ga_exporter.parser import parse_group_addresses
+from knx_ga_exporter.reader import InputEngine, WorkbookReader, _unescape, open_workbook
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+_OFFICE_DOC = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_CONTENT_TYPES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="{_OFFICE_DOC}.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{_OFFICE_DOC}.worksheet+xml"/>
+<Override PartName="/xl/sharedStrings.xml" ContentType="{_OFFICE_DOC}.sharedStrings+xml"/>
+</Types>"""
+
+_ROOT_RELS = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="{_REL_TYPE}/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = f"""<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="{_REL_TYPE}">
+<sheets><sheet name="GAs" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = f"""<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="{_REL_TYPE}/worksheet" Target="/xl/worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="{_REL_TYPE}/sharedStrings" Target="sharedStrings.xml"/>
+</Relationships>"""
+
+_SHARED_STRINGS = """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="3" uniqueCount="3">
+<si><t>Plain</t></si>
+<si><r><t>Rich </t></r><r><t>text</t></r><rPh sb="0" eb="1"><t>phonetic</t></rPh></si>
+<si><t>Line_x000D_break_x0009_tab_x005f_</t></si>
+</sst>"""
+
+_SHEET = """<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="E1" t="s"><v>2</v></c></row>
+<row r="2"><c r="A2"><v>1</v></c><c r="B2"><v>2.5</v></c><c r="C2"><v>1E2</v></c><c r="D2" t="b"><v>1</v></c></row>
+<row r="4"><c r="A4" t="s"><v>1</v></c>
+<c r="B4" t="inlineStr"><is><t>Inline</t><rPh sb="0" eb="1"><t>x</t></rPh></is></c>
+<c r="C4" t="str"><f>A1</f><v>Formula</v></c><c r="D4" t="d"><v>2024-01-02T03:04:05</v></c></row>
+<row><c><v>7</v></c><c><v></v></c><c t="inlineStr"/><c><v>9</v></c><c><v>99</v></c></row>
+</sheetData>
+</worksheet>"""
+
+
+def write_xlsx(path: str) -> None:
+    """Write a minimal XLSX file covering different cell types.
+
+    Arguments:
+        path: Path of the written file
+    """
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        archive.writestr("xl/sharedStrings.xml", _SHARED_STRINGS)
+        archive.writestr("xl/worksheets/sheet1.xml", _SHEET)
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("engine", [InputEngine.openpyxl, InputEngine.xml])
+def test_ut_reader_cell_values(engine: InputEngine, tmp_path: str) -> None:
+    """Test that all reader engines provide the same plain cell values.
+
+    Arguments:
+        engine: Reader engine
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    path = f"{tmp_path}/cell-types.xlsx"
+    write_xlsx(path)
+
+    reader = open_workbook(path, engine)
+
+    assert reader.sheet_names == ["GAs"]
+    assert list(reader.iter_rows("GAs", min_row=2, columns=[3, 0, 1, 2])) == [
+        (True, 1, 2.5, 100.0),
+        (None, None, None, None),
+        (datetime(2024, 1, 2, 3, 4, 5), "Rich text", "Inline", "Formula"),
+        (9, 7, None, None),
+    ]
+
+
+@pytest.mark.parametrize("engine", [InputEngine.openpyxl, InputEngine.xml])
+def test_ut_reader_escaped_characters(engine: InputEngine, tmp_path: str) -> None:
+    """Test that all reader engines decode the escaped characters of shared strings.
+
+    Arguments:
+        engine: Reader engine
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    path = f"{tmp_path}/cell-types.xlsx"
+    write_xlsx(path)
+
+    reader = open_workbook(path, engine)
+
+    assert list(reader.iter_rows("GAs", min_row=1, columns=[4]))[0] == ("Line\rbreak\ttab_",)
+
+
+@pytest.mark.parametrize(
+    "text,expected_text",
+    [
+        ("Light x005F_ switch", "Light x005F_ switch"),
+        ("_x005F_x000D_", "_x000D_"),
+        ("_x000d__x0041_", "\rA"),
+        ("_xZZZZ_", "_xZZZZ_"),
+    ],
+)
+def test_ut_unescape(text: str, expected_text: str) -> None:
+    """Test decoding of escaped characters, including escaped literals and texts looking similar.
+
+    Arguments:
+        text: Text as stored in the XML
+        expected_text: Decoded text
+    """
+    assert _unescape(text) == expected_text
+
+
+@pytest.mark.parametrize("engine", [InputEngine.openpyxl, InputEngine.xml])
+def test_ut_reader_unknown_sheet(engine: InputEngine) -> None:
+    """Test that reading an unknown sheet fails.
+
+    Arguments:
+        engine: Reader engine
+    """
+    reader = open_workbook("tests/inputs/KNX-planning-example.xlsx", engine)
+
+    with pytest.raises(KeyError, match="Worksheet Unknown does not exist"):
+        list(reader.iter_rows("Unknown", min_row=1, columns=[0]))
+
+
+class ListReader(WorkbookReader):
+    """Reader returning the rows of a sheet as a plain list iterator instead of a generator."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        """Constructor.
+
+        Arguments:
+            rows: Rows of the sheet
+        """
+        self.rows = rows
+
+    @property
+    def sheet_names(self) -> list[str]:
+        """Names of all sheets contained in the workbook.
+
+        Returns:
+            Sheet names
+        """
+        return ["Sheet"]
+
+    def iter_rows(self, sheet_name: str, min_row: int, columns: Sequence[int]) -> Iterator[tuple]:  # noqa: ARG002
+        """Iterate the rows of a sheet.
+
+        Arguments:
+            sheet_name: Name of the sheet
+            min_row: First row, 1-based
+            columns: Read columns
+
+        Returns:
+            Iterator of the rows
+        """
+        return iter(self.rows[min_row - 1 :])
+
+
+def test_ut_parser_reader_without_close() -> None:
+    """Test that the end of a sheet is detected with readers returning iterators without close()."""
+    config = build_config({"input": {"file": "unused.xlsx"}, "layout": {"first_row": 1, "max_empty_rows": 1}})
+    # Columns in order of the parser.LAYOUT_COLUMNS
+    ga_row = ("Target", 1, 2, 3, "Main", "Middle", "Sub", "DPST-1-1", "Comment")
+    reader = ListReader([ga_row, (None,) * 9, ga_row])
+
+    gas = parse_group_addresses(reader, config.layout, "Sheet")
+
+    assert [(ga.main, ga.middle, ga.sub) for ga in gas] == [(1, 2, 3)]
@@ -0,0 +1,314 @@
+"""Test of the HTTP conversion server."""
+
+import asyncio
+import http.client
+import json
+import os
+import re
+import socket
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+import pytest
+
+from knx_ga_exporter import serve
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT, parse_serve_config
+from knx_ga_exporter.serve import ConversionServer, ServerMetrics, _query_options
+from tests.test_api import decode, read_workbook
+from tests.test_conversion import read_file
+from tests.util_runner import run_cli
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+
+@asynccontextmanager
+async def running_server(**kwargs: int) -> AsyncGenerator[ConversionServer, None]:
+    """Run a conversion server on a free port of localhost.
+
+    Arguments:
+        kwargs: Options of the server
+
+    Yields:
+        Started conversion server
+    """
+    server = ConversionServer(**kwargs)
+    await server.start()
+    serve_task = asyncio.ensure_future(server.serve_forever())
+    try:
+        yield server
+    finally:
+        serve_task.cancel()
+        await server.close()
+
+
+def http_request(
+    port: int, method: str, path: str, body: Optional[bytes] = None
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    """Send a request to the server.
+
+    Arguments:
+        port: Port of the server
+        method: Request method
+        path: Request path incl. query
+        body: Optional request body
+
+    Returns:
+        Status, headers and body of the response.
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, response.headers, response.read()
+    finally:
+        connection.close()
+
+
+def raw_request(port: int, data: bytes) -> bytes:
+    """Send raw request data to the server, closing the sending side afterwards.
+
+    Arguments:
+        port: Port of the server
+        data: Request data
+
+    Returns:
+        Raw response data
+    """
+    with socket.create_connection(("127.0.0.1", port), timeout=60) as connection:
+        connection.sendall(data)
+        connection.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := connection.recv(4096):
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+async def get_metrics(server: ConversionServer) -> dict:
+    """Request the metrics of the server.
+
+    Arguments:
+        server: Conversion server
+
+    Returns:
+        Metrics report
+    """
+    status, _, body = await asyncio.to_thread(http_request, server.port, "GET", "/metrics")
+    assert status == 200
+    return json.loads(body)
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "query,input_file_path,expected_path,expected_encoding,expected_media_type",
+    [
+        (
+            "",
+            "tests/inputs/KNX-planning-example.xlsx",
+            "tests/expected_outputs/KNX-planning-example_format_1_1.csv",
+            OUTPUT_ENCODING_DEFAULT,
+            "text/csv; charset=iso-8859-1",
+        ),
+        (
+            "?output.format=3/3&input.engine=xml",
+            "tests/inputs/KNX-planning-example.xlsx",
+            "tests/expected_outputs/KNX-planning-example_format_3_3.csv",
+            OUTPUT_ENCODING_DEFAULT,
+            "text/csv; charset=iso-8859-1",
+        ),
+        (
+            "?output.format=json&output.encoding=utf-8",
+            "tests/inputs/KNX-planning-example.xlsx",
+            "tests/expected_outputs/KNX-planning-example.json",
+            "utf-8",
+            "application/json; charset=utf-8",
+        ),
+        (
+            "?output.format=xml&output.encoding=utf-8&layout.sheet-name=%5B%22Wing%20A%22,%22Wing%20B%22%5D&stream=true",
+            "tests/inputs/multi-sheet.xlsx",
+            "tests/expected_outputs/KNX-planning-example.xml",
+            "utf-8",
+            "application/xml; charset=utf-8",
+        ),
+    ],
+)
+def test_ct_serve_conversion(
+    query: str, input_file_path: str, expected_path: str, expected_encoding: str, expected_media_type: str
+) -> None:
+    """Test that uploaded workbooks are converted like the CLI converts them and the latency is reported.
+
+    Arguments:
+        query: Configuration options of the request
+        input_file_path: Path of the uploaded workbook
+        expected_path: Path of the expected export
+        expected_encoding: Encoding of the expected export
+        expected_media_type: Expected content type of the response
+    """
+
+    async def scenario() -> None:
+        async with running_server(workers=2) as server:
+            responses = await asyncio.gather(
+                *(asyncio.to_thread(http_request, server.port, "POST", f"/convert{query}", workbook) for _ in range(3))
+            )
+            for status, headers, body in responses:
+                assert status == 200
+                assert headers["Content-Type"] == expected_media_type
+                assert headers["Transfer-Encoding"] == "chunked"
+                assert headers["X-GA-Count"] == "16"
+                assert decode(body, expected_encoding) == read_file(expected_path, expected_encoding)
+
+            metrics = await get_metrics(server)
+            assert metrics["requests"] == {"total": 3, "status": {"200": 3}}
+            assert metrics["latency_seconds"]["window"] == 3
+            assert 0 < metrics["latency_seconds"]["p50"] <= metrics["latency_seconds"]["max"]
+            assert metrics["queue"]["depth"] == 0
+            assert metrics["workers"] == {"total": 2, "busy": 0}
+
+    workbook = read_workbook(input_file_path)
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "request_data,expected_response",
+    [
+        (b"GET /unknown HTTP/1.1\r\n\r\n", b"HTTP/1.1 404 Not Found.*Unknown path '/unknown'"),
+        (b"GET /convert HTTP/1.1\r\n\r\n", b"HTTP/1.1 405 Method Not Allowed.*Expected: POST"),
+        (b"POST /convert HTTP/1.1\r\n\r\n", b"HTTP/1.1 411 Length Required"),
+        (b"POST /convert HTTP/1.1\r\nContent-Length: x\r\n\r\n", b"HTTP/1.1 400 Bad Request.*Content-Length"),
+        (b"POST /convert HTTP/1.1\r\nContent-Length: 2000\r\n\r\n", b"HTTP/1.1 413 Request Entity Too Large"),
+        (b"POST /convert HTTP/1.1\r\nContent-Length: 4\r\n\r\nnone", b"HTTP/1.1 422 .*not a zip file"),
+        (b"POST /convert?unknown=1 HTTP/1.1\r\nContent-Length: 0\r\n\r\n", b"HTTP/1.1 422 .*'unknown'"),
+        (b"invalid\r\n\r\n", b"HTTP/1.1 400 Bad Request.*Invalid request line 'invalid'"),
+        (b"POST /convert HTTP/1.1\r\nContent-Length: 10\r\n\r\nnone", b"^$"),
+    ],
+)
+def test_ct_serve_invalid_request(request_data: bytes, expected_response: bytes) -> None:
+    """Test the responses of invalid requests and failing conversions.
+
+    Arguments:
+        request_data: Raw request
+        expected_response: Regular expression matching the raw response
+    """
+
+    async def scenario() -> None:
+        async with running_server(max_upload=1000) as server:
+            response = await asyncio.to_thread(raw_request, server.port, request_data)
+            assert re.search(expected_response, response, re.DOTALL)
+            # The server keeps serving after invalid requests
+            assert (await get_metrics(server))["workers"]["busy"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_ct_serve_unexpected_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that unexpected errors are answered with status 500 and the server keeps serving.
+
+    Arguments:
+        monkeypatch: Failing request handling
+    """
+
+    def fail(query: str) -> dict:
+        raise RuntimeError(f"Unexpected error of query '{query}'")
+
+    async def scenario() -> None:
+        async with running_server() as server:
+            status, _, body = await asyncio.to_thread(http_request, server.port, "POST", "/convert?a=1", b"")
+            assert status == 500
+            assert body == b"Internal server error: Unexpected error of query 'a=1'\n"
+            assert (await get_metrics(server))["requests"] == {"total": 1, "status": {"500": 1}}
+
+    monkeypatch.setattr(serve, "_query_options", fail)
+    asyncio.run(scenario())
+
+
+def test_ct_serve_queue() -> None:
+    """Test that conversions wait for a free worker and requests exceeding the queue are rejected."""
+
+    async def scenario() -> None:
+        async with running_server(workers=1, max_queue=1) as server:
+            # Occupy the only worker
+            await server._slots.acquire()  # pylint: disable=protected-access
+            queued = asyncio.ensure_future(
+                asyncio.to_thread(http_request, server.port, "POST", "/convert", read_workbook())
+            )
+            while (await get_metrics(server))["queue"]["depth"] == 0:
+                await asyncio.sleep(0.01)
+
+            status, headers, body = await asyncio.to_thread(
+                http_request, server.port, "POST", "/convert", read_workbook()
+            )
+            assert status == 503
+            assert headers["Retry-After"] == "1"
+            assert b"queue is full" in body
+
+            server._slots.release()  # pylint: disable=protected-access
+            status, _, _ = await queued
+            assert status == 200
+
+            metrics = await get_metrics(server)
+            assert metrics["requests"] == {"total": 2, "status": {"200": 1, "503": 1}}
+            assert metrics["queue"] == {"depth": 0, "max_depth": 1, "limit": 1}
+
+    asyncio.run(scenario())
+
+
+def test_ct_serve_cli(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the serve command until the server is interrupted.
+
+    Arguments:
+        capsys: System capture
+        monkeypatch: Interrupting the server
+    """
+    responses = []
+
+    async def serve_once(server: ConversionServer) -> None:
+        responses.append(await asyncio.to_thread(http_request, server.port, "POST", "/convert", read_workbook()))
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ConversionServer, "serve_forever", serve_once)
+    cli_result = run_cli("serve --port 0 --workers 1 --max-queue 0", capsys)
+    assert cli_result.exit_code == os.EX_OK
+    assert cli_result.stdout.startswith("Serving on http://127.0.0.1:")
+    assert [status for status, _, _ in responses] == [200]
+
+
+def test_ct_serve_cli_workers(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the default number of workers if the number of CPUs is unknown and that invalid numbers are rejected.
+
+    Arguments:
+        capsys: System capture
+        monkeypatch: Unknown number of CPUs
+    """
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert parse_serve_config("knx-ga-exporter", "1.0", "", "", []).workers == 1
+
+    cli_result = run_cli("serve --workers 0", capsys)
+    assert cli_result.exit_code != os.EX_OK
+    assert "Not of type PositiveInt: 0" in cli_result.stderr
+
+
+def test_ut_query_options() -> None:
+    """Test the conversion of the query parameters into configuration options."""
+    assert _query_options('output.format=3/3&layout.first-row=10&layout.sheet-name=["A","B"]&stream=true') == {
+        "output": {"format": "3/3"},
+        "layout": {"first_row": 10, "sheet_name": ["A", "B"]},
+        "stream": True,
+    }
+
+
+def test_ut_server_metrics() -> None:
+    """Test the latency percentiles of the metrics."""
+    metrics = ServerMetrics(workers=2, queue_limit=4)
+    assert metrics.to_report()["latency_seconds"] == {
+        "window": 0,
+        "mean": None,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+        "max": None,
+    }
+    for latency in range(1, 101):
+        metrics.record_request(200, latency / 1000)
+    latency_report = metrics.to_report()["latency_seconds"]
+    assert (latency_report["p50"], latency_report["p95"], latency_report["p99"]) == (0.05, 0.095, 0.099)
@@ -0,0 +1,133 @@
+"""Test of the group address snapshots."""
+
+import logging
+import os
+from typing import Callable
+
+import pytest
+
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from knx_ga_exporter.group_address import GroupAddress
+from knx_ga_exporter.snapshot import is_snapshot, read_snapshot, write_snapshot
+from tests.test_conversion import read_file
+from tests.util_runner import run_cli
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("snapshot_file_name", ["snapshot.json", "snapshot.knxgas"])
+def test_ct_snapshot_input(
+    capsys: pytest.CaptureFixture[str], caplog: pytest.LogCaptureFixture, tmp_path: str, snapshot_file_name: str
+) -> None:
+    """Test exports using a snapshot as input file instead of the workbook.
+
+    Arguments:
+        capsys: System capture
+        caplog: Logging capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        snapshot_file_name: File name of the snapshot
+    """
+    snapshot_path = f"{tmp_path}/{snapshot_file_name}"
+    cli_args = f"--input.file tests/inputs/KNX-planning-example.xlsx --snapshot.file {snapshot_path} -v"
+    assert run_cli(f"{cli_args} --output.file {tmp_path}/workbook.csv", capsys).exit_code == os.EX_OK
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO):
+        cli_result = run_cli(f"--input.file {snapshot_path} --output.file {tmp_path}/snapshot.csv -v", capsys)
+    assert cli_result.exit_code == os.EX_OK
+    assert "Reading snapshot" in caplog.text
+    assert "Loading XLSX input file" not in caplog.text
+    assert read_file(f"{tmp_path}/snapshot.csv", OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+def test_ct_snapshot_cached_conversion(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that the snapshot is written although the cached output file is current.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    cli_args = (
+        f"--input.file tests/inputs/KNX-planning-example.xlsx --output.file {tmp_path}/workbook.csv "
+        + f"--cache.dir {tmp_path}/cache"
+    )
+    assert run_cli(cli_args, capsys).exit_code == os.EX_OK
+    assert run_cli(f"{cli_args} --snapshot.file {tmp_path}/snapshot.knxgas", capsys).exit_code == os.EX_OK
+    assert len(read_snapshot(f"{tmp_path}/snapshot.knxgas")) == 16
+
+
+@pytest.mark.parametrize("snapshot_file_name", ["snapshot.json", "snapshot.knxgas"])
+def test_ut_snapshot_round_trip(tmp_path: str, snapshot_file_name: str) -> None:
+    """Test that all group address attributes are restored from a snapshot.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+        snapshot_file_name: File name of the snapshot
+    """
+    gas = [
+        GroupAddress(0, 0, 1, "Light", "Switch", "Ceiling „light“", "B0-0-L", "DPST-1-1", "Line\nbreak"),
+        GroupAddress(0, 0, 2, "Light", "Switch", "Wall light", 0, "DPST-1-1", None),
+        GroupAddress(31, 7, 255, "Blinds", "Position", "Blind", None, "DPST-5-1", 1),
+    ]
+    snapshot_path = f"{tmp_path}/{snapshot_file_name}"
+    write_snapshot(snapshot_path, iter(gas))
+
+    assert is_snapshot(snapshot_path)
+    assert read_snapshot(snapshot_path) == gas
+    assert os.listdir(tmp_path) == [snapshot_file_name]
+
+
+def test_ut_is_snapshot(tmp_path: str) -> None:
+    """Test that snapshots are detected by content: Workbooks, other JSON files and missing files are no snapshots.
+
+    Arguments:
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    assert not is_snapshot("tests/inputs/KNX-planning-example.xlsx")
+    assert not is_snapshot("tests/inputs/missing.knxgas")
+    with open(f"{tmp_path}/config.json", "w", encoding="utf-8") as json_file:
+        json_file.write('{"group_addresses": []}')
+    assert not is_snapshot(f"{tmp_path}/config.json")
+    with pytest.raises(ValueError, match="config.json' is no snapshot file"):
+        read_snapshot(f"{tmp_path}/config.json")
+
+    write_snapshot(f"{tmp_path}/snapshot.json", [])
+    os.rename(f"{tmp_path}/snapshot.json", f"{tmp_path}/snapshot.data")
+    assert is_snapshot(f"{tmp_path}/snapshot.data")
+    assert read_snapshot(f"{tmp_path}/snapshot.data") == []
+
+
+@pytest.mark.parametrize(
+    "snapshot_file_name,modification,expected_error",
+    [
+        ("snapshot.knxgas", lambda data: data[:7] + b"\x02" + data[8:], "unsupported format version 2"),
+        ("snapshot.knxgas", lambda data: data[:-8], "is truncated"),
+        ("snapshot.knxgas", lambda data: data[:10], "is truncated"),
+        ("snapshot.knxgas", lambda data: data[:20] + b"#" + data[21:], "is corrupt"),
+        ("snapshot.knxgas", lambda data: b"KNXGAX" + data[6:], "is no snapshot file"),
+        ("snapshot.json", lambda data: data.replace(b": 1,", b": 2,", 1), "unsupported format version 2"),
+        ("snapshot.json", lambda data: data[:-8], "is corrupt"),
+    ],
+)
+def test_ut_invalid_snapshot(
+    snapshot_file_name: str, modification: Callable[[bytes], bytes], expected_error: str, tmp_path: str
+) -> None:
+    """Test reading snapshots of other format versions, truncated, corrupt and foreign files.
+
+    Arguments:
+        snapshot_file_name: File name of the snapshot
+        modification: Modification of the snapshot file contents
+        expected_error: Expected error message
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    snapshot_path = f"{tmp_path}/{snapshot_file_name}"
+    write_snapshot(snapshot_path, [GroupAddress(1, 2, 3, "Blinds", "Position", "Blind", None, "DPST-5-1", None)])
+    with open(snapshot_path, "rb") as snapshot_file:
+        data = modification(snapshot_file.read())
+    with open(snapshot_path, "wb") as snapshot_file:
+        snapshot_file.write(data)
+
+    with pytest.raises(ValueError, match=f"{snapshot_file_name}.* {expected_error}"):
+        read_snapshot(snapshot_path)
@@ -0,0 +1,61 @@
+"""Test of the CLI startup: Modules only needed for conversions are imported lazily."""
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+# Modules only needed for conversions. Must not be imported by --help and --version.
+CONVERSION_MODULES = [
+    "openpyxl",
+    "cProfile",
+    "concurrent.futures.process",
+    "knx_ga_exporter.batch",
+    "knx_ga_exporter.conversion",
+    "knx_ga_exporter.parser",
+]
+
+
+def import_times(cli_args: list[str]) -> dict[str, int]:
+    """Run the CLI in a fresh interpreter and collect the cumulative import time of all modules.
+
+    Arguments:
+        cli_args: Command line arguments
+
+    Returns:
+        Cumulative import time in microseconds by module name.
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys; from knx_ga_exporter.__main__ import cli; sys.exit(cli({cli_args!r}))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in re.finditer(r"^import time: +\d+ \| +(\d+) \| +(\S+)$", process.stderr, re.MULTILINE):
+        times[match.group(2)] = int(match.group(1))
+    return times
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("cli_args", [["--version"], ["--help"]])
+def test_ct_startup_lazy_imports(cli_args: list[str]) -> None:
+    """Test that --help and --version do not import the conversion modules.
+
+    Arguments:
+        cli_args: Command line arguments
+    """
+    times = import_times(cli_args)
+    assert "knx_ga_exporter.__main__" in times
+    assert [module for module in CONVERSION_MODULES if module in times] == []
@@ -0,0 +1,40 @@
+"""Test of the group address validation."""
+
+from typing import Any
+
+import pytest
+
+from knx_ga_exporter.validation import GroupAddressValidator
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "dpt,expected_valid",
+    [
+        ("DPST-1-1", True),
+        ("DPT-5", True),
+        ("dpst-1-1", True),
+        ("1.001", True),
+        ("DPT1.001", True),
+        ("dpt-9.001", True),
+        (1.001, True),
+        (5, True),
+        ("Switch", False),
+        ("DPST-1-", False),
+        ("1.", False),
+        (True, False),
+    ],
+)
+def test_ut_validate_dpt(dpt: Any, expected_valid: bool) -> None:  # noqa: ANN401
+    """Test the accepted DPT notations.
+
+    Arguments:
+        dpt: DPT datatype
+        expected_valid: True if the DPT format is expected to be valid
+    """
+    validator = GroupAddressValidator("KNX Group Addresses")
+    assert validator.validate(10, 1, 2, 3, "Blinds", "Position", "Blind", None, dpt) == expected_valid
+    assert [issue.message.startswith("Invalid DPT format") for issue in validator.issues] == (
+        [] if expected_valid else [True]
+    )
@@ -0,0 +1,130 @@
+"""Test of the watch mode."""
+
+import os
+import re
+import shutil
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable
+
+import pytest
+
+from knx_ga_exporter import watch
+from knx_ga_exporter.argparse import OUTPUT_ENCODING_DEFAULT
+from tests.test_conversion import read_file
+from tests.util_runner import run_cli
+
+# ---- Utilities -------------------------------------------------------------------------------------------------------
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> None:
+    """Wait until a condition is fulfilled.
+
+    Arguments:
+        condition: Checked condition
+        timeout: Max. waiting time in seconds
+
+    Raises:
+        TimeoutError: If the condition is not fulfilled in time.
+    """
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise TimeoutError("Condition not fulfilled in time")
+        time.sleep(0.02)
+
+
+# ---- Testcases -------------------------------------------------------------------------------------------------------
+
+
+def test_ct_watch(capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+    """Test re-exports of a changing input file in watch mode.
+
+    Arguments:
+        capsys: System capture
+        monkeypatch: Patching of the watch stop event
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+    input_path = f"{tmp_path}/input.xlsx"
+    output_csv_path = f"{tmp_path}/conversion_result.csv"
+    shutil.copy("tests/inputs/KNX-planning-example.xlsx", input_path)
+
+    stop_event = threading.Event()
+    monkeypatch.setattr(watch, "Event", lambda: stop_event)
+    cli_result = {}
+    cli_thread = threading.Thread(
+        target=lambda: cli_result.update(
+            result=run_cli(
+                f"--input.file {input_path} --output.file {output_csv_path} --watch "
+                + "--watch-interval 0.02 --watch-debounce 0.1",
+                capsys,
+            )
+        )
+    )
+    cli_thread.start()
+    try:
+        # Initial conversion
+        wait_for(lambda: os.path.exists(output_csv_path))
+
+        # Failing conversion of an invalid workbook. Previous output is kept.
+        os.remove(input_path)
+        shutil.copy("tests/inputs/missing-maingroup-name.xlsx", input_path)
+        time.sleep(0.5)
+
+        # Successful conversion of a changed workbook
+        os.remove(output_csv_path)
+        shutil.copy("tests/inputs/KNX-planning-example.xlsx", input_path)
+        os.utime(input_path, ns=(time.time_ns(), time.time_ns()))
+        wait_for(lambda: os.path.exists(output_csv_path))
+    finally:
+        stop_event.set()
+        cli_thread.join()
+
+    stdout_lines = cli_result["result"].stdout_lines
+    assert cli_result["result"].exit_code == os.EX_OK
+    assert re.match(r"Watching '.*input.xlsx' for changes", stdout_lines[0])
+    assert re.search(r"Cycle +1 \| +[\d.]+ s \| OK \(#GA: 16\)", stdout_lines[1])
+    assert re.search(r"Cycle +2 \| +[\d.]+ s \| FAILED: Validation of sheet .* failed with 1 issue", stdout_lines[2])
+    assert re.search(r"Cycle +3 \| +[\d.]+ s \| OK \(#GA: 16\)", stdout_lines[3])
+    assert re.match(r"Stopped watching .* after 3 conversions", stdout_lines[4])
+    assert read_file(output_csv_path, OUTPUT_ENCODING_DEFAULT) == read_file(
+        "tests/expected_outputs/KNX-planning-example_format_1_1.csv", OUTPUT_ENCODING_DEFAULT
+    )
+
+
+def test_ut_watch_interrupted(capsys: pytest.CaptureFixture[str], tmp_path: str) -> None:
+    """Test that watching stops on keyboard interrupts and continues while the input file is missing.
+
+    Arguments:
+        capsys: System capture
+        tmp_path: Temporary unique file path provided by built-in fixture.
+    """
+
+    class InterruptingEvent:
+        """Stop event interrupting the second poll."""
+
+        polls = 0
+
+        def wait(self, _timeout: float) -> bool:
+            """Wait for the next poll.
+
+            Arguments:
+                _timeout: Poll interval
+
+            Returns:
+                False, the watch is stopped by an interrupt.
+
+            Raises:
+                KeyboardInterrupt: On the second poll
+            """
+            self.polls += 1
+            if self.polls == 2:
+                raise KeyboardInterrupt()
+            return False
+
+    config = SimpleNamespace(
+        input=SimpleNamespace(file=f"{tmp_path}/missing.xlsx"), watch_interval=0.0, watch_debounce=0.0
+    )
+    assert watch.watch(config, lambda _config: None, InterruptingEvent()) == os.EX_OK
+    assert "Stopped watching" in capsys.readouterr().out